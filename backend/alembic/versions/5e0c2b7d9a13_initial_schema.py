@@ -0,0 +1,119 @@
+"""initial schema
+
+Revision ID: 5e0c2b7d9a13
+Revises: 
+Create Date: 2026-01-18 00:20:05.118734
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e0c2b7d9a13'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Tables as they were before the first tracked change, databases created
+    # with `create_all` already have them and start at 8b53e60cbf4c
+    op.create_table(
+        'companies',
+        sa.Column('id', sa.Uuid(), nullable=False),
+        sa.Column('name', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_table(
+        'users',
+        sa.Column('id', sa.Uuid(), nullable=False),
+        sa.Column('email', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column('first_name', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column('last_name', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column('role', sa.Enum('ADMIN', 'WORKER', name='userrole'), nullable=False),
+        sa.Column('password', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column('position', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column('company_id', sa.Uuid(), nullable=True),
+        sa.ForeignKeyConstraint(['company_id'], ['companies.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_table(
+        'shift_templates',
+        sa.Column('id', sa.Uuid(), nullable=False),
+        sa.Column('company_id', sa.Uuid(), nullable=False),
+        sa.Column('name', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column('position', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column('startTime', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column('endTime', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column('days', postgresql.ARRAY(sa.Integer()), nullable=True),
+        sa.ForeignKeyConstraint(['company_id'], ['companies.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_table(
+        'worker_shifts',
+        sa.Column('id', sa.Uuid(), nullable=False),
+        sa.Column('worker_id', sa.Uuid(), nullable=False),
+        sa.Column('company_id', sa.Uuid(), nullable=False),
+        sa.Column('start_date', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('end_date', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('template_id', sa.Uuid(), nullable=True),
+        sa.ForeignKeyConstraint(['worker_id'], ['users.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['company_id'], ['companies.id']),
+        sa.ForeignKeyConstraint(['template_id'], ['shift_templates.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_table(
+        'tokens',
+        sa.Column('id', sa.Uuid(), nullable=False),
+        sa.Column('user_id', sa.Uuid(), nullable=False),
+        sa.Column(
+            'type', sa.Enum('ACTIVATE_ACCOUNT', name='tokentype'), nullable=False
+        ),
+        sa.Column('expired_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_table(
+        'leaves',
+        sa.Column('id', sa.Uuid(), nullable=False),
+        sa.Column('user_id', sa.Uuid(), nullable=False),
+        sa.Column('company_id', sa.Uuid(), nullable=False),
+        sa.Column('start_date', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('end_date', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['company_id'], ['companies.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_table(
+        'assignment_suggestions',
+        sa.Column('id', sa.Uuid(), nullable=False),
+        sa.Column('worker_id', sa.Uuid(), nullable=False),
+        sa.Column('company_id', sa.Uuid(), nullable=False),
+        sa.Column('template_id', sa.Uuid(), nullable=False),
+        sa.Column('start_date', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('end_date', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['worker_id'], ['users.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['company_id'], ['companies.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(
+            ['template_id'], ['shift_templates.id'], ondelete='CASCADE'
+        ),
+        sa.PrimaryKeyConstraint('id'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('assignment_suggestions')
+    op.drop_table('leaves')
+    op.drop_table('tokens')
+    op.drop_table('worker_shifts')
+    op.drop_table('shift_templates')
+    op.drop_table('users')
+    op.drop_table('companies')
+    sa.Enum(name='tokentype').drop(op.get_bind(), checkfirst=True)
+    sa.Enum(name='userrole').drop(op.get_bind(), checkfirst=True)
@@ -1,7 +1,7 @@
 """ShiftTemplateModel add startDate and endDate
 
 Revision ID: 8b53e60cbf4c
-Revises: 
+Revises: 5e0c2b7d9a13
 Create Date: 2026-01-18 00:34:12.660517
 
 """
@@ -14,7 +14,7 @@ import sqlmodel
 
 # revision identifiers, used by Alembic.
 revision: str = '8b53e60cbf4c'
-down_revision: Union[str, None] = None
+down_revision: Union[str, None] = '5e0c2b7d9a13'
 branch_labels: Union[str, Sequence[str], None] = None
 depends_on: Union[str, Sequence[str], None] = None
 
@@ -0,0 +1,40 @@
+"""shift_templates days GIN index and padded times
+
+Revision ID: a4c8e2f6b1d3
+Revises: f1b6d2a8c4e9
+Create Date: 2026-10-19 19:12:08.640215
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4c8e2f6b1d3'
+down_revision: Union[str, None] = 'f1b6d2a8c4e9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_shift_templates_days',
+        'shift_templates',
+        ['days'],
+        postgresql_using='gin',
+    )
+    # Auto-assign compares start times as strings, pad rows like "9:00"
+    op.execute(
+        """
+        UPDATE shift_templates
+        SET "startTime" = to_char("startTime"::time, 'HH24:MI'),
+            "endTime" = to_char("endTime"::time, 'HH24:MI')
+        WHERE "startTime" !~ '^\\d{2}:\\d{2}$' OR "endTime" !~ '^\\d{2}:\\d{2}$'
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_shift_templates_days', table_name='shift_templates')
@@ -0,0 +1,33 @@
+"""jobs lease_expires_at
+
+Revision ID: b7d3f9a2c5e8
+Revises: a4c8e2f6b1d3
+Create Date: 2026-10-20 09:41:17.502318
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7d3f9a2c5e8'
+down_revision: Union[str, None] = 'a4c8e2f6b1d3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'jobs', sa.Column('lease_expires_at', sa.DateTime(timezone=True), nullable=True)
+    )
+    # Running jobs keep the lease they had under the fixed JOB_LEASE_SECONDS
+    op.execute(
+        "UPDATE jobs SET lease_expires_at = started_at + interval '600 seconds' "
+        "WHERE status = 'RUNNING'"
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('jobs', 'lease_expires_at')
@@ -0,0 +1,124 @@
+"""partition worker_shifts by month on start_date
+
+Revision ID: c4d1a7e9b2f3
+Revises: 9f7ee4def596
+Create Date: 2026-10-19 10:12:41.311208
+
+"""
+from datetime import date, datetime, timezone
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4d1a7e9b2f3'
+down_revision: Union[str, None] = '9f7ee4def596'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COLUMNS = "id, worker_id, company_id, start_date, end_date, template_id"
+# Partitions are inlined as of this revision, later changes to
+# db/partitions.py must not change what this migration does
+MONTHS_AHEAD = 12
+
+
+def add_months(value: date, months: int) -> date:
+    month_index = value.year * 12 + value.month - 1 + months
+    return date(month_index // 12, month_index % 12 + 1, 1)
+
+
+def create_partitions(start: date) -> None:
+    op.execute("CREATE TABLE worker_shifts_default PARTITION OF worker_shifts DEFAULT")
+    month = date(start.year, start.month, 1)
+    current_month = datetime.now(timezone.utc).date().replace(day=1)
+    last_month = add_months(current_month, MONTHS_AHEAD)
+    while month <= last_month:
+        upper = add_months(month, 1)
+        op.execute(
+            f"CREATE TABLE worker_shifts_y{month.year}m{month.month:02d} "
+            "PARTITION OF worker_shifts "
+            f"FOR VALUES FROM ('{month.isoformat()} 00:00:00+00') "
+            f"TO ('{upper.isoformat()} 00:00:00+00')"
+        )
+        month = upper
+
+
+def upgrade() -> None:
+    connection = op.get_bind()
+    # start_date becomes the partition key, so it can no longer be NULL
+    op.execute(
+        "UPDATE worker_shifts SET start_date = end_date "
+        "WHERE start_date IS NULL AND end_date IS NOT NULL"
+    )
+    undated = connection.execute(
+        sa.text("SELECT count(*) FROM worker_shifts WHERE start_date IS NULL")
+    ).scalar()
+    if undated:
+        raise RuntimeError(
+            f"{undated} worker shift(s) have neither start_date nor end_date, "
+            "set or delete them before partitioning"
+        )
+
+    op.execute("ALTER TABLE worker_shifts RENAME TO worker_shifts_unpartitioned")
+    op.execute(
+        "ALTER TABLE worker_shifts_unpartitioned "
+        "RENAME CONSTRAINT worker_shifts_pkey TO worker_shifts_unpartitioned_pkey"
+    )
+    op.execute(
+        """
+        CREATE TABLE worker_shifts (
+            id UUID NOT NULL,
+            worker_id UUID NOT NULL REFERENCES users (id) ON DELETE CASCADE,
+            company_id UUID NOT NULL REFERENCES companies (id),
+            start_date TIMESTAMP WITH TIME ZONE NOT NULL,
+            end_date TIMESTAMP WITH TIME ZONE,
+            template_id UUID REFERENCES shift_templates (id),
+            PRIMARY KEY (id, start_date)
+        ) PARTITION BY RANGE (start_date)
+        """
+    )
+    op.create_index(
+        "ix_worker_shifts_company_id_start_date",
+        "worker_shifts",
+        ["company_id", "start_date"],
+    )
+    op.create_index(
+        "ix_worker_shifts_worker_id_start_date",
+        "worker_shifts",
+        ["worker_id", "start_date"],
+    )
+
+    oldest = connection.execute(
+        sa.text("SELECT min(start_date) FROM worker_shifts_unpartitioned")
+    ).scalar()
+    oldest = oldest or datetime.now(timezone.utc)
+    create_partitions(oldest.astimezone(timezone.utc).date())
+
+    op.execute(
+        f"INSERT INTO worker_shifts ({COLUMNS}) "
+        f"SELECT {COLUMNS} FROM worker_shifts_unpartitioned"
+    )
+    op.execute("DROP TABLE worker_shifts_unpartitioned")
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE worker_shifts RENAME TO worker_shifts_partitioned")
+    op.execute(
+        """
+        CREATE TABLE worker_shifts (
+            id UUID NOT NULL PRIMARY KEY,
+            worker_id UUID NOT NULL REFERENCES users (id) ON DELETE CASCADE,
+            company_id UUID NOT NULL REFERENCES companies (id),
+            start_date TIMESTAMP WITH TIME ZONE,
+            end_date TIMESTAMP WITH TIME ZONE,
+            template_id UUID REFERENCES shift_templates (id)
+        )
+        """
+    )
+    op.execute(
+        f"INSERT INTO worker_shifts ({COLUMNS}) "
+        f"SELECT {COLUMNS} FROM worker_shifts_partitioned"
+    )
+    op.execute("DROP TABLE worker_shifts_partitioned CASCADE")
@@ -0,0 +1,36 @@
+"""week snapshot versions
+
+Revision ID: c9e4a2d6f1b8
+Revises: b7d3f9a2c5e8
+Create Date: 2026-10-20 15:27:04.118342
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c9e4a2d6f1b8'
+down_revision: Union[str, None] = 'b7d3f9a2c5e8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'companies',
+        sa.Column(
+            'week_snapshots_version', sa.Integer(), nullable=False, server_default='0'
+        ),
+    )
+    op.add_column(
+        'company_week_snapshots',
+        sa.Column('version', sa.Integer(), nullable=False, server_default='0'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('company_week_snapshots', 'version')
+    op.drop_column('companies', 'week_snapshots_version')
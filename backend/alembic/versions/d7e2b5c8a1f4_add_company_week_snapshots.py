@@ -0,0 +1,36 @@
+"""add company_week_snapshots
+
+Revision ID: d7e2b5c8a1f4
+Revises: c4d1a7e9b2f3
+Create Date: 2026-10-19 14:02:17.508139
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd7e2b5c8a1f4'
+down_revision: Union[str, None] = 'c4d1a7e9b2f3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'company_week_snapshots',
+        sa.Column('company_id', sa.Uuid(), nullable=False),
+        sa.Column('iso_week', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column('payload', postgresql.JSONB(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['company_id'], ['companies.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('company_id', 'iso_week'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('company_week_snapshots')
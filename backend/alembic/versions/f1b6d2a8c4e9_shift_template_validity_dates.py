@@ -0,0 +1,44 @@
+"""shift_templates startDate and endDate as dates
+
+Revision ID: f1b6d2a8c4e9
+Revises: e3a9c1f7b2d6
+Create Date: 2026-10-19 18:05:52.381027
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1b6d2a8c4e9'
+down_revision: Union[str, None] = 'e3a9c1f7b2d6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Stored as the "YYYY-MM-DD" strings of the date inputs, cleared ones as ""
+    for column in ('startDate', 'endDate'):
+        op.alter_column(
+            'shift_templates',
+            column,
+            type_=sa.Date(),
+            existing_type=sqlmodel.sql.sqltypes.AutoString(),
+            existing_nullable=True,
+            postgresql_using=f'NULLIF("{column}", \'\')::date',
+        )
+
+
+def downgrade() -> None:
+    for column in ('startDate', 'endDate'):
+        op.alter_column(
+            'shift_templates',
+            column,
+            type_=sqlmodel.sql.sqltypes.AutoString(),
+            existing_type=sa.Date(),
+            existing_nullable=True,
+            postgresql_using=f'to_char("{column}", \'YYYY-MM-DD\')',
+        )
@@ -0,0 +1,259 @@
+"""Benchmark prepare_auto_assign_shifts on synthetic companies.
+
+Runs entirely in memory (no Postgres) and writes JSON results that can be
+compared across commits:
+
+    python benchmarks/auto_assign_benchmark.py --preset default
+    python benchmarks/auto_assign_benchmark.py --preset smoke --output -
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(BACKEND_DIR, "src"))
+
+from api.worker_shifts.schemas import Range  # noqa: E402
+from api.worker_shifts.worker_shift_service import (  # noqa: E402
+    prepare_auto_assign_shifts,
+)
+from db.models import (  # noqa: E402
+    ShiftTemplateModel,
+    UserModel,
+    UserRole,
+    WorkerShiftModel,
+)
+
+RANGE_START = datetime(2025, 1, 6, tzinfo=timezone.utc)  # Monday
+
+
+@dataclass(frozen=True)
+class Scenario:
+    workers: int
+    templates: int
+    days: int
+    existing_shift_density: float
+
+    @property
+    def name(self) -> str:
+        return (
+            f"w{self.workers}-t{self.templates}-d{self.days}"
+            f"-e{int(self.existing_shift_density * 100)}"
+        )
+
+
+PRESETS = {
+    "smoke": [
+        Scenario(10, 5, 1, 0.0),
+        Scenario(10, 5, 7, 0.5),
+    ],
+    "default": [
+        Scenario(10, 5, 1, 0.0),
+        Scenario(10, 5, 30, 0.3),
+        Scenario(50, 20, 30, 0.3),
+        Scenario(200, 50, 30, 0.3),
+        Scenario(200, 50, 90, 0.5),
+        Scenario(1000, 100, 30, 0.3),
+    ],
+    "full": [
+        Scenario(10, 5, 365, 0.0),
+        Scenario(200, 50, 365, 0.5),
+        Scenario(1000, 100, 90, 0.5),
+        Scenario(2000, 200, 30, 0.3),
+        Scenario(5000, 200, 30, 0.3),
+        Scenario(5000, 200, 365, 0.5),
+    ],
+}
+
+
+def generate_company(scenario: Scenario, seed: int):
+    """Build in-memory templates, workers and existing shifts for a scenario."""
+    rng = random.Random(seed)
+    company_id = uuid4()
+
+    users = [
+        UserModel(
+            id=uuid4(),
+            email=f"worker{i}@bench.local",
+            first_name=f"Worker{i}",
+            last_name="Bench",
+            role=UserRole.WORKER,
+            company_id=company_id,
+        )
+        for i in range(scenario.workers)
+    ]
+
+    shift_templates = []
+    for i in range(scenario.templates):
+        start_hour = rng.randint(1, 18)
+        duration = rng.randint(4, 8)
+        shift_templates.append(
+            ShiftTemplateModel(
+                id=uuid4(),
+                company_id=company_id,
+                name=f"Template {i}",
+                position=rng.choice(["Cashier", "Cook", "Cleaner", "Manager"]),
+                startTime=f"{start_hour:02d}:{rng.choice([0, 15, 30, 45]):02d}",
+                endTime=f"{min(start_hour + duration, 23):02d}:00",
+                days=sorted(rng.sample(range(1, 8), rng.randint(1, 7))),
+            )
+        )
+
+    worker_shifts = []
+    for day in range(scenario.days):
+        current_date = RANGE_START + timedelta(days=day)
+        weekday = current_date.isoweekday()
+        for template in shift_templates:
+            if weekday not in template.days:
+                continue
+            if rng.random() >= scenario.existing_shift_density:
+                continue
+            start_hour, start_minute = map(int, template.startTime.split(":"))
+            end_hour, end_minute = map(int, template.endTime.split(":"))
+            worker_shifts.append(
+                WorkerShiftModel(
+                    id=uuid4(),
+                    worker_id=rng.choice(users).id,
+                    company_id=company_id,
+                    template_id=template.id,
+                    start_date=current_date.replace(
+                        hour=start_hour, minute=start_minute
+                    ),
+                    end_date=current_date.replace(hour=end_hour, minute=end_minute),
+                )
+            )
+
+    range_obj = Range(
+        range_start=RANGE_START.isoformat(),
+        range_end=(
+            RANGE_START + timedelta(days=scenario.days - 1, hours=23, minutes=59)
+        ).isoformat(),
+    )
+    return range_obj, worker_shifts, shift_templates, users
+
+
+def run_scenario(scenario: Scenario, repeat: int, seed: int) -> dict:
+    range_obj, worker_shifts, shift_templates, users = generate_company(
+        scenario, seed
+    )
+    result = {
+        "scenario": scenario.name,
+        "params": asdict(scenario),
+        "existing_shifts": len(worker_shifts),
+    }
+
+    durations = []
+    try:
+        for _ in range(repeat):
+            gc.collect()
+            start = time.perf_counter()
+            placeholders = prepare_auto_assign_shifts(
+                range_obj, worker_shifts, shift_templates, users
+            )
+            durations.append(time.perf_counter() - start)
+    except ValueError as e:
+        result["error"] = str(e)
+        return result
+
+    # Measured separately, tracemalloc slows allocation-heavy code noticeably
+    gc.collect()
+    tracemalloc.start()
+    prepare_auto_assign_shifts(range_obj, worker_shifts, shift_templates, users)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    result.update(
+        {
+            "slots": len(placeholders),
+            "runtime_seconds": {
+                "min": min(durations),
+                "median": statistics.median(durations),
+                "max": max(durations),
+            },
+            "peak_memory_bytes": peak,
+        }
+    )
+    return result
+
+
+def get_git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=BACKEND_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--preset", choices=sorted(PRESETS), default="default")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument(
+        "--output",
+        help="JSON output path, '-' for stdout "
+        "(default: benchmarks/results/auto_assign-<commit>.json)",
+    )
+    args = parser.parse_args()
+
+    commit = get_git_commit()
+    results = []
+    for scenario in PRESETS[args.preset]:
+        print(f"running {scenario.name}...", file=sys.stderr)
+        result = run_scenario(scenario, args.repeat, args.seed)
+        if "error" in result:
+            print(f"  error: {result['error']}", file=sys.stderr)
+        else:
+            print(
+                f"  {result['slots']} slots, "
+                f"median {result['runtime_seconds']['median'] * 1000:.1f} ms, "
+                f"peak {result['peak_memory_bytes'] / 1024:.0f} KiB",
+                file=sys.stderr,
+            )
+        results.append(result)
+
+    report = {
+        "benchmark": "prepare_auto_assign_shifts",
+        "commit": commit,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "preset": args.preset,
+        "repeat": args.repeat,
+        "seed": args.seed,
+        "results": results,
+    }
+
+    if args.output == "-":
+        json.dump(report, sys.stdout, indent=2)
+        print()
+        return
+
+    output = args.output or os.path.join(
+        BACKEND_DIR, "benchmarks", "results", f"auto_assign-{commit}.json"
+    )
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"results written to {output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
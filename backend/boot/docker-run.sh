@@ -1,9 +1,27 @@
 #!/bin/bash
 
-source /opt/venv/bin/activate
+if [ -f /opt/venv/bin/activate ]; then
+    source /opt/venv/bin/activate
+fi
 
 cd /code
 RUN_PORT=${PORT:-8000}
 RUN_HOST=${HOST:-0.0.0.0}
 
-gunicorn -k uvicorn.workers.UvicornWorker -b $RUN_HOST:$RUN_PORT main:app 
\ No newline at end of file
+# Shared directory for prometheus_client multiprocess mode, must be empty on boot
+export PROMETHEUS_MULTIPROC_DIR=${PROMETHEUS_MULTIPROC_DIR:-/tmp/prometheus_multiproc}
+rm -rf "$PROMETHEUS_MULTIPROC_DIR"
+mkdir -p "$PROMETHEUS_MULTIPROC_DIR"
+
+# Migrate before the workers start, the app refuses to boot off the Alembic head
+if [ -f alembic.ini ]; then
+    PYTHONPATH=/code:/code/src alembic upgrade head || exit 1
+fi
+
+# A command given to the container (e.g. uvicorn --reload in compose) replaces gunicorn
+if [ $# -gt 0 ]; then
+    exec "$@"
+fi
+
+cd /code/src
+exec gunicorn -k uvicorn.workers.UvicornWorker -c gunicorn_conf.py -b $RUN_HOST:$RUN_PORT main:app
@@ -11,7 +11,7 @@ from api.auth.auth_service import (
     verify_password,
     verify_token,
 )
-from api.companies.company_service import create_company
+from api.companies.company_service import create_company, find_company_by_id
 from api.users.user_service import (
     create_user,
     find_user_by_email,
@@ -113,7 +113,7 @@ def me(request: Request, session: Session = Depends(get_session)):
         raise HTTPException(status_code=401, detail="Invalid auth cookie")
 
     user_id = UUID(result["user_id"])
-    user = find_user_by_id(user_id, session, populate=True)
+    user = find_user_by_id(user_id, session)
 
     if not user:
         raise HTTPException(status_code=401, detail="Invalid auth cookie")
@@ -123,7 +123,9 @@ def me(request: Request, session: Session = Depends(get_session)):
         first_name=user.first_name,
         last_name=user.last_name,
         role=user.role,
-        company=user.company,
+        company=find_company_by_id(user.company_id, session)
+        if user.company_id
+        else None,
     )
 
 
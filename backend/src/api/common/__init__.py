@@ -1,4 +1,14 @@
 from .authenticate_company_admin import authenticate_company_admin
+from .columnar import VARY_ACCEPT, columnar_response, wants_columnar
 from .email_service import email_service
+from .responses import FastJSONResponse, as_dicts
 
-__all__ = ["authenticate_company_admin", "email_service"]
+__all__ = [
+    "VARY_ACCEPT",
+    "FastJSONResponse",
+    "as_dicts",
+    "authenticate_company_admin",
+    "columnar_response",
+    "email_service",
+    "wants_columnar",
+]
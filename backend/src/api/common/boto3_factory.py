@@ -1,11 +1,13 @@
-import boto3
 from decouple import config
-from botocore.exceptions import NoCredentialsError
 
 
 def get_boto3_client(
     service_name: str,
 ):
+    # boto3 takes a noticeable share of cold start, so import it on first use
+    import boto3
+    from botocore.exceptions import NoCredentialsError
+
     is_local = config("ENVIRONMENT", default=None) == "local"
     aws_region = config("AWS_REGION", default="us-east-1")
 
@@ -0,0 +1,86 @@
+"""Compact columnar encoding for large listings, opt-in via the Accept header.
+
+    Accept: application/vnd.workchart.columnar+json
+
+Instead of a list of objects the response carries one array per field.
+Repeated values (worker, company and template ids) are
+dictionary-encoded: the column holds indices into a table of distinct
+values under `refs`. Timestamps are epoch seconds:
+
+    {
+        "count": 2,
+        "refs": {"worker_id": ["7f1c..."], "template_id": ["a3e0...", "9b2d..."]},
+        "columns": {
+            "id": ["e1...", "e2..."],
+            "worker_id": [0, 0],
+            "template_id": [0, 1],
+            "start_date": [1736154000, 1736240400]
+        }
+    }
+"""
+
+from datetime import datetime, timezone
+from typing import Iterable
+
+from fastapi import Request
+
+from .responses import FastJSONResponse
+
+COLUMNAR_MEDIA_TYPE = "application/vnd.workchart.columnar+json"
+
+# Set on every representation of a negotiated endpoint, so shared caches key
+# the plain JSON and the columnar body apart
+VARY_ACCEPT = {"Vary": "Accept"}
+
+# Field kinds
+ID = "id"  # unique ids, stringified
+REF = "ref"  # dictionary-encoded scalar (ids)
+TIMESTAMP = "timestamp"  # epoch seconds
+
+
+def wants_columnar(request: Request) -> bool:
+    return COLUMNAR_MEDIA_TYPE in request.headers.get("accept", "")
+
+
+def epoch_seconds(value: datetime) -> int:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return int(value.timestamp())
+
+
+def encode_columnar(rows: Iterable, fields: dict[str, str]) -> dict:
+    """Encodes objects (attribute access) into the columnar layout."""
+    columns = {name: [] for name in fields}
+    refs = {name: [] for name, kind in fields.items() if kind == REF}
+    ref_indices = {name: {} for name in refs}
+    count = 0
+
+    for row in rows:
+        count += 1
+        for name, kind in fields.items():
+            value = getattr(row, name)
+            if value is None:
+                columns[name].append(None)
+            elif kind == TIMESTAMP:
+                columns[name].append(epoch_seconds(value))
+            elif kind == REF:
+                index = ref_indices[name].get(value)
+                if index is None:
+                    index = ref_indices[name][value] = len(refs[name])
+                    refs[name].append(str(value))
+                columns[name].append(index)
+            else:
+                columns[name].append(str(value))
+
+    return {"count": count, "refs": refs, "columns": columns}
+
+
+def columnar_response(
+    rows: Iterable, fields: dict[str, str], **extra
+) -> FastJSONResponse:
+    """`extra` keys are passed through next to the columns (e.g. `templates`)."""
+    return FastJSONResponse(
+        {**encode_columnar(rows, fields), **extra},
+        media_type=COLUMNAR_MEDIA_TYPE,
+        headers=VARY_ACCEPT,
+    )
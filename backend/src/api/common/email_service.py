@@ -1,7 +1,7 @@
-from botocore.exceptions import ClientError
 from decouple import config
 from typing import List, Optional
 from .boto3_factory import get_boto3_client
+from metrics import EMAIL_OUTBOX_DEPTH, EMAILS_SENT
 
 
 class EmailService:
@@ -9,7 +9,14 @@ class EmailService:
         self.aws_region = config("AWS_REGION", default=None)
         self.from_email = config("FROM_EMAIL", default=None)
 
-        self.ses_client = get_boto3_client("ses")
+        self._ses_client = None
+
+    @property
+    def ses_client(self):
+        # Created on first send so importing the app does not pull in boto3
+        if self._ses_client is None:
+            self._ses_client = get_boto3_client("ses")
+        return self._ses_client
 
     async def send_email(
         self,
@@ -20,6 +27,9 @@ class EmailService:
         cc_emails: Optional[List[str]] = None,
         bcc_emails: Optional[List[str]] = None,
     ) -> bool:
+        from botocore.exceptions import ClientError
+
+        EMAIL_OUTBOX_DEPTH.inc()
         try:
             destination = {
                 "ToAddresses": to_emails,
@@ -44,16 +54,21 @@ class EmailService:
             )
 
             print(f"Email sent successfully. Message ID: {response['MessageId']}")
+            EMAILS_SENT.labels("success").inc()
             return True
 
         except ClientError as e:
             error_code = e.response["Error"]["Code"]
             error_message = e.response["Error"]["Message"]
             print(f"Failed to send email. Error: {error_code} - {error_message}")
+            EMAILS_SENT.labels("error").inc()
             return False
         except Exception as e:
             print(f"Unexpected error sending email: {str(e)}")
+            EMAILS_SENT.labels("error").inc()
             return False
+        finally:
+            EMAIL_OUTBOX_DEPTH.dec()
 
 
 email_service = EmailService()
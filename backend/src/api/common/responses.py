@@ -0,0 +1,18 @@
+import orjson
+from fastapi.responses import JSONResponse
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON encoded by orjson, which handles UUIDs and datetimes natively.
+
+    Return it directly from list routes with plain dicts or rows so FastAPI
+    skips per-row model construction and `jsonable_encoder`.
+    """
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_UTC_Z | orjson.OPT_NAIVE_UTC)
+
+
+def as_dicts(rows, fields) -> list[dict]:
+    """Rows (result tuples or models) to plain dicts of the given fields."""
+    return [{field: getattr(row, field) for field in fields} for row in rows]
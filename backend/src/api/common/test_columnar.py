@@ -0,0 +1,99 @@
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+from fastapi.testclient import TestClient
+
+from api.common.columnar import (
+    COLUMNAR_MEDIA_TYPE,
+    ID,
+    REF,
+    TIMESTAMP,
+    encode_columnar,
+)
+from db.models import AssignmentSuggestionModel, WorkerShiftModel
+
+
+def test_encode_columnar_dictionary_encodes_refs():
+    start = datetime(2025, 1, 6, 9, tzinfo=timezone.utc)
+    rows = [
+        SimpleNamespace(id=1, worker_id="w1", template_id="t1", start_date=start),
+        SimpleNamespace(id=2, worker_id="w1", template_id="t2", start_date=start),
+        SimpleNamespace(id=3, worker_id="w2", template_id=None, start_date=start),
+    ]
+
+    encoded = encode_columnar(
+        rows,
+        {"id": ID, "worker_id": REF, "template_id": REF, "start_date": TIMESTAMP},
+    )
+
+    assert encoded == {
+        "count": 3,
+        "refs": {"worker_id": ["w1", "w2"], "template_id": ["t1", "t2"]},
+        "columns": {
+            "id": ["1", "2", "3"],
+            "worker_id": [0, 0, 1],
+            "template_id": [0, 1, None],
+            "start_date": [1736154000] * 3,
+        },
+    }
+
+
+def test_company_shifts_columnar(
+    client: TestClient,
+    admin_token: str,
+    existing_worker_shift: WorkerShiftModel,
+):
+    response = client.get(
+        "/worker-shifts/company",
+        params={
+            "range_start": "2025-01-06T00:00:00Z",
+            "range_end": "2025-01-06T23:59:59Z",
+        },
+        headers={"Accept": COLUMNAR_MEDIA_TYPE},
+        cookies={"access_token": admin_token},
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith(COLUMNAR_MEDIA_TYPE)
+    assert "Accept" in response.headers["vary"].split(", ")
+    body = response.json()
+    assert body["count"] == 1
+    assert body["columns"]["id"] == [str(existing_worker_shift.id)]
+    assert body["refs"]["worker_id"] == [str(existing_worker_shift.worker_id)]
+    assert body["columns"]["start_date"] == [1736154000]
+
+
+def test_my_shifts_columnar_carries_templates_map(
+    client: TestClient,
+    worker_token: str,
+    existing_worker_shift: WorkerShiftModel,
+):
+    response = client.get(
+        "/worker-shifts/my-shifts",
+        params={
+            "range_start": "2025-01-06T00:00:00Z",
+            "range_end": "2025-01-06T23:59:59Z",
+        },
+        headers={"Accept": COLUMNAR_MEDIA_TYPE},
+        cookies={"access_token": worker_token},
+    )
+
+    body = response.json()
+    template_id = str(existing_worker_shift.template_id)
+    assert body["columns"]["template_id"] == [0]
+    assert body["refs"]["template_id"] == [template_id]
+    assert body["templates"][template_id]["id"] == template_id
+
+
+def test_suggestions_default_to_plain_json(
+    client: TestClient,
+    admin_token: str,
+    assignment_suggestions: list[AssignmentSuggestionModel],
+):
+    response = client.get(
+        "/worker-shifts/suggestions", cookies={"access_token": admin_token}
+    )
+
+    assert response.headers["content-type"] == "application/json"
+    assert "Accept" in response.headers["vary"].split(", ")
+    assert len(response.json()["items"]) == 2
@@ -0,0 +1,52 @@
+import threading
+
+import pytest
+
+from api.common.single_flight import SingleFlight
+
+
+def test_concurrent_callers_share_one_execution():
+    flights = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+    results = []
+
+    def compute():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return {"items": [1, 2, 3]}
+
+    def leader():
+        results.append(flights.do("company-1", compute))
+
+    def follower():
+        results.append(flights.do("company-1", lambda: pytest.fail("ran twice")))
+
+    first = threading.Thread(target=leader)
+    first.start()
+    started.wait(5)
+    second = threading.Thread(target=follower)
+    second.start()
+    # Give the follower time to block on the in-flight call
+    second.join(0.1)
+    release.set()
+    first.join(5)
+    second.join(5)
+
+    assert len(calls) == 1
+    assert sorted(shared for _, shared in results) == [False, True]
+    assert results[0][0] is results[1][0]
+
+
+def test_errors_reach_waiters_and_are_not_kept():
+    flights = SingleFlight()
+
+    def fail():
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        flights.do("key", fail)
+
+    assert flights.do("key", lambda: 42) == (42, False)
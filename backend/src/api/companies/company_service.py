@@ -1,9 +1,24 @@
 from uuid import UUID
 from sqlmodel import Session
 from .schemas import CompanyCreateSchema
+from api.users.user_service import invalidate_company_workers
+from cache import cache
 from db.models import CompanyModel, UserModel, UserRole
 
 
+def find_company_by_id(company_id: UUID, session: Session):
+    """Cached, returns a detached copy safe to share between sessions."""
+
+    def load():
+        company = session.get(CompanyModel, company_id)
+        return company.model_dump() if company else None
+
+    row = cache.get_or_set(
+        f"company:{company_id}", load, tags=[f"company:{company_id}"]
+    )
+    return CompanyModel.model_validate(row) if row else None
+
+
 def create_company(data: CompanyCreateSchema, session: Session):
     new_company = CompanyModel.model_validate(data)
 
@@ -20,9 +35,11 @@ def add_admin(company_id: UUID, user_id: UUID, session: Session):
     if not user or not company:
         raise ValueError("User or company not found")
 
+    previous_company_id = user.company_id
     user.role = UserRole.ADMIN
     user.company_id = company.id
 
     session.add(user)
     session.commit()
+    invalidate_company_workers(previous_company_id, company.id)
 
@@ -1,28 +1,46 @@
+from typing import Optional
 from fastapi import Depends, Request, HTTPException
 from sqlmodel import Session
 from uuid import UUID
 
-from db.session import get_session
+from db.session import get_read_session, get_session
 from api.auth.auth_service import verify_token
 from api.users.user_service import find_user_by_id
 from db.models import UserModel
 
 
+def find_user_by_auth_cookie(
+    auth_cookie: Optional[str], session: Session
+) -> Optional[UserModel]:
+    result = verify_token(auth_cookie) if auth_cookie else None
+
+    if not result:
+        return None
+
+    return find_user_by_id(UUID(result["user_id"]), session)
+
+
 def authenticate_user(request: Request, session: Session = Depends(get_session)) -> UserModel:
+    return authenticate_request(request, session)
+
+
+def authenticate_reader(
+    request: Request, session: Session = Depends(get_read_session)
+) -> UserModel:
+    """`authenticate_user` for read-only routes, looks the user up on the
+    route's own read session (the primary only after a recent write)."""
+    return authenticate_request(request, session)
+
+
+def authenticate_request(request: Request, session: Session) -> UserModel:
     auth_cookie = request.cookies.get("access_token")
 
     if not auth_cookie:
         raise HTTPException(status_code=401, detail="Auth cookie missing")
 
-    result = verify_token(auth_cookie)
-
-    if not result:
-        raise HTTPException(status_code=401, detail="Invalid auth cookie")
-
-    user_id = UUID(result["user_id"])
-    user = find_user_by_id(user_id, session)
+    user = find_user_by_auth_cookie(auth_cookie, session)
 
     if not user:
         raise HTTPException(status_code=401, detail="Invalid auth cookie")
 
-    return user 
\ No newline at end of file
+    return user
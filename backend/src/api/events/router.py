@@ -0,0 +1,102 @@
+import asyncio
+import json
+from contextlib import suppress
+
+from fastapi import APIRouter, Depends, HTTPException, Request, WebSocket
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlmodel import Session
+
+from api.dependencies import find_user_by_auth_cookie
+from db.session import get_session
+from realtime import company_channel, pubsub
+
+router = APIRouter(tags=["events"])
+
+# Comment line sent on idle SSE streams so proxies keep the connection open
+SSE_KEEPALIVE_SECONDS = 15
+
+
+def authenticate_subscriber(cookies: dict, session: Session):
+    """Resolves the company to stream, then releases the DB connection.
+
+    Streams stay open for minutes, holding a pooled connection that long
+    would exhaust the pool with a handful of open calendars. Blocking, the
+    async endpoints run it in the threadpool.
+    """
+    user = find_user_by_auth_cookie(cookies.get("access_token"), session)
+    company_id = user.company_id if user else None
+    session.close()
+    return company_id
+
+
+async def cancel_and_close(task, events):
+    # The generator cannot be closed while a pending __anext__ is running it
+    if task is not None and not task.done():
+        task.cancel()
+        with suppress(asyncio.CancelledError, StopAsyncIteration):
+            await task
+    await events.aclose()
+
+
+@router.get("")
+async def stream_events(request: Request, session: Session = Depends(get_session)):
+    """Server-Sent Events stream of the current user's company changes."""
+    company_id = await run_in_threadpool(
+        authenticate_subscriber, request.cookies, session
+    )
+    if not company_id:
+        raise HTTPException(status_code=401, detail="Invalid auth cookie")
+
+    async def event_stream():
+        events = pubsub.subscribe(company_channel(company_id))
+        next_event = None
+        try:
+            yield ": connected\n\n"
+            while True:
+                next_event = next_event or asyncio.ensure_future(events.__anext__())
+                done, _ = await asyncio.wait({next_event}, timeout=SSE_KEEPALIVE_SECONDS)
+                if not done:
+                    yield ": ping\n\n"
+                    continue
+                event = next_event.result()
+                next_event = None
+                yield f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
+        finally:
+            await cancel_and_close(next_event, events)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.websocket("/ws")
+async def websocket_events(websocket: WebSocket, session: Session = Depends(get_session)):
+    """WebSocket variant of the event stream, one JSON event per message."""
+    company_id = await run_in_threadpool(
+        authenticate_subscriber, websocket.cookies, session
+    )
+    if not company_id:
+        await websocket.close(code=1008)
+        return
+
+    await websocket.accept()
+    events = pubsub.subscribe(company_channel(company_id))
+    receive = asyncio.ensure_future(websocket.receive())
+    next_event = None
+    try:
+        while True:
+            next_event = next_event or asyncio.ensure_future(events.__anext__())
+            done, _ = await asyncio.wait(
+                {next_event, receive}, return_when=asyncio.FIRST_COMPLETED
+            )
+            if receive in done:
+                # Clients never send anything, any message here is the disconnect
+                break
+            await websocket.send_json(next_event.result())
+            next_event = None
+    finally:
+        receive.cancel()
+        await cancel_and_close(next_event, events)
@@ -0,0 +1,80 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
+
+from db.models import AssignmentSuggestionModel
+from realtime import InMemoryPubSub, PubSub
+
+
+def test_in_memory_pubsub_delivers_to_channel_subscribers():
+    pubsub = InMemoryPubSub()
+
+    async def scenario():
+        received = []
+        events = pubsub.subscribe("company:1")
+        first = asyncio.ensure_future(events.__anext__())
+        await asyncio.sleep(0)
+
+        pubsub.publish("company:2", {"type": "other"})
+        pubsub.publish("company:1", {"type": "shifts.created", "count": 1})
+        received.append(await first)
+        await events.aclose()
+        return received
+
+    assert asyncio.run(scenario()) == [{"type": "shifts.created", "count": 1}]
+    assert pubsub._subscribers == {}
+
+
+def test_incomplete_pubsub_fails_on_instantiation():
+    class PublishOnly(PubSub):
+        def publish(self, channel, message):
+            pass
+
+    with pytest.raises(TypeError):
+        PublishOnly()
+
+
+def test_websocket_requires_auth(client: TestClient):
+    with pytest.raises(WebSocketDisconnect) as exc_info:
+        with client.websocket_connect("/events/ws") as websocket:
+            websocket.receive_json()
+
+    assert exc_info.value.code == 1008
+
+
+def test_sse_requires_auth(client: TestClient):
+    assert client.get("/events").status_code == 401
+
+
+def test_websocket_receives_company_changes(
+    client: TestClient,
+    admin_token: str,
+    assignment_suggestions: list[AssignmentSuggestionModel],
+):
+    """Accepting and clearing shifts pushes compact events to subscribers."""
+    client.cookies.set("access_token", admin_token)
+
+    with client.websocket_connect("/events/ws") as websocket:
+        assert client.post("/worker-shifts/suggestions/accept").status_code == 200
+        accepted = websocket.receive_json()
+
+        client.delete(
+            "/worker-shifts/clear",
+            params={
+                "range_start": "2025-01-06T00:00:00Z",
+                "range_end": "2025-01-07T23:59:59Z",
+            },
+        )
+        deleted = websocket.receive_json()
+
+    assert accepted["type"] == "suggestions.accepted"
+    assert accepted["count"] == 2
+    assert accepted["range"][0].startswith("2025-01-06T09:00:00")
+    assert accepted["range"][1].startswith("2025-01-07T17:00:00")
+    assert deleted == {
+        "type": "shifts.deleted",
+        "count": 2,
+        "range": ["2025-01-06T00:00:00Z", "2025-01-07T23:59:59Z"],
+    }
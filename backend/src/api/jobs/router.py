@@ -0,0 +1,41 @@
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException
+
+from api.dependencies import authenticate_user
+from db.models import UserRole
+from db.session import get_session
+from jobs import get_job
+
+router = APIRouter(tags=["jobs"])
+
+
+@router.get("/{job_id}")
+def get_job_status(
+    job_id: UUID,
+    session=Depends(get_session),
+    current_user=Depends(authenticate_user),
+):
+    """Status polling for background jobs, read from the primary."""
+    job = get_job(job_id, session)
+    # Admins see their company's jobs, workers only the ones they started
+    if (
+        job is None
+        or job.company_id != current_user.company_id
+        or (current_user.role != UserRole.ADMIN and job.created_by != current_user.id)
+    ):
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    return {
+        "id": job.id,
+        "kind": job.kind,
+        "status": job.status,
+        "progress": job.progress,
+        "attempts": job.attempts,
+        "max_attempts": job.max_attempts,
+        "result": job.result,
+        "error": job.error,
+        "created_at": job.created_at,
+        "started_at": job.started_at,
+        "finished_at": job.finished_at,
+    }
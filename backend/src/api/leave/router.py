@@ -1,9 +1,9 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlmodel import Session
 
-from db.session import get_session
+from db.session import get_read_session, get_session
 
-from api.dependencies import authenticate_user
+from api.dependencies import authenticate_reader, authenticate_user
 from db.models import UserModel
 from .schemas import CreateLeaveSchema, EditLeaveSchema
 from . import leave_service
@@ -44,8 +44,8 @@ def create(
 
 @router.get("/my-leaves")
 def get_my_leaves(
-    session: Session = Depends(get_session),
-    current_user: UserModel = Depends(authenticate_user),
+    session: Session = Depends(get_read_session),
+    current_user: UserModel = Depends(authenticate_reader),
 ):
     leaves = leave_service.get_leaves_by_user_id(
         user_id=current_user.id, session=session
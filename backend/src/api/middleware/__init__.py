@@ -0,0 +1,5 @@
+from .metrics import MetricsMiddleware
+from .query_stats import QueryStatsMiddleware
+from .read_your_writes import ReadYourWritesMiddleware
+
+__all__ = ["MetricsMiddleware", "QueryStatsMiddleware", "ReadYourWritesMiddleware"]
@@ -0,0 +1,38 @@
+import time
+
+from metrics import REQUEST_LATENCY, REQUESTS_IN_PROGRESS
+
+
+class MetricsMiddleware:
+    """Records per-route latency histograms and in-flight request gauges."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        in_progress = REQUESTS_IN_PROGRESS.labels(method)
+        in_progress.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            in_progress.dec()
+            # Label by route template, unmatched paths share one series so
+            # scanners can't blow up label cardinality
+            route = getattr(scope.get("route"), "path", None) or "<unmatched>"
+            REQUEST_LATENCY.labels(method, route, str(status_code)).observe(
+                time.perf_counter() - start
+            )
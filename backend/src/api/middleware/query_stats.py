@@ -0,0 +1,73 @@
+import logging
+import random
+
+from decouple import config
+
+from db.query_stats import QueryStats, current_query_stats
+
+logger = logging.getLogger(__name__)
+
+# Fraction of requests that get counted, 1.0 counts every request
+QUERY_STATS_SAMPLE_RATE = config("QUERY_STATS_SAMPLE_RATE", default=1.0, cast=float)
+# Routes issuing more statements than this are logged as likely N+1 patterns
+QUERY_COUNT_WARNING_THRESHOLD = config(
+    "QUERY_COUNT_WARNING_THRESHOLD", default=30, cast=int
+)
+
+
+def get_route_path(scope) -> str:
+    """Route template (e.g. `/leaves/{leave_id}`) once routing has run."""
+    route = scope.get("route")
+    return getattr(route, "path", None) or scope.get("path", "")
+
+
+class QueryStatsMiddleware:
+    """Counts SQL statements and DB time per request.
+
+    Results are exposed as a `Server-Timing` header and a warning is logged
+    when a route exceeds `QUERY_COUNT_WARNING_THRESHOLD` statements.
+    """
+
+    def __init__(
+        self,
+        app,
+        sample_rate: float = QUERY_STATS_SAMPLE_RATE,
+        warning_threshold: int = QUERY_COUNT_WARNING_THRESHOLD,
+    ):
+        self.app = app
+        self.sample_rate = sample_rate
+        self.warning_threshold = warning_threshold
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or random.random() >= self.sample_rate:
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = current_query_stats.set(stats)
+
+        async def send_with_server_timing(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append(
+                    (
+                        b"server-timing",
+                        f'db;dur={stats.duration * 1000:.2f};desc="{stats.count} queries"'.encode(),
+                    )
+                )
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_server_timing)
+        finally:
+            current_query_stats.reset(token)
+            if stats.count > self.warning_threshold:
+                logger.warning(
+                    "%s %s issued %d queries (%.1f ms), threshold is %d",
+                    scope["method"],
+                    get_route_path(scope),
+                    stats.count,
+                    stats.duration * 1000,
+                    self.warning_threshold,
+                )
@@ -0,0 +1,43 @@
+import math
+import time
+
+from db.config import READ_YOUR_WRITES_SECONDS
+from db.session import LAST_WRITE_COOKIE
+
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+
+class ReadYourWritesMiddleware:
+    """Stamps successful writes with a short-lived cookie.
+
+    `get_read_session` sends clients carrying a fresh stamp to the primary,
+    so a replica lagging behind never hides a change the client just made.
+    Kept in a cookie rather than process memory so it holds across workers.
+    """
+
+    def __init__(self, app, window_seconds: float = READ_YOUR_WRITES_SECONDS):
+        self.app = app
+        self.window_seconds = window_seconds
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or scope["method"] in SAFE_METHODS
+            or self.window_seconds <= 0
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_write_stamp(message):
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                cookie = (
+                    f"{LAST_WRITE_COOKIE}={time.time():.3f}; "
+                    f"Max-Age={math.ceil(self.window_seconds)}; Path=/; "
+                    "HttpOnly; SameSite=Lax"
+                )
+                headers = list(message.get("headers", []))
+                headers.append((b"set-cookie", cookie.encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        await self.app(scope, receive, send_with_write_stamp)
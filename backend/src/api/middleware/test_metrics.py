@@ -0,0 +1,63 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from api.middleware import MetricsMiddleware
+from metrics import render_metrics
+
+
+def make_app() -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware)
+
+    @app.get("/metrics-test/{item_id}")
+    def read_item(item_id: int):
+        return {"item_id": item_id}
+
+    return app
+
+
+def test_latency_is_labelled_by_route_template():
+    """Requests are grouped by route template, not by concrete path."""
+    client = TestClient(make_app())
+
+    client.get("/metrics-test/1")
+    client.get("/metrics-test/2")
+
+    content, _ = render_metrics()
+    assert (
+        'http_request_duration_seconds_count{method="GET",'
+        'route="/metrics-test/{item_id}",status="200"} 2.0'
+    ) in content.decode()
+
+
+def test_unmatched_paths_share_one_series():
+    """Unknown paths don't create a series per URL."""
+    client = TestClient(make_app())
+
+    client.get("/metrics-test-missing/abc")
+
+    content, _ = render_metrics()
+    assert 'route="<unmatched>",status="404"' in content.decode()
+    assert "metrics-test-missing" not in content.decode()
+
+
+def test_pool_gauges_are_labelled_by_engine():
+    """Replica pools don't overwrite or blend into the primary's samples."""
+    from sqlalchemy import create_engine
+    from sqlalchemy.pool import QueuePool
+
+    from metrics import install_pool_metrics
+
+    primary = create_engine("sqlite://", poolclass=QueuePool, pool_size=3)
+    replica = create_engine("sqlite://", poolclass=QueuePool, pool_size=7)
+    install_pool_metrics(primary, "test-primary")
+    install_pool_metrics(replica, "test-replica")
+
+    with primary.connect():
+        content, _ = render_metrics()
+
+    text = content.decode()
+    assert 'db_pool_size{engine="test-primary"} 3.0' in text
+    assert 'db_pool_size{engine="test-replica"} 7.0' in text
+    assert 'db_pool_checked_out_connections{engine="test-primary"} 1.0' in text
+    assert 'db_pool_checked_out_connections{engine="test-replica"} 0.0' in text
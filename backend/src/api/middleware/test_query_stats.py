@@ -0,0 +1,57 @@
+import logging
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlmodel import create_engine
+
+from api.middleware import QueryStatsMiddleware
+from db.query_stats import install_query_hooks
+
+
+def make_app(queries_per_request: int, **middleware_options) -> FastAPI:
+    engine = create_engine("sqlite://")
+    install_query_hooks(engine)
+
+    app = FastAPI()
+    app.add_middleware(QueryStatsMiddleware, **middleware_options)
+
+    @app.get("/items/{item_id}")
+    def read_item(item_id: int):
+        with engine.connect() as connection:
+            for _ in range(queries_per_request):
+                connection.execute(text("SELECT 1"))
+        return {"item_id": item_id}
+
+    return app
+
+
+def test_server_timing_header_counts_queries():
+    """Each statement executed during the request is counted in Server-Timing."""
+    client = TestClient(make_app(queries_per_request=3))
+
+    response = client.get("/items/1")
+
+    assert response.status_code == 200
+    assert response.headers["server-timing"].startswith("db;dur=")
+    assert 'desc="3 queries"' in response.headers["server-timing"]
+
+
+def test_warns_when_route_exceeds_threshold(caplog):
+    """Routes above the threshold are logged with their route template."""
+    client = TestClient(make_app(queries_per_request=5, warning_threshold=4))
+
+    with caplog.at_level(logging.WARNING, logger="api.middleware.query_stats"):
+        client.get("/items/1")
+
+    assert "GET /items/{item_id} issued 5 queries" in caplog.text
+
+
+def test_unsampled_requests_are_not_counted():
+    """With a zero sample rate no header is added."""
+    client = TestClient(make_app(queries_per_request=3, sample_rate=0.0))
+
+    response = client.get("/items/1")
+
+    assert response.status_code == 200
+    assert "server-timing" not in response.headers
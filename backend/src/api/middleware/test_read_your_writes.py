@@ -0,0 +1,94 @@
+import itertools
+
+import pytest
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.testclient import TestClient
+
+import db.session
+from api.middleware import ReadYourWritesMiddleware
+from db.session import LAST_WRITE_COOKIE, get_session, pick_read_engine
+from main import app
+
+
+@pytest.fixture
+def replica(monkeypatch):
+    replica_engine = object()
+    monkeypatch.setattr(db.session, "replica_engines", [replica_engine])
+    monkeypatch.setattr(db.session, "_next_replica", itertools.cycle([replica_engine]))
+    return replica_engine
+
+
+def make_app(replica_engine) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(ReadYourWritesMiddleware, window_seconds=5)
+
+    @app.post("/items")
+    def create_item():
+        return {"status": "success"}
+
+    @app.post("/broken")
+    def broken():
+        raise HTTPException(status_code=400, detail="Bad payload")
+
+    @app.get("/items")
+    def list_items(request: Request):
+        return {"replica": pick_read_engine(request) is replica_engine}
+
+    return app
+
+
+def test_reads_go_to_replica(replica):
+    client = TestClient(make_app(replica))
+
+    response = client.get("/items")
+
+    assert response.json() == {"replica": True}
+    assert LAST_WRITE_COOKIE not in response.cookies
+
+
+def test_reads_stick_to_primary_after_write(replica):
+    """A client's write pins its reads to the primary for the window."""
+    client = TestClient(make_app(replica))
+
+    write = client.post("/items")
+    assert LAST_WRITE_COOKIE in write.cookies
+
+    assert client.get("/items").json() == {"replica": False}
+    assert TestClient(make_app(replica)).get("/items").json() == {"replica": True}
+
+
+def test_failed_write_does_not_pin(replica):
+    client = TestClient(make_app(replica))
+
+    response = client.post("/broken")
+
+    assert response.status_code == 400
+    assert LAST_WRITE_COOKIE not in response.cookies
+
+
+def test_reads_use_primary_without_replicas():
+    client = TestClient(make_app(replica_engine=None))
+
+    assert client.get("/items").json() == {"replica": False}
+
+
+def test_read_routes_authenticate_on_the_read_session(
+    client: TestClient, admin_token: str
+):
+    """Read routes never check out a primary connection for the user lookup."""
+
+    def no_primary():
+        raise AssertionError("read route used the primary session")
+
+    app.dependency_overrides[get_session] = no_primary
+
+    response = client.get(
+        "/worker-shifts/company",
+        params={
+            "range_start": "2025-01-06T00:00:00Z",
+            "range_end": "2025-01-06T23:59:59Z",
+        },
+        cookies={"access_token": admin_token},
+    )
+
+    assert response.status_code == 200
@@ -2,7 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlmodel import Session
 
 from api.shift_template import shift_template_service
-from db.session import get_session
+from db.session import get_read_session, get_session
 from api.shift_template.schemas import (
     CreateShiftTemplateSchema,
     EditShiftTemplateSchema,
@@ -13,7 +13,7 @@ from api.shift_template.shift_template_service import (
     find_shift_templates_by_company_id,
     edit_shift_template,
 )
-from api.dependencies import authenticate_user
+from api.dependencies import authenticate_reader, authenticate_user
 from db.models import UserModel, UserRole
 from api.common import authenticate_company_admin
 
@@ -35,8 +35,8 @@ def create(
 
 @router.get("/company")
 def get_shift_templates(
-    session: Session = Depends(get_session),
-    current_user: UserModel = Depends(authenticate_user),
+    session: Session = Depends(get_read_session),
+    current_user: UserModel = Depends(authenticate_reader),
 ):
     if current_user.role != UserRole.ADMIN:
         raise HTTPException(status_code=403, detail="User must be ADMIN.")
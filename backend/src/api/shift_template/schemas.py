@@ -1,15 +1,41 @@
+from datetime import date
 from typing import List, Optional
+
+from pydantic import field_validator
 from sqlmodel import SQLModel
 
 
+def empty_date_to_none(value):
+    # Cleared date inputs are sent as ""
+    return None if value == "" else value
+
+
+def normalize_time(value):
+    """"9:5" -> "09:05", stored times are compared as strings in SQL."""
+    if value is None:
+        return value
+    try:
+        hours, minutes = map(int, value.split(":")[:2])
+    except (AttributeError, ValueError):
+        raise ValueError("Time must be HH:MM")
+    if not (0 <= hours < 24 and 0 <= minutes < 60):
+        raise ValueError("Time must be HH:MM")
+    return f"{hours:02d}:{minutes:02d}"
+
+
 class CreateShiftTemplateSchema(SQLModel):
     name: str
     position: str
     startTime: str
     endTime: str
     days: Optional[List[int]] = None
-    startDate: Optional[str] = None
-    endDate: Optional[str] = None
+    startDate: Optional[date] = None
+    endDate: Optional[date] = None
+
+    _empty_dates = field_validator("startDate", "endDate", mode="before")(
+        empty_date_to_none
+    )
+    _times = field_validator("startTime", "endTime")(normalize_time)
 
 
 class EditShiftTemplateSchema(SQLModel):
@@ -18,6 +44,11 @@ class EditShiftTemplateSchema(SQLModel):
     startTime: Optional[str] = None
     endTime: Optional[str] = None
     days: Optional[List[int]] = None
-    startDate: Optional[str] = None
-    endDate: Optional[str] = None
+    startDate: Optional[date] = None
+    endDate: Optional[date] = None
+
+    _empty_dates = field_validator("startDate", "endDate", mode="before")(
+        empty_date_to_none
+    )
+    _times = field_validator("startTime", "endTime")(normalize_time)
     
\ No newline at end of file
@@ -1,10 +1,20 @@
+from datetime import date
+from typing import Optional
 from uuid import UUID
-from sqlmodel import Session, select
+from sqlalchemy.dialects import postgresql
+from sqlmodel import Session, or_, select
 from api.shift_template.schemas import (
     CreateShiftTemplateSchema,
     EditShiftTemplateSchema,
 )
+from api.worker_shifts.week_snapshots import invalidate_company_snapshots
+from cache import cache
 from db.models import ShiftTemplateModel
+from db.session import is_replica_session
+
+
+def company_templates_tag(company_id) -> str:
+    return f"company:{company_id}:shift_templates"
 
 
 def create_shift_template(
@@ -16,15 +26,109 @@ def create_shift_template(
     session.add(new_shift_template)
     session.commit()
     session.refresh(new_shift_template)
+    cache.invalidate_tags(company_templates_tag(company_id))
     return new_shift_template
 
 
 def find_shift_templates_by_company_id(company_id: str, session: Session):
-    query = select(ShiftTemplateModel).where(
-        ShiftTemplateModel.company_id == company_id
+    """Cached per company, returns detached copies safe to share between sessions.
+
+    Replica sessions only read the cache, a lagging replica must not refill
+    it right after an invalidation.
+    """
+
+    def load():
+        query = select(ShiftTemplateModel).where(
+            ShiftTemplateModel.company_id == company_id
+        )
+        return [template.model_dump() for template in session.exec(query).all()]
+
+    rows = cache.get_or_set(
+        f"shift_templates:company:{company_id}",
+        load,
+        tags=[company_templates_tag(company_id)],
+        store=not is_replica_session(session),
     )
-    results = session.exec(query).all()
-    return results
+    return [ShiftTemplateModel.model_validate(row) for row in rows]
+
+
+def find_active_shift_templates(
+    company_id: UUID,
+    first_day: date,
+    last_day: date,
+    session: Session,
+    weekdays: Optional[set[int]] = None,
+    start_time_window: Optional[tuple[str, str]] = None,
+    cached: bool = True,
+):
+    """Templates that can produce a slot between `first_day` and `last_day`.
+
+    Filters in SQL on the validity window and, when given, on `days`
+    overlapping `weekdays` (GIN indexed, Postgres only) and on the start time
+    lying in `start_time_window` ("HH:MM" exclusive lower, inclusive upper
+    bound). Ordered by start time then id, which auto-assign fills slots
+    of a day in. Cached per company and arguments like
+    `find_shift_templates_by_company_id`, writers pass `cached=False` to read
+    the current rows.
+    """
+    if weekdays is not None and not weekdays:
+        return []
+
+    def load():
+        query = (
+            select(ShiftTemplateModel)
+            .where(ShiftTemplateModel.company_id == company_id)
+            .where(
+                or_(
+                    ShiftTemplateModel.startDate.is_(None),
+                    ShiftTemplateModel.startDate <= last_day,
+                )
+            )
+            .where(
+                or_(
+                    ShiftTemplateModel.endDate.is_(None),
+                    ShiftTemplateModel.endDate >= first_day,
+                )
+            )
+            .order_by(ShiftTemplateModel.startTime, ShiftTemplateModel.id)
+        )
+        # `days` is plain JSON on SQLite, the engine filters weekdays anyway
+        if weekdays is not None and session.get_bind().dialect.name == "postgresql":
+            query = query.where(
+                ShiftTemplateModel.days.op("&&")(postgresql.array(sorted(weekdays)))
+            )
+        if start_time_window is not None:
+            query = query.where(
+                ShiftTemplateModel.startTime > start_time_window[0],
+                ShiftTemplateModel.startTime <= start_time_window[1],
+            )
+        return [template.model_dump() for template in session.exec(query).all()]
+
+    if not cached:
+        return [ShiftTemplateModel.model_validate(row) for row in load()]
+
+    key = ":".join(
+        [
+            f"shift_templates:company:{company_id}:active:{first_day}:{last_day}",
+            ",".join(map(str, sorted(weekdays))) if weekdays is not None else "*",
+            "-".join(start_time_window) if start_time_window is not None else "*",
+        ]
+    )
+    rows = cache.get_or_set(
+        key,
+        load,
+        tags=[company_templates_tag(company_id)],
+        store=not is_replica_session(session),
+    )
+    return [ShiftTemplateModel.model_validate(row) for row in rows]
+
+
+def find_shift_templates_by_ids(shift_template_ids, session: Session):
+    ids = {shift_template_id for shift_template_id in shift_template_ids if shift_template_id}
+    if not ids:
+        return []
+    query = select(ShiftTemplateModel).where(ShiftTemplateModel.id.in_(ids))
+    return session.exec(query).all()
 
 
 def find_shift_template_by_id(shift_template_id: str, session: Session):
@@ -44,8 +148,13 @@ def edit_shift_template(
         setattr(shift_template, field, value)
 
     session.commit()
+    cache.invalidate_tags(company_templates_tag(shift_template.company_id))
+    invalidate_company_snapshots(shift_template.company_id, session)
 
 
 def delete_shift_template(shift_template: ShiftTemplateModel, session: Session):
+    company_id = shift_template.company_id
     session.delete(shift_template)
     session.commit()
+    cache.invalidate_tags(company_templates_tag(company_id))
+    invalidate_company_snapshots(company_id, session)
@@ -4,11 +4,11 @@ from decouple import config
 
 from api.auth import auth_service
 from api.common import authenticate_company_admin
-from api.dependencies import authenticate_user
+from api.dependencies import authenticate_reader, authenticate_user
 from api.common import email_service
 from .schemas import AddWorkerPayloadSchema, EditWorkerPayloadSchema
 from db.models import TokenType, UserModel, UserRole
-from db.session import get_session
+from db.session import get_read_session, get_session
 from . import user_service
 
 router = APIRouter(tags=["users"])
@@ -56,8 +56,8 @@ async def create_worker(
 
 @router.get("/workers")
 def get_workers(
-    session: Session = Depends(get_session),
-    current_user: UserModel = Depends(authenticate_user),
+    session: Session = Depends(get_read_session),
+    current_user: UserModel = Depends(authenticate_reader),
 ):
     if current_user.role != UserRole.ADMIN or not current_user.company_id:
         raise HTTPException(status_code=401, detail="Not authorized")
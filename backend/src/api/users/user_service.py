@@ -3,15 +3,29 @@ from uuid import UUID
 
 from api.auth.auth_service import get_password_hash
 from api.users.schemas import CreateUserSchema, EditWorkerPayloadSchema
+from api.worker_shifts.week_snapshots import invalidate_company_snapshots
+from cache import cache
 from db.models import UserModel, UserRole
+from db.session import is_replica_session
 from sqlalchemy.orm import selectinload
 
 
+def company_workers_tag(company_id) -> str:
+    return f"company:{company_id}:workers"
+
+
+def invalidate_company_workers(*company_ids):
+    cache.invalidate_tags(
+        *(company_workers_tag(company_id) for company_id in company_ids if company_id)
+    )
+
+
 def create_user(data: CreateUserSchema, session: Session):
     new_user = UserModel.model_validate(data)
     session.add(new_user)
     session.commit()
     session.refresh(new_user)
+    invalidate_company_workers(new_user.company_id)
     return new_user
 
 
@@ -20,6 +34,7 @@ def update_user_password(user_id: UUID, password: str, session: Session):
     hashed_password = get_password_hash(password)
     user.password = hashed_password
     session.commit()
+    invalidate_company_workers(user.company_id)
 
 
 def find_user_by_email(email: str, session: Session):
@@ -33,13 +48,37 @@ def find_user_by_id(user_id: UUID, session: Session, populate: bool = False):
     return session.exec(query).first()
 
 
-def find_workers_by_company_id(company_id: UUID, session: Session):
-    quer = (
-        select(UserModel)
-        .where(UserModel.company_id == company_id)
-        .where(UserModel.role != UserRole.ADMIN)
-    )
-    return session.exec(quer).all()
+def find_workers_by_company_id(
+    company_id: UUID, session: Session, cached: bool = True
+):
+    """Cached per company, returns detached copies safe to share between sessions.
+
+    Password hashes are never cached, so the copies have `password` unset.
+    Replica sessions only read the cache, a lagging replica must not refill
+    it right after an invalidation. Writers pass `cached=False` to read the
+    current rows.
+    """
+
+    def load():
+        quer = (
+            select(UserModel)
+            .where(UserModel.company_id == company_id)
+            .where(UserModel.role != UserRole.ADMIN)
+        )
+        return [
+            user.model_dump(exclude={"password"}) for user in session.exec(quer).all()
+        ]
+
+    if cached:
+        rows = cache.get_or_set(
+            f"workers:company:{company_id}",
+            load,
+            tags=[company_workers_tag(company_id)],
+            store=not is_replica_session(session),
+        )
+    else:
+        rows = load()
+    return [UserModel.model_validate(row) for row in rows]
 
 
 def edit_user(user: UserModel, payload: EditWorkerPayloadSchema, session: Session):
@@ -49,11 +88,18 @@ def edit_user(user: UserModel, payload: EditWorkerPayloadSchema, session: Sessio
         setattr(user, field, value)
 
     session.commit()
+    invalidate_company_workers(user.company_id)
+    if user.company_id:
+        invalidate_company_snapshots(user.company_id, session)
 
 
 def delete_user(user: UserModel, session: Session):
+    company_id = user.company_id
     session.delete(user)
     session.commit()
+    invalidate_company_workers(company_id)
+    if company_id:
+        invalidate_company_snapshots(company_id, session)
 
 
 def find_users_for_shift_templates(shift_templates: list[UUID], session: Session):
@@ -0,0 +1,310 @@
+"""Auto-assign pipeline shared by the HTTP route and the `auto_assign` job.
+
+Concurrent identical requests in one process share a single run
+(`SingleFlight`), and runs for the same company are serialized across
+processes with a transaction-level Postgres advisory lock, so two admins
+can no longer interleave the delete and save of each other's suggestions.
+A run waits at most AUTO_ASSIGN_LOCK_TIMEOUT seconds for the lock.
+
+Solved placeholder sets are memoized by a fingerprint of everything the
+solver reads, and a run whose result is already stored as the company's
+suggestions leaves the table untouched. Workers and templates are read
+from the session, bypassing the shared caches, so rows deleted moments ago
+can't end up in the suggestions.
+"""
+
+import hashlib
+import json
+import time
+from contextlib import contextmanager
+from dataclasses import asdict
+from typing import Callable, Optional
+from uuid import UUID
+
+from decouple import config
+from sqlmodel import Session
+
+from api.common.responses import as_dicts
+from api.common.single_flight import SingleFlight
+from api.shift_template.shift_template_service import (
+    find_active_shift_templates,
+)
+from api.users.user_service import find_workers_by_company_id
+from cache import InMemoryLRUBackend
+from jobs import PermanentJobError, job_handler
+from db.locks import (
+    AUTO_ASSIGN_LOCK_NAMESPACE,
+    advisory_xact_lock,
+    uuid_lock_key,
+)
+from metrics import AUTO_ASSIGN_DURATION, AUTO_ASSIGN_SLOTS
+from .schemas import Range
+from .worker_shift_service import (
+    ASSIGNMENT_SUGGESTION_FIELDS,
+    AutoAssignStats,
+    active_template_filters,
+    delete_all_company_suggestions,
+    get_assignment_suggestion_rows_by_company,
+    get_worker_shifts_in_time_range,
+    parse_datetime,
+    prepare_auto_assign_shifts,
+    save_assignment_suggestions,
+)
+from .open_slots import OpenSlots, assign_open_slots, load_open_slots
+from .week_snapshots import to_utc
+
+# "python" loads existing shifts and expands templates in process, "database"
+# has Postgres expand the slots (see open_slots.py), both suggest the same shifts
+AUTO_ASSIGN_CANDIDATES = config("AUTO_ASSIGN_CANDIDATES", default="python")
+# Solved placeholder sets kept per process, 0 disables memoization
+AUTO_ASSIGN_MEMO_SIZE = config("AUTO_ASSIGN_MEMO_SIZE", default=64, cast=int)
+AUTO_ASSIGN_MEMO_TTL = config("AUTO_ASSIGN_MEMO_TTL", default=3600.0, cast=float)
+# Seconds a run waits for another run of the same company, then LockTimeout
+AUTO_ASSIGN_LOCK_TIMEOUT = config("AUTO_ASSIGN_LOCK_TIMEOUT", default=10.0, cast=float)
+
+auto_assign_flights = SingleFlight()
+auto_assign_memo = InMemoryLRUBackend(max_entries=AUTO_ASSIGN_MEMO_SIZE)
+
+
+@contextmanager
+def record_phase(timings: dict, name: str):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[name] = round((time.perf_counter() - start) * 1000, 3)
+
+
+def candidate_source(session: Session) -> str:
+    """"database" needs Postgres, anything else generates candidates in Python."""
+    if (
+        AUTO_ASSIGN_CANDIDATES == "database"
+        and session.get_bind().dialect.name == "postgresql"
+    ):
+        return "database"
+    return "python"
+
+
+def auto_assign_fingerprint(
+    data: dict,
+    worker_shifts: list,
+    shift_templates: list,
+    users: list,
+    open_slots: Optional[OpenSlots] = None,
+) -> str:
+    """Hash of every solver input, equal fingerprints solve to equal placeholders.
+
+    Worker order is kept since it breaks ties between equally loaded workers.
+    """
+    inputs = {
+        "range": [data["range_start"], data["range_end"]],
+        "overwrite_shifts": data["overwrite_shifts"],
+        "templates": sorted(
+            [
+                str(template.id),
+                template.startTime,
+                template.endTime,
+                template.days,
+                template.startDate,
+                template.endDate,
+            ]
+            for template in shift_templates
+        ),
+        "workers": [str(user.id) for user in users],
+        "shifts": sorted(
+            [
+                str(shift.id),
+                str(shift.worker_id),
+                str(shift.template_id),
+                to_utc(shift.start_date).isoformat(),
+                to_utc(shift.end_date).isoformat(),
+            ]
+            for shift in worker_shifts
+        ),
+    }
+    if open_slots is not None:
+        inputs["open_slots"] = [
+            open_slots.expanded.days.tolist(),
+            [str(open_slots.template_ids[i]) for i in open_slots.expanded.templates],
+            open_slots.expanded.start_minutes.tolist(),
+            open_slots.expanded.end_minutes.tolist(),
+            sorted(
+                [day, sorted(map(str, workers))]
+                for day, workers in open_slots.busy_by_day.items()
+            ),
+            sorted(
+                [day, str(open_slots.template_ids[template]), str(worker_id)]
+                for day, covered in open_slots.covered_by_day.items()
+                for template, worker_id in covered.items()
+            ),
+        ]
+    encoded = json.dumps(inputs, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+def placeholder_key(worker_id, template_id, start_date, end_date) -> tuple:
+    return (worker_id, template_id, to_utc(start_date), to_utc(end_date))
+
+
+def stored_suggestions_match(rows, shift_placeholders) -> bool:
+    """True when the stored suggestions are exactly the given placeholders."""
+    if len(rows) != len(shift_placeholders):
+        return False
+    stored = sorted(
+        placeholder_key(row.worker_id, row.template_id, row.start_date, row.end_date)
+        for row in rows
+    )
+    solved = sorted(
+        placeholder_key(
+            p["worker_id"], p["template_id"], p["start_date"], p["end_date"]
+        )
+        for p in shift_placeholders
+    )
+    return stored == solved
+
+
+def compute_auto_assign(
+    company_id: UUID,
+    data: dict,
+    session: Session,
+    progress: Optional[Callable[[float], None]] = None,
+) -> dict:
+    """Replaces the company's suggestions for the range, returns items and debug info.
+
+    The old suggestions are deleted and the new ones saved in one
+    transaction, committed by `save_assignment_suggestions`.
+    """
+    timings = {}
+    stats = AutoAssignStats()
+    progress = progress or (lambda value: None)
+
+    start_date = parse_datetime(data["range_start"])
+    end_date = parse_datetime(data["range_end"])
+    worker_shifts, shift_templates, open_slots = [], [], None
+    candidates = candidate_source(session)
+
+    if candidates == "database":
+        with record_phase(timings, "load_open_slots"):
+            open_slots = load_open_slots(
+                company_id, start_date, end_date, data["overwrite_shifts"], session
+            )
+    else:
+        with record_phase(timings, "load_shifts"):
+            if not data["overwrite_shifts"]:
+                worker_shifts = get_worker_shifts_in_time_range(
+                    company_id, data["range_start"], data["range_end"], session
+                )
+
+        with record_phase(timings, "load_templates"):
+            shift_templates = find_active_shift_templates(
+                company_id,
+                session=session,
+                cached=False,
+                **active_template_filters(start_date, end_date),
+            )
+
+    with record_phase(timings, "load_workers"):
+        users = find_workers_by_company_id(company_id, session, cached=False)
+    progress(0.2)
+
+    with record_phase(timings, "fingerprint"):
+        fingerprint = auto_assign_fingerprint(
+            data, worker_shifts, shift_templates, users, open_slots
+        )
+        memo_key = f"{company_id}:{fingerprint}"
+        shift_placeholders = auto_assign_memo.get_many([memo_key]).get(memo_key)
+    memoized = shift_placeholders is not None
+
+    if not memoized:
+        with record_phase(timings, "prepare_auto_assign_shifts"):
+            if open_slots is not None:
+                shift_placeholders = assign_open_slots(
+                    open_slots, start_date, users, stats=stats
+                )
+            else:
+                range = Range(
+                    range_start=data["range_start"], range_end=data["range_end"]
+                )
+                shift_placeholders = prepare_auto_assign_shifts(
+                    range, worker_shifts, shift_templates, users, stats=stats
+                )
+        AUTO_ASSIGN_DURATION.observe(timings["prepare_auto_assign_shifts"] / 1000)
+        if AUTO_ASSIGN_MEMO_SIZE:
+            auto_assign_memo.set_many(
+                {memo_key: shift_placeholders}, ttl=AUTO_ASSIGN_MEMO_TTL
+            )
+    AUTO_ASSIGN_SLOTS.observe(len(shift_placeholders))
+    progress(0.8)
+
+    debug = {
+        "timings_ms": timings,
+        "solver": asdict(stats),
+        "candidates": candidates,
+        "fingerprint": fingerprint,
+        "memoized": memoized,
+        "suggestions_reused": False,
+    }
+
+    if memoized:
+        with record_phase(timings, "load_suggestions"):
+            rows = get_assignment_suggestion_rows_by_company(company_id, session)
+        if stored_suggestions_match(rows, shift_placeholders):
+            debug["suggestions_reused"] = True
+            return {"items": as_dicts(rows, ASSIGNMENT_SUGGESTION_FIELDS), "debug": debug}
+
+    with record_phase(timings, "delete_old_suggestions"):
+        delete_all_company_suggestions(company_id, session, commit=False)
+
+    with record_phase(timings, "save_suggestions"):
+        suggestions = save_assignment_suggestions(
+            shift_placeholders, company_id, session
+        )
+
+    return {
+        "items": as_dicts(suggestions, ASSIGNMENT_SUGGESTION_FIELDS),
+        "debug": debug,
+    }
+
+
+def run_auto_assign(
+    company_id: UUID,
+    data: dict,
+    session: Session,
+    progress: Optional[Callable[[float], None]] = None,
+) -> dict:
+    """`compute_auto_assign`, coalesced and locked per company.
+
+    `debug.coalesced` is True for requests that got another request's result.
+    Raises `LockTimeout` when another run holds the company's lock too long.
+    """
+    key = (
+        company_id,
+        data["range_start"],
+        data["range_end"],
+        data["overwrite_shifts"],
+    )
+
+    def locked_compute():
+        with advisory_xact_lock(
+            session,
+            AUTO_ASSIGN_LOCK_NAMESPACE,
+            uuid_lock_key(company_id),
+            AUTO_ASSIGN_LOCK_TIMEOUT,
+        ):
+            return compute_auto_assign(company_id, data, session, progress)
+
+    result, shared = auto_assign_flights.do(key, locked_compute)
+    return {**result, "debug": {**result["debug"], "coalesced": shared}}
+
+
+@job_handler("auto_assign")
+def auto_assign_job(payload: dict, session: Session, progress) -> dict:
+    """Suggestions are stored by the run, the job result only summarizes it."""
+    try:
+        result = run_auto_assign(
+            UUID(payload["company_id"]), payload, session, progress
+        )
+    except ValueError as e:
+        # Not enough workers for the templates, the same on every retry
+        raise PermanentJobError(str(e)) from e
+    return {"count": len(result["items"]), "debug": result["debug"]}
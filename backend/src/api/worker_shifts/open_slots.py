@@ -0,0 +1,211 @@
+"""Database side candidate generation for auto-assign (Postgres only).
+
+Instead of loading every existing shift of the range into the app server,
+Postgres expands the company's templates over the range with
+`generate_series` and resolves the worker of each slot an existing shift
+already covers, returning only the slots plus per day busy workers.
+Python is left with worker selection, shared with the in-process engine
+(`assign_slot_workers`), so both sources suggest the same shifts.
+
+Existing shifts are read like `get_worker_shifts_in_time_range` does: the
+company's own, fully inside the range, placed on their UTC day, the
+earliest one keeping a doubly covered slot.
+"""
+
+from datetime import datetime
+from typing import NamedTuple, Optional
+from uuid import UUID
+
+from sqlalchemy import Date, DateTime, Integer, Uuid, bindparam, text
+from sqlmodel import Session
+
+from db.models import UserModel
+from .worker_shift_service import (
+    AutoAssignStats,
+    ExpandedSlots,
+    ShiftPlaceholder,
+    assign_slot_workers,
+    range_days,
+    slots_to_placeholders,
+)
+
+# Existing shifts auto-assign takes into account, see `shifts_within`
+RANGE_SHIFTS = """
+    SELECT ws.worker_id,
+           ws.template_id,
+           (ws.start_date AT TIME ZONE 'UTC')::date - :first_day AS day,
+           ws.start_date,
+           ws.id
+    FROM worker_shifts AS ws
+    WHERE ws.company_id = :company_id
+      AND ws.start_date >= :range_start
+      AND ws.start_date <= :range_end
+      AND ws.end_date <= :range_end
+"""
+
+OPEN_SLOTS_QUERY = (
+    text(
+        f"""
+        WITH days AS (
+            SELECT day, (:first_isodow - 1 + day) % 7 + 1 AS isodow
+            FROM generate_series(0, :day_count - 1) AS day
+        ),
+        range_shifts AS ({RANGE_SHIFTS})
+        SELECT days.day,
+               t.id AS template_id,
+               split_part(t."startTime", ':', 1)::int * 60
+                   + split_part(t."startTime", ':', 2)::int AS start_minute,
+               split_part(t."endTime", ':', 1)::int * 60
+                   + split_part(t."endTime", ':', 2)::int AS end_minute,
+               covered.worker_id AS covered_by
+        FROM days
+        JOIN shift_templates AS t
+          ON t.company_id = :company_id
+         AND days.isodow = ANY(t.days)
+         AND (t."startDate" IS NULL OR t."startDate" <= :first_day + days.day)
+         AND (t."endDate" IS NULL OR t."endDate" >= :first_day + days.day)
+         AND (days.day > 0 OR t."startTime" > :start_time)
+         AND (days.day <> :last_day OR t."startTime" <= :end_time)
+        LEFT JOIN LATERAL (
+            SELECT range_shifts.worker_id
+            FROM range_shifts
+            WHERE NOT :overwrite_shifts
+              AND range_shifts.template_id = t.id
+              AND range_shifts.day = days.day
+            ORDER BY range_shifts.start_date, range_shifts.id
+            LIMIT 1
+        ) AS covered ON true
+        ORDER BY days.day, t."startTime", t.id
+        """
+    )
+    .bindparams(
+        bindparam("company_id", type_=Uuid),
+        bindparam("range_start", type_=DateTime(timezone=True)),
+        bindparam("range_end", type_=DateTime(timezone=True)),
+        bindparam("first_day", type_=Date),
+    )
+    .columns(
+        day=Integer,
+        template_id=Uuid,
+        start_minute=Integer,
+        end_minute=Integer,
+        covered_by=Uuid,
+    )
+)
+
+BUSY_WORKERS_QUERY = (
+    text(f"SELECT DISTINCT day, worker_id FROM ({RANGE_SHIFTS}) AS range_shifts")
+    .bindparams(
+        bindparam("company_id", type_=Uuid),
+        bindparam("range_start", type_=DateTime(timezone=True)),
+        bindparam("range_end", type_=DateTime(timezone=True)),
+        bindparam("first_day", type_=Date),
+    )
+    .columns(day=Integer, worker_id=Uuid)
+)
+
+
+class OpenSlots(NamedTuple):
+    expanded: ExpandedSlots
+    # Indexed by `expanded.templates`
+    template_ids: list
+    # Day offset -> template index -> id of the worker already covering it
+    covered_by_day: dict[int, dict[int, UUID]]
+    # Day offset -> ids of workers with a shift starting that day
+    busy_by_day: dict[int, set]
+
+
+def load_open_slots(
+    company_id: UUID,
+    start_date: datetime,
+    end_date: datetime,
+    overwrite_shifts: bool,
+    session: Session,
+) -> OpenSlots:
+    first_day, day_count = range_days(start_date, end_date)
+    range_params = {
+        "company_id": company_id,
+        "range_start": start_date,
+        "range_end": end_date,
+        "first_day": first_day,
+    }
+    rows = []
+    if day_count:
+        rows = session.exec(
+            OPEN_SLOTS_QUERY,
+            params={
+                **range_params,
+                "first_isodow": start_date.isoweekday(),
+                "day_count": day_count,
+                "last_day": (end_date.date() - first_day).days,
+                "start_time": f"{start_date.hour:02d}:{start_date.minute:02d}",
+                "end_time": f"{end_date.hour:02d}:{end_date.minute:02d}",
+                "overwrite_shifts": overwrite_shifts,
+            },
+        ).all()
+
+    # Imported on first use like in `expand_template_slots`
+    import numpy as np
+
+    template_index: dict = {}
+    covered_by_day: dict[int, dict[int, UUID]] = {}
+    for row in rows:
+        template = template_index.setdefault(row.template_id, len(template_index))
+        if row.covered_by is not None:
+            covered_by_day.setdefault(row.day, {})[template] = row.covered_by
+    expanded = ExpandedSlots(
+        np.array([row.day for row in rows], dtype=np.int64),
+        np.array([template_index[row.template_id] for row in rows], dtype=np.int64),
+        np.array([row.start_minute for row in rows], dtype=np.int32),
+        np.array([row.end_minute for row in rows], dtype=np.int32),
+        day_count,
+    )
+
+    busy_by_day: dict[int, set] = {}
+    if day_count and not overwrite_shifts:
+        for row in session.exec(BUSY_WORKERS_QUERY, params=range_params):
+            busy_by_day.setdefault(row.day, set()).add(row.worker_id)
+
+    return OpenSlots(expanded, list(template_index), covered_by_day, busy_by_day)
+
+
+def assign_open_slots(
+    open_slots: OpenSlots,
+    start_date: datetime,
+    users: list[UserModel],
+    stats: Optional[AutoAssignStats] = None,
+) -> list[ShiftPlaceholder]:
+    """Placeholders for the slots, see `solve_auto_assign_slots`."""
+    if not users:
+        raise ValueError("Cannot auto-assign shifts: no users provided")
+
+    worker_ids = [user.id for user in users]
+    worker_index = {worker_id: i for i, worker_id in enumerate(worker_ids)}
+
+    def index_of(worker_id) -> int:
+        # Workers only known from existing shifts are never candidates
+        if worker_id not in worker_index:
+            worker_index[worker_id] = len(worker_ids)
+            worker_ids.append(worker_id)
+        return worker_index[worker_id]
+
+    covered_by_day = {
+        day: {template: index_of(worker_id) for template, worker_id in covered.items()}
+        for day, covered in open_slots.covered_by_day.items()
+    }
+    # Busy non-candidates can never be picked, only covering ones are indexed
+    busy_by_day = {
+        day: {worker_index[worker] for worker in workers if worker in worker_index}
+        for day, workers in open_slots.busy_by_day.items()
+    }
+    slots = assign_slot_workers(
+        open_slots.expanded,
+        worker_ids,
+        len(users),
+        covered_by_day,
+        busy_by_day,
+        stats,
+    )
+    return slots_to_placeholders(
+        slots, start_date, open_slots.template_ids, worker_ids
+    )
@@ -1,40 +1,45 @@
-from fastapi import APIRouter, Depends, HTTPException
-
-from api.users.user_service import (
-    find_workers_by_company_id,
-)
+from fastapi import APIRouter, Depends, HTTPException, Request
 
 from api.shift_template.shift_template_service import (
     find_shift_template_by_id,
+    find_shift_templates_by_ids,
 )
 from api.worker_shifts.schemas import (
+    ASSIGNMENT_SUGGESTION_COLUMNS,
+    WORKER_SHIFT_COLUMNS,
     AddWorkerShiftPayloadSchema,
-    AssignmentSuggestionResponse,
     AutoAssignPayloadSchema,
     Range,
-    MyShiftsResponse,
 )
 from api.worker_shifts.worker_shift_service import (
     accept_assignment_suggestions,
     delete_all_company_suggestions,
     delete_worker_shifts_in_range,
-    get_assignment_suggestions_by_company,
-    prepare_auto_assign_shifts,
+    get_assignment_suggestion_rows_by_company,
     create_shift_template,
     get_user_shifts,
     get_worker_shifts_by_company_id,
     get_worker_shifts_in_time_range,
-    save_assignment_suggestions,
-)
-
-from api.shift_template.shift_template_service import (
-    find_shift_templates_by_company_id,
+    ASSIGNMENT_SUGGESTION_FIELDS,
+    WORKER_SHIFT_FIELDS,
 )
+from api.worker_shifts.auto_assign import run_auto_assign
+from api.worker_shifts.week_snapshots import get_week_snapshot, parse_iso_week
 
+from db.locks import LockTimeout
 from db.models import UserRole
-from db.session import get_session
-from api.dependencies import authenticate_user
-from api.common import authenticate_company_admin
+from db.session import get_read_session, get_session
+from jobs import enqueue_job
+from realtime import publish_company_event
+from api.dependencies import authenticate_reader, authenticate_user
+from api.common import (
+    VARY_ACCEPT,
+    FastJSONResponse,
+    as_dicts,
+    authenticate_company_admin,
+    columnar_response,
+    wants_columnar,
+)
 
 
 router = APIRouter(tags=["worker-shifts"])
@@ -53,7 +58,7 @@ def create_worker_shift(
     authenticate_company_admin(template.company_id, current_user)
 
     concurrent_shifts = get_worker_shifts_in_time_range(
-        data["start_date"], data["end_date"], session
+        template.company_id, data["start_date"], data["end_date"], session
     )
     if concurrent_shifts:
         raise HTTPException(
@@ -70,10 +75,11 @@ def create_worker_shift(
 
 @router.get("/company")
 def get_worker_shifts(
+    request: Request,
     range_start: str,
     range_end: str,
-    session=Depends(get_session),
-    current_user=Depends(authenticate_user),
+    session=Depends(get_read_session),
+    current_user=Depends(authenticate_reader),
 ):
     if current_user.role != UserRole.ADMIN:
         raise HTTPException(status_code=403, detail="User must be ADMIN.")
@@ -82,33 +88,65 @@ def get_worker_shifts(
     worker_shifts = get_worker_shifts_by_company_id(
         current_user.company_id, payload, session
     )
+    if wants_columnar(request):
+        return columnar_response(worker_shifts, WORKER_SHIFT_COLUMNS)
+
+    return FastJSONResponse(
+        {"items": as_dicts(worker_shifts, WORKER_SHIFT_FIELDS)}, headers=VARY_ACCEPT
+    )
+
 
-    return {"items": worker_shifts}
+@router.get("/week/{iso_week}")
+def get_week_grid(
+    iso_week: str,
+    session=Depends(get_session),
+    current_user=Depends(authenticate_user),
+):
+    """Company shifts of an ISO week (e.g. `2025-W02`) grouped by day and template.
+
+    Served from a materialized snapshot, built and stored on first read, so
+    it stays on the primary.
+    """
+    if current_user.role != UserRole.ADMIN:
+        raise HTTPException(status_code=403, detail="User must be ADMIN.")
+
+    try:
+        parse_iso_week(iso_week)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return get_week_snapshot(current_user.company_id, iso_week, session)
 
 
 @router.get("/my-shifts")
 def get_my_shifts(
+    request: Request,
     range_start: str,
     range_end: str,
-    session=Depends(get_session),
-    current_user=Depends(authenticate_user),
+    session=Depends(get_read_session),
+    current_user=Depends(authenticate_reader),
 ):
     payload = Range(range_start=range_start, range_end=range_end)
-    shifts = get_user_shifts(current_user.id, payload, session)
-
-    response_items = [
-        MyShiftsResponse(
-            id=str(shift.id),
-            worker_id=str(shift.worker_id),
-            company_id=str(shift.company_id),
-            start_date=shift.start_date,
-            end_date=shift.end_date,
-            template=shift.template,
+    shifts = get_user_shifts(
+        current_user.id, payload, session, company_id=current_user.company_id
+    )
+
+    # Each distinct template is sent once, shifts reference it by id
+    templates = {
+        str(template.id): template.model_dump()
+        for template in find_shift_templates_by_ids(
+            {shift.template_id for shift in shifts}, session
+        )
+    }
+    if wants_columnar(request):
+        return columnar_response(
+            shifts, WORKER_SHIFT_COLUMNS, templates=templates
         )
-        for shift in shifts
-    ]
 
-    return {"items": response_items}
+    return FastJSONResponse(
+        {"items": as_dicts(shifts, WORKER_SHIFT_FIELDS), "templates": templates},
+        headers=VARY_ACCEPT,
+    )
 
 
 @router.post("/auto-assign")
@@ -121,73 +159,56 @@ def auto_assign_controller(
         raise HTTPException(status_code=403, detail="User must be ADMIN.")
 
     data = payload.model_dump()
-
-    if data["overwrite_shifts"]:
-        worker_shifts = []
-    else:
-        worker_shifts = get_worker_shifts_in_time_range(
-            data["range_start"], data["range_end"], session
+    if data["background"]:
+        job = enqueue_job(
+            "auto_assign",
+            {
+                "company_id": str(current_user.company_id),
+                "range_start": data["range_start"],
+                "range_end": data["range_end"],
+                "overwrite_shifts": data["overwrite_shifts"],
+            },
+            session,
+            company_id=current_user.company_id,
+            created_by=current_user.id,
+        )
+        return FastJSONResponse(
+            {"job_id": job.id, "status": job.status}, status_code=202
         )
 
-    shift_templates = find_shift_templates_by_company_id(
-        current_user.company_id, session
-    )
-
-    range = Range(range_start=data["range_start"], range_end=data["range_end"])
-
-    users = find_workers_by_company_id(current_user.company_id, session)
-
-    shift_placeholders = prepare_auto_assign_shifts(
-        range, worker_shifts, shift_templates, users
-    )
-
-    delete_all_company_suggestions(current_user.company_id, session)
-    suggestions = save_assignment_suggestions(
-        shift_placeholders, current_user.company_id, session
-    )
-
-    response_items = [
-        AssignmentSuggestionResponse(
-            id=str(s.id),
-            worker_id=str(s.worker_id),
-            company_id=str(s.company_id),
-            template_id=str(s.template_id),
-            start_date=s.start_date,
-            end_date=s.end_date,
-            created_at=s.created_at,
+    try:
+        result = run_auto_assign(current_user.company_id, data, session)
+    except LockTimeout:
+        raise HTTPException(
+            status_code=409,
+            detail="Auto-assign is already running for this company, retry later",
         )
-        for s in suggestions
-    ]
 
-    return {"items": response_items}
+    if not data["debug_timings"]:
+        return FastJSONResponse({"items": result["items"]})
+
+    return FastJSONResponse(result)
 
 
 @router.get("/suggestions")
 def get_suggestions(
-    session=Depends(get_session),
-    current_user=Depends(authenticate_user),
+    request: Request,
+    session=Depends(get_read_session),
+    current_user=Depends(authenticate_reader),
 ):
     if current_user.role != UserRole.ADMIN:
         raise HTTPException(status_code=403, detail="User must be ADMIN.")
 
-    suggestions = get_assignment_suggestions_by_company(
+    suggestions = get_assignment_suggestion_rows_by_company(
         current_user.company_id, session
     )
+    if wants_columnar(request):
+        return columnar_response(suggestions, ASSIGNMENT_SUGGESTION_COLUMNS)
 
-    response_items = [
-        AssignmentSuggestionResponse(
-            id=str(s.id),
-            worker_id=str(s.worker_id),
-            company_id=str(s.company_id),
-            template_id=str(s.template_id),
-            start_date=s.start_date,
-            end_date=s.end_date,
-            created_at=s.created_at,
-        )
-        for s in suggestions
-    ]
-
-    return {"items": response_items}
+    return FastJSONResponse(
+        {"items": as_dicts(suggestions, ASSIGNMENT_SUGGESTION_FIELDS)},
+        headers=VARY_ACCEPT,
+    )
 
 
 @router.post("/suggestions/accept")
@@ -212,6 +233,8 @@ def decline_suggestions(
         raise HTTPException(status_code=403, detail="User must be ADMIN.")
 
     count = delete_all_company_suggestions(current_user.company_id, session)
+    if count:
+        publish_company_event(current_user.company_id, "suggestions.deleted", count=count)
 
     return {"status": "success", "count": count}
 
@@ -1,10 +1,6 @@
-from datetime import datetime
-from typing import Optional
 from pydantic import BaseModel
-from sqlmodel import SQLModel
-
-from db.models import ShiftTemplateModel
 
+from api.common.columnar import ID, REF, TIMESTAMP
 
 class AddWorkerShiftPayloadSchema(BaseModel):
     template_id: str
@@ -13,15 +9,6 @@ class AddWorkerShiftPayloadSchema(BaseModel):
     end_date: str
 
 
-class MyShiftsResponse(SQLModel):
-    id: str
-    worker_id: str
-    company_id: str
-    start_date: datetime
-    end_date: datetime
-    template: Optional[ShiftTemplateModel] = None
-
-
 class Range(BaseModel):
     range_start: str
     range_end: str
@@ -31,13 +18,18 @@ class AutoAssignPayloadSchema(BaseModel):
     range_start: str
     range_end: str
     overwrite_shifts: bool
-
-
-class AssignmentSuggestionResponse(SQLModel):
-    id: str
-    worker_id: str
-    company_id: str
-    template_id: str
-    start_date: datetime
-    end_date: datetime
-    created_at: datetime
+    debug_timings: bool = False
+    # Queue an `auto_assign` job and answer 202 with its id instead of waiting
+    background: bool = False
+
+
+# Columnar layouts (see api.common.columnar)
+WORKER_SHIFT_COLUMNS = {
+    "id": ID,
+    "worker_id": REF,
+    "company_id": REF,
+    "template_id": REF,
+    "start_date": TIMESTAMP,
+    "end_date": TIMESTAMP,
+}
+ASSIGNMENT_SUGGESTION_COLUMNS = {**WORKER_SHIFT_COLUMNS, "created_at": TIMESTAMP}
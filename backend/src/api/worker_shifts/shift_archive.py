@@ -0,0 +1,354 @@
+"""Cold storage for old worker shifts and assignment suggestions.
+
+Rows whose month is older than SHIFT_ARCHIVE_RETENTION_MONTHS are moved out
+of the live tables into one zstd-compressed Parquet file per company and
+month, either on local disk (`file:///path`) or S3 (`s3://bucket/prefix`):
+
+    worker_shifts/company_id=<uuid>/month=2024-03.parquet
+
+Run the job from cron:
+
+    python -m api.worker_shifts.shift_archive
+
+Reads of historical ranges transparently merge the archived months back in
+(see `read_archived_worker_shifts`). Archiving is disabled when
+SHIFT_ARCHIVE_URL is not set.
+"""
+
+import io
+import os
+from datetime import date, datetime, timezone
+from functools import lru_cache
+from typing import Optional
+from uuid import UUID
+
+from decouple import config
+from sqlalchemy import delete, func, text
+from sqlmodel import Session, select
+
+from db.models import AssignmentSuggestionModel, WorkerShiftModel
+from db.partitions import add_months, month_start, partition_name
+
+SHIFT_ARCHIVE_URL = config("SHIFT_ARCHIVE_URL", default="")
+SHIFT_ARCHIVE_RETENTION_MONTHS = config(
+    "SHIFT_ARCHIVE_RETENTION_MONTHS", default=12, cast=int
+)
+
+# dataset name -> (model, timestamp columns)
+DATASETS = {
+    "worker_shifts": (WorkerShiftModel, ["start_date", "end_date"]),
+    "assignment_suggestions": (
+        AssignmentSuggestionModel,
+        ["start_date", "end_date", "created_at"],
+    ),
+}
+DELETE_BATCH_SIZE = 1000
+
+
+class LocalArchiveStore:
+    def __init__(self, root: str):
+        self.root = root
+
+    def read(self, key: str) -> Optional[bytes]:
+        path = os.path.join(self.root, key)
+        if not os.path.exists(path):
+            return None
+        with open(path, "rb") as f:
+            return f.read()
+
+    def write(self, key: str, data: bytes):
+        path = os.path.join(self.root, key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write then rename so readers never see a half-written file
+        with open(path + ".tmp", "wb") as f:
+            f.write(data)
+        os.replace(path + ".tmp", path)
+
+
+class S3ArchiveStore:
+    def __init__(self, bucket: str, prefix: str):
+        from api.common.boto3_factory import get_boto3_client
+
+        self.bucket = bucket
+        self.prefix = prefix.strip("/")
+        self.client = get_boto3_client("s3")
+
+    def _key(self, key: str) -> str:
+        return f"{self.prefix}/{key}" if self.prefix else key
+
+    def read(self, key: str) -> Optional[bytes]:
+        try:
+            response = self.client.get_object(Bucket=self.bucket, Key=self._key(key))
+        except self.client.exceptions.NoSuchKey:
+            return None
+        return response["Body"].read()
+
+    def write(self, key: str, data: bytes):
+        self.client.put_object(Bucket=self.bucket, Key=self._key(key), Body=data)
+
+
+def create_archive_store(url: str):
+    if url.startswith("s3://"):
+        bucket, _, prefix = url[len("s3://") :].partition("/")
+        return S3ArchiveStore(bucket, prefix)
+    if url.startswith("file://"):
+        return LocalArchiveStore(url[len("file://") :])
+    raise ValueError(f"Unsupported SHIFT_ARCHIVE_URL: {url}")
+
+
+@lru_cache(maxsize=1)
+def get_archive_store():
+    if not SHIFT_ARCHIVE_URL:
+        return None
+    return create_archive_store(SHIFT_ARCHIVE_URL)
+
+
+def archive_cutoff(today: Optional[date] = None) -> date:
+    """First day of the oldest month still kept in the live tables."""
+    today = today or datetime.now(timezone.utc).date()
+    return add_months(month_start(today), -SHIFT_ARCHIVE_RETENTION_MONTHS)
+
+
+def archive_key(dataset: str, company_id, month: date) -> str:
+    return f"{dataset}/company_id={company_id}/month={month.strftime('%Y-%m')}.parquet"
+
+
+def month_bounds(month: date) -> tuple[datetime, datetime]:
+    next_month = add_months(month, 1)
+    return (
+        datetime(month.year, month.month, 1, tzinfo=timezone.utc),
+        datetime(next_month.year, next_month.month, 1, tzinfo=timezone.utc),
+    )
+
+
+def _as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    # SQLite hands back naive datetimes, everything is stored as UTC
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def _to_table(rows: list, model, timestamp_columns: list[str]):
+    import pyarrow as pa
+
+    columns = {}
+    for name in model.model_fields:
+        if name not in model.__table__.columns:
+            continue
+        values = [getattr(row, name) for row in rows]
+        if name in timestamp_columns:
+            columns[name] = pa.array(
+                [_as_utc(v) for v in values], type=pa.timestamp("us", tz="UTC")
+            )
+        else:
+            columns[name] = pa.array(
+                [str(v) if v is not None else None for v in values], type=pa.string()
+            )
+    return pa.table(columns)
+
+
+def _read_table(store, key: str):
+    import pyarrow.parquet as pq
+
+    data = store.read(key)
+    if data is None:
+        return None
+    return pq.read_table(io.BytesIO(data))
+
+
+def _write_table(store, key: str, table):
+    import pyarrow.parquet as pq
+
+    buffer = io.BytesIO()
+    pq.write_table(table, buffer, compression="zstd")
+    store.write(key, buffer.getvalue())
+
+
+def _merge_tables(existing, new):
+    """Union by id so re-running after a partial failure never duplicates."""
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    if existing is None:
+        return new
+    new_ids = pc.is_in(existing["id"], value_set=new["id"])
+    kept = existing.filter(pc.invert(new_ids))
+    return pa.concat_tables([kept, new.select(kept.column_names)])
+
+
+def _drop_empty_partition(session: Session, month: date):
+    if session.get_bind().dialect.name != "postgresql":
+        return
+    name = partition_name(month)
+    exists = session.exec(
+        text("SELECT to_regclass(:name) IS NOT NULL").bindparams(name=name)
+    ).scalar()
+    if not exists:
+        return
+    is_empty = not session.exec(text(f"SELECT EXISTS (SELECT 1 FROM {name})")).scalar()
+    if is_empty:
+        session.exec(text(f"DROP TABLE {name}"))
+        session.commit()
+
+
+def archive_dataset(
+    dataset: str, session: Session, store, before: date
+) -> dict[str, int]:
+    """Move rows of `dataset` with start_date before `before` to the store.
+
+    Files are written before rows are deleted, so a crash in between only
+    leaves rows that are archived again (idempotently) on the next run.
+    """
+    model, timestamp_columns = DATASETS[dataset]
+    oldest = session.exec(select(func.min(model.start_date))).one()
+    if oldest is None:
+        return {}
+
+    archived = {}
+    month = month_start(_as_utc(oldest).date())
+    while month < before:
+        lower, upper = month_bounds(month)
+        in_month = (model.start_date >= lower, model.start_date < upper)
+        company_ids = session.exec(
+            select(model.company_id).where(*in_month).distinct()
+        ).all()
+
+        for company_id in company_ids:
+            rows = session.exec(
+                select(model)
+                .where(model.company_id == company_id, *in_month)
+                .order_by(model.start_date)
+            ).all()
+            key = archive_key(dataset, company_id, month)
+            table = _to_table(rows, model, timestamp_columns)
+            _write_table(store, key, _merge_tables(_read_table(store, key), table))
+
+            ids = [row.id for row in rows]
+            for i in range(0, len(ids), DELETE_BATCH_SIZE):
+                session.exec(
+                    delete(model)
+                    .where(model.id.in_(ids[i : i + DELETE_BATCH_SIZE]), *in_month)
+                    .execution_options(synchronize_session=False)
+                )
+            for row in rows:
+                session.expunge(row)
+            session.commit()
+            archived[month.strftime("%Y-%m")] = archived.get(
+                month.strftime("%Y-%m"), 0
+            ) + len(rows)
+
+        if model is WorkerShiftModel:
+            _drop_empty_partition(session, month)
+        month = add_months(month, 1)
+
+    return archived
+
+
+def archive_old_rows(session: Session, store=None, before: Optional[date] = None):
+    store = store or get_archive_store()
+    if store is None:
+        raise ValueError("SHIFT_ARCHIVE_URL is not set")
+    before = before or archive_cutoff()
+    return {
+        dataset: archive_dataset(dataset, session, store, before)
+        for dataset in DATASETS
+    }
+
+
+def read_archived_worker_shifts(
+    company_id: UUID,
+    range_start: datetime,
+    range_end: datetime,
+    worker_id: Optional[UUID] = None,
+    store=None,
+) -> list[WorkerShiftModel]:
+    """Archived shifts fully inside the range, as detached model instances."""
+    store = store or get_archive_store()
+    if store is None:
+        return []
+
+    shifts = []
+    for _, table in _archived_months(store, company_id, range_start, range_end):
+        for row in table.to_pylist():
+            if worker_id is not None and row["worker_id"] != str(worker_id):
+                continue
+            if _within(row, range_start, range_end):
+                shifts.append(_to_shift(row))
+    return shifts
+
+
+def delete_archived_worker_shifts(
+    company_id: UUID,
+    range_start: datetime,
+    range_end: datetime,
+    store=None,
+) -> list[WorkerShiftModel]:
+    """Removes archived shifts fully inside the range, returns the removed ones.
+
+    The matching month files are rewritten without them, the same filter as
+    `read_archived_worker_shifts` so cleared ranges read back empty.
+    """
+    import pyarrow as pa
+
+    store = store or get_archive_store()
+    if store is None:
+        return []
+
+    removed = []
+    for key, table in _archived_months(store, company_id, range_start, range_end):
+        rows = table.to_pylist()
+        kept = [row for row in rows if not _within(row, range_start, range_end)]
+        if len(kept) == len(rows):
+            continue
+        removed.extend(
+            _to_shift(row) for row in rows if _within(row, range_start, range_end)
+        )
+        _write_table(store, key, pa.Table.from_pylist(kept, schema=table.schema))
+    return removed
+
+
+def _archived_months(store, company_id: UUID, range_start: datetime, range_end: datetime):
+    """(key, table) of the company's archived months overlapping the range.
+
+    Only months before the retention cutoff are looked up, so recent ranges
+    never touch the store.
+    """
+    range_start, range_end = _as_utc(range_start), _as_utc(range_end)
+    last_month = min(month_start(range_end.date()), add_months(archive_cutoff(), -1))
+    month = month_start(range_start.date())
+    while month <= last_month:
+        key = archive_key("worker_shifts", company_id, month)
+        table = _read_table(store, key)
+        month = add_months(month, 1)
+        if table is not None:
+            yield key, table
+
+
+def _within(row: dict, range_start: datetime, range_end: datetime) -> bool:
+    range_start, range_end = _as_utc(range_start), _as_utc(range_end)
+    return (
+        row["start_date"] >= range_start
+        and row["start_date"] <= range_end
+        and row["end_date"] <= range_end
+    )
+
+
+def _to_shift(row: dict) -> WorkerShiftModel:
+    return WorkerShiftModel(
+        id=UUID(row["id"]),
+        worker_id=UUID(row["worker_id"]),
+        company_id=UUID(row["company_id"]),
+        template_id=UUID(row["template_id"]) if row["template_id"] else None,
+        start_date=row["start_date"],
+        end_date=row["end_date"],
+    )
+
+
+if __name__ == "__main__":
+    from db.session import engine
+
+    with Session(engine) as session:
+        result = archive_old_rows(session)
+    for dataset, months in result.items():
+        for month, count in months.items():
+            print(f"{dataset} {month}: archived {count} rows")
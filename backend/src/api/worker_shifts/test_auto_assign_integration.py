@@ -1,14 +1,18 @@
 import pytest
-from datetime import datetime, timezone
+from datetime import date, datetime, timezone
 from uuid import uuid4
 from fastapi.testclient import TestClient
 from sqlmodel import Session, select
 
+from api.shift_template.shift_template_service import find_active_shift_templates
+from api.worker_shifts.worker_shift_service import active_template_filters
+from cache import cache
 from db.models import (
     AssignmentSuggestionModel,
     CompanyModel,
     ShiftTemplateModel,
     UserModel,
+    UserRole,
     WorkerShiftModel,
 )
 
@@ -200,6 +204,277 @@ class TestAutoAssignEndpoint:
         final_suggestions = session.exec(select(AssignmentSuggestionModel)).all()
         assert len(final_suggestions) == 1  # Only the new one
 
+    def test_auto_assign_debug_timings(
+        self,
+        client: TestClient,
+        admin_token: str,
+        shift_template: ShiftTemplateModel,
+        worker_users: list[UserModel],
+    ):
+        """Test that debug_timings adds phase durations and solver counters."""
+        payload = {
+            "range_start": "2025-01-06T00:00:00Z",
+            "range_end": "2025-01-10T23:59:59Z",
+            "overwrite_shifts": False,
+            "debug_timings": True,
+        }
+
+        response = client.post(
+            "/worker-shifts/auto-assign",
+            json=payload,
+            cookies={"access_token": admin_token},
+        )
+
+        assert response.status_code == 200
+        debug = response.json()["debug"]
+        assert set(debug["timings_ms"]) == {
+            "load_shifts",
+            "load_templates",
+            "load_workers",
+            "fingerprint",
+            "prepare_auto_assign_shifts",
+            "delete_old_suggestions",
+            "save_suggestions",
+        }
+        assert debug["solver"]["days_processed"] == 5
+        assert debug["solver"]["slots_filled"] == 5
+        assert debug["solver"]["candidates_examined"] >= 5
+        assert debug["memoized"] is False
+
+    def test_auto_assign_rerun_reuses_stored_suggestions(
+        self,
+        client: TestClient,
+        admin_token: str,
+        shift_template: ShiftTemplateModel,
+        worker_users: list[UserModel],
+    ):
+        """Unchanged inputs skip the solver and leave the suggestions in place."""
+        payload = {
+            "range_start": "2025-01-06T00:00:00Z",
+            "range_end": "2025-01-10T23:59:59Z",
+            "overwrite_shifts": False,
+            "debug_timings": True,
+        }
+
+        first = client.post(
+            "/worker-shifts/auto-assign",
+            json=payload,
+            cookies={"access_token": admin_token},
+        ).json()
+        second = client.post(
+            "/worker-shifts/auto-assign",
+            json=payload,
+            cookies={"access_token": admin_token},
+        ).json()
+
+        assert second["debug"]["fingerprint"] == first["debug"]["fingerprint"]
+        assert second["debug"]["memoized"] is True
+        assert second["debug"]["suggestions_reused"] is True
+        assert "prepare_auto_assign_shifts" not in second["debug"]["timings_ms"]
+        assert "save_suggestions" not in second["debug"]["timings_ms"]
+        assert {item["id"] for item in second["items"]} == {
+            item["id"] for item in first["items"]
+        }
+
+    def test_auto_assign_memo_resaves_declined_suggestions(
+        self,
+        client: TestClient,
+        session: Session,
+        admin_token: str,
+        shift_template: ShiftTemplateModel,
+        worker_users: list[UserModel],
+    ):
+        payload = {
+            "range_start": "2025-01-06T00:00:00Z",
+            "range_end": "2025-01-10T23:59:59Z",
+            "overwrite_shifts": False,
+            "debug_timings": True,
+        }
+        client.post(
+            "/worker-shifts/auto-assign",
+            json=payload,
+            cookies={"access_token": admin_token},
+        )
+        client.delete(
+            "/worker-shifts/suggestions", cookies={"access_token": admin_token}
+        )
+
+        response = client.post(
+            "/worker-shifts/auto-assign",
+            json=payload,
+            cookies={"access_token": admin_token},
+        ).json()
+
+        assert response["debug"]["memoized"] is True
+        assert response["debug"]["suggestions_reused"] is False
+        assert len(session.exec(select(AssignmentSuggestionModel)).all()) == 5
+
+    def test_auto_assign_template_change_misses_memo(
+        self,
+        client: TestClient,
+        session: Session,
+        admin_token: str,
+        shift_template: ShiftTemplateModel,
+        worker_users: list[UserModel],
+    ):
+        payload = {
+            "range_start": "2025-01-06T00:00:00Z",
+            "range_end": "2025-01-10T23:59:59Z",
+            "overwrite_shifts": False,
+            "debug_timings": True,
+        }
+        client.post(
+            "/worker-shifts/auto-assign",
+            json=payload,
+            cookies={"access_token": admin_token},
+        )
+        shift_template.days = [1, 2, 3]
+        session.add(shift_template)
+        session.commit()
+        cache.clear()
+
+        response = client.post(
+            "/worker-shifts/auto-assign",
+            json=payload,
+            cookies={"access_token": admin_token},
+        ).json()
+
+        assert response["debug"]["memoized"] is False
+        assert len(response["items"]) == 3
+
+    def test_auto_assign_memo_ignores_other_companies(
+        self,
+        client: TestClient,
+        session: Session,
+        admin_token: str,
+        shift_template: ShiftTemplateModel,
+        worker_users: list[UserModel],
+    ):
+        """Another tenant's shift writes leave this company's fingerprint alone."""
+        payload = {
+            "range_start": "2025-01-06T00:00:00Z",
+            "range_end": "2025-01-10T23:59:59Z",
+            "overwrite_shifts": False,
+            "debug_timings": True,
+        }
+        first = client.post(
+            "/worker-shifts/auto-assign",
+            json=payload,
+            cookies={"access_token": admin_token},
+        ).json()
+        other_company = CompanyModel(id=uuid4(), name="Other Company")
+        other_worker = UserModel(
+            id=uuid4(),
+            email="other@test.com",
+            first_name="Other",
+            last_name="Worker",
+            role=UserRole.WORKER,
+            company_id=other_company.id,
+        )
+        session.add(other_company)
+        session.add(other_worker)
+        session.commit()
+        session.add(
+            WorkerShiftModel(
+                worker_id=other_worker.id,
+                company_id=other_company.id,
+                start_date=datetime(2025, 1, 7, 9, tzinfo=timezone.utc),
+                end_date=datetime(2025, 1, 7, 17, tzinfo=timezone.utc),
+            )
+        )
+        session.commit()
+
+        second = client.post(
+            "/worker-shifts/auto-assign",
+            json=payload,
+            cookies={"access_token": admin_token},
+        ).json()
+
+        assert second["debug"]["fingerprint"] == first["debug"]["fingerprint"]
+        assert second["debug"]["memoized"] is True
+
+    def test_auto_assign_omits_debug_by_default(
+        self,
+        client: TestClient,
+        admin_token: str,
+        shift_template: ShiftTemplateModel,
+        worker_users: list[UserModel],
+    ):
+        """Test that the response has no debug section unless requested."""
+        payload = {
+            "range_start": "2025-01-06T00:00:00Z",
+            "range_end": "2025-01-06T23:59:59Z",
+            "overwrite_shifts": False,
+        }
+
+        response = client.post(
+            "/worker-shifts/auto-assign",
+            json=payload,
+            cookies={"access_token": admin_token},
+        )
+
+        assert response.status_code == 200
+        assert "debug" not in response.json()
+
+
+    def test_auto_assign_skips_templates_outside_validity_window(
+        self,
+        client: TestClient,
+        session: Session,
+        admin_token: str,
+        company: CompanyModel,
+        shift_template: ShiftTemplateModel,
+        worker_users: list[UserModel],
+    ):
+        """Expired templates are filtered out in SQL, windows clip the rest."""
+        expired = ShiftTemplateModel(
+            id=uuid4(),
+            company_id=company.id,
+            name="Last Season",
+            position="Cashier",
+            startTime="09:00",
+            endTime="17:00",
+            days=[1, 2, 3, 4, 5],
+            endDate=date(2024, 12, 31),
+        )
+        shift_template.startDate = date(2025, 1, 8)
+        session.add_all([expired, shift_template])
+        session.commit()
+
+        response = client.post(
+            "/worker-shifts/auto-assign",
+            json={
+                "range_start": "2025-01-06T00:00:00Z",
+                "range_end": "2025-01-10T23:59:59Z",
+                "overwrite_shifts": False,
+            },
+            cookies={"access_token": admin_token},
+        )
+
+        assert response.status_code == 200
+        items = response.json()["items"]
+        assert {item["template_id"] for item in items} == {str(shift_template.id)}
+        assert len(items) == 3  # Wednesday to Friday
+
+
+    def test_single_day_range_loads_only_fitting_templates(
+        self,
+        session: Session,
+        shift_templates: list[ShiftTemplateModel],
+    ):
+        """Morning (09:00) fits an 08:00-12:00 range, afternoon (13:00) does not."""
+        filters = active_template_filters(
+            datetime(2025, 1, 6, 8, 0, tzinfo=timezone.utc),
+            datetime(2025, 1, 6, 12, 0, tzinfo=timezone.utc),
+        )
+
+        templates = find_active_shift_templates(
+            shift_templates[0].company_id, session=session, **filters
+        )
+
+        assert filters["weekdays"] == {1}
+        assert [template.name for template in templates] == ["Morning Shift"]
+
 
 class TestGetSuggestionsEndpoint:
     """Integration tests for GET /worker-shifts/suggestions endpoint."""
@@ -0,0 +1,48 @@
+from datetime import datetime, timezone
+from uuid import uuid4
+
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from db.models import ShiftTemplateModel, UserModel, WorkerShiftModel
+
+
+def test_my_shifts_reference_templates_by_id(
+    client: TestClient,
+    session: Session,
+    worker_token: str,
+    worker_user: UserModel,
+    shift_template: ShiftTemplateModel,
+):
+    """A month of shifts sharing one template carries that template once."""
+    session.add_all(
+        WorkerShiftModel(
+            id=uuid4(),
+            worker_id=worker_user.id,
+            company_id=worker_user.company_id,
+            template_id=shift_template.id,
+            start_date=datetime(2025, 1, day, 9, tzinfo=timezone.utc),
+            end_date=datetime(2025, 1, day, 17, tzinfo=timezone.utc),
+        )
+        for day in range(6, 11)
+    )
+    session.commit()
+
+    response = client.get(
+        "/worker-shifts/my-shifts",
+        params={
+            "range_start": "2025-01-01T00:00:00Z",
+            "range_end": "2025-01-31T23:59:59Z",
+        },
+        cookies={"access_token": worker_token},
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    template_id = str(shift_template.id)
+    assert len(body["items"]) == 5
+    assert {item["template_id"] for item in body["items"]} == {template_id}
+    assert "template" not in body["items"][0]
+    assert list(body["templates"]) == [template_id]
+    assert body["templates"][template_id]["name"] == shift_template.name
+    assert body["templates"][template_id]["days"] == shift_template.days
@@ -0,0 +1,151 @@
+from datetime import datetime, timezone
+from typing import Optional
+from types import SimpleNamespace
+from uuid import uuid4
+
+import numpy as np
+import pytest
+from sqlmodel import Session
+
+from api.shift_template.shift_template_service import find_active_shift_templates
+from api.worker_shifts.open_slots import OpenSlots, assign_open_slots, load_open_slots
+from api.worker_shifts.schemas import Range
+from api.worker_shifts.worker_shift_service import (
+    AutoAssignStats,
+    ExpandedSlots,
+    active_template_filters,
+    get_worker_shifts_in_time_range,
+    prepare_auto_assign_shifts,
+)
+from db.models import CompanyModel, ShiftTemplateModel, UserModel, WorkerShiftModel
+
+MONDAY = datetime(2025, 1, 6, tzinfo=timezone.utc)
+FRIDAY_END = datetime(2025, 1, 10, 23, 59, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def postgres_session(session: Session) -> Session:
+    if session.get_bind().dialect.name != "postgresql":
+        pytest.skip("generate_series candidates are Postgres only")
+    return session
+
+
+def shift(worker: UserModel, template: Optional[ShiftTemplateModel], start, end):
+    return WorkerShiftModel(
+        worker_id=worker.id,
+        company_id=worker.company_id,
+        template_id=template.id if template else None,
+        start_date=start,
+        end_date=end,
+    )
+
+
+def test_assign_open_slots_keeps_covering_workers():
+    """Covered slots keep their worker and count towards the balance."""
+    users = [SimpleNamespace(id=name) for name in ("ann", "bob", "cid")]
+    morning, afternoon = uuid4(), uuid4()
+    open_slots = OpenSlots(
+        expanded=ExpandedSlots(
+            days=np.array([0, 0, 1, 1]),
+            templates=np.array([0, 1, 0, 1]),
+            start_minutes=np.array([9 * 60, 13 * 60, 9 * 60, 13 * 60]),
+            end_minutes=np.array([13 * 60, 17 * 60, 13 * 60, 17 * 60]),
+            day_count=2,
+        ),
+        template_ids=[morning, afternoon],
+        covered_by_day={0: {0: "former"}, 1: {1: "bob"}},
+        busy_by_day={0: {"ann", "former"}, 1: {"bob"}},
+    )
+    stats = AutoAssignStats()
+
+    placeholders = assign_open_slots(open_slots, MONDAY, users, stats=stats)
+
+    assert [p["worker_id"] for p in placeholders] == ["former", "bob", "ann", "bob"]
+    assert [p["template_id"] for p in placeholders] == [morning, afternoon] * 2
+    assert placeholders[2]["start_date"] == datetime(2025, 1, 7, 9, tzinfo=timezone.utc)
+    assert stats.days_processed == 2
+    assert stats.slots_filled == 4
+
+
+def test_database_candidates_resolve_covered_slots(
+    postgres_session: Session,
+    company: CompanyModel,
+    shift_template: ShiftTemplateModel,
+    worker_user: UserModel,
+    existing_worker_shift: WorkerShiftModel,
+):
+    open_slots = load_open_slots(company.id, MONDAY, FRIDAY_END, False, postgres_session)
+
+    assert open_slots.expanded.days.tolist() == [0, 1, 2, 3, 4]
+    assert open_slots.template_ids == [shift_template.id]
+    assert open_slots.covered_by_day == {0: {0: worker_user.id}}
+    assert open_slots.busy_by_day == {0: {worker_user.id}}
+
+    overwriting = load_open_slots(company.id, MONDAY, FRIDAY_END, True, postgres_session)
+    assert overwriting.expanded.days.tolist() == [0, 1, 2, 3, 4]
+    assert overwriting.covered_by_day == {}
+    assert overwriting.busy_by_day == {}
+
+
+@pytest.mark.parametrize(
+    "range_start, range_end, overwrite_shifts",
+    [
+        (MONDAY, FRIDAY_END, False),
+        (MONDAY, FRIDAY_END, True),
+        # Skips Monday morning and Thursday afternoon
+        (MONDAY.replace(hour=10), datetime(2025, 1, 9, 12, tzinfo=timezone.utc), False),
+    ],
+)
+def test_database_candidates_match_python_engine(
+    postgres_session: Session,
+    company: CompanyModel,
+    shift_templates: list[ShiftTemplateModel],
+    worker_users: list[UserModel],
+    admin_user: UserModel,
+    range_start: datetime,
+    range_end: datetime,
+    overwrite_shifts: bool,
+):
+    morning, afternoon = shift_templates
+    first, second, third = worker_users
+    postgres_session.add_all(
+        [
+            # Monday morning covered twice, the earliest shift wins
+            shift(second, morning, MONDAY.replace(hour=9), MONDAY.replace(hour=13)),
+            shift(first, morning, MONDAY.replace(hour=8), MONDAY.replace(hour=13)),
+            # Tuesday afternoon covered, Wednesday busy without a template
+            shift(third, afternoon, datetime(2025, 1, 7, 13, tzinfo=timezone.utc),
+                  datetime(2025, 1, 7, 17, tzinfo=timezone.utc)),
+            shift(first, None, datetime(2025, 1, 8, 6, tzinfo=timezone.utc),
+                  datetime(2025, 1, 8, 8, tzinfo=timezone.utc)),
+            # Thursday morning covered by a worker who is not a candidate
+            shift(admin_user, morning, datetime(2025, 1, 9, 9, tzinfo=timezone.utc),
+                  datetime(2025, 1, 9, 13, tzinfo=timezone.utc)),
+            # Ends after the range, ignored by both sources
+            shift(second, afternoon, datetime(2025, 1, 10, 13, tzinfo=timezone.utc),
+                  datetime(2025, 1, 11, 1, tzinfo=timezone.utc)),
+        ]
+    )
+    postgres_session.commit()
+    payload = Range(range_start=range_start.isoformat(), range_end=range_end.isoformat())
+
+    open_slots = load_open_slots(
+        company.id, range_start, range_end, overwrite_shifts, postgres_session
+    )
+    in_database = assign_open_slots(open_slots, range_start, worker_users)
+
+    worker_shifts = []
+    if not overwrite_shifts:
+        worker_shifts = get_worker_shifts_in_time_range(
+            company.id, payload.range_start, payload.range_end, postgres_session
+        )
+    templates = find_active_shift_templates(
+        company.id,
+        session=postgres_session,
+        cached=False,
+        **active_template_filters(range_start, range_end),
+    )
+    in_python = prepare_auto_assign_shifts(payload, worker_shifts, templates, worker_users)
+
+    assert in_database
+    assert in_database == in_python
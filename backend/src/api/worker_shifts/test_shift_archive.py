@@ -0,0 +1,215 @@
+from datetime import date, datetime, timezone
+from uuid import uuid4
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import Session, select
+
+from api.worker_shifts import shift_archive
+from api.worker_shifts.shift_archive import (
+    LocalArchiveStore,
+    archive_cutoff,
+    archive_key,
+    archive_old_rows,
+)
+from db.models import (
+    AssignmentSuggestionModel,
+    CompanyModel,
+    ShiftTemplateModel,
+    UserModel,
+    WorkerShiftModel,
+)
+from db.partitions import add_months
+
+pytest.importorskip("pyarrow")
+
+
+@pytest.fixture
+def archive_store(tmp_path, monkeypatch) -> LocalArchiveStore:
+    store = LocalArchiveStore(str(tmp_path))
+    monkeypatch.setattr(shift_archive, "get_archive_store", lambda: store)
+    return store
+
+
+@pytest.fixture
+def old_month() -> date:
+    return add_months(archive_cutoff(), -2)
+
+
+def shift_on(month: date, day: int, worker_user, template) -> WorkerShiftModel:
+    return WorkerShiftModel(
+        id=uuid4(),
+        worker_id=worker_user.id,
+        company_id=worker_user.company_id,
+        template_id=template.id,
+        start_date=datetime(month.year, month.month, day, 9, tzinfo=timezone.utc),
+        end_date=datetime(month.year, month.month, day, 17, tzinfo=timezone.utc),
+    )
+
+
+@pytest.fixture
+def old_and_recent_shifts(
+    session: Session,
+    worker_user: UserModel,
+    shift_template: ShiftTemplateModel,
+    old_month: date,
+) -> list:
+    """Ids of two shifts in an archivable month and one in the live window."""
+    recent_month = archive_cutoff()
+    shifts = [
+        shift_on(old_month, 3, worker_user, shift_template),
+        shift_on(old_month, 4, worker_user, shift_template),
+        shift_on(recent_month, 3, worker_user, shift_template),
+    ]
+    session.add_all(shifts)
+    session.add(
+        AssignmentSuggestionModel(
+            worker_id=worker_user.id,
+            company_id=worker_user.company_id,
+            template_id=shift_template.id,
+            start_date=shifts[0].start_date,
+            end_date=shifts[0].end_date,
+        )
+    )
+    session.commit()
+    return [shift.id for shift in shifts]
+
+
+def month_range(month: date) -> dict:
+    return {
+        "range_start": f"{month.isoformat()}T00:00:00Z",
+        "range_end": f"{month.isoformat()[:8]}28T23:59:59Z",
+    }
+
+
+def test_archive_moves_old_rows_to_parquet(
+    session: Session,
+    archive_store: LocalArchiveStore,
+    company: CompanyModel,
+    old_month: date,
+    old_and_recent_shifts: list,
+):
+    result = archive_old_rows(session, archive_store)
+
+    assert result["worker_shifts"] == {old_month.strftime("%Y-%m"): 2}
+    assert result["assignment_suggestions"] == {old_month.strftime("%Y-%m"): 1}
+    remaining = session.exec(select(WorkerShiftModel)).all()
+    assert [s.id for s in remaining] == [old_and_recent_shifts[2]]
+    assert session.exec(select(AssignmentSuggestionModel)).all() == []
+    assert archive_store.read(archive_key("worker_shifts", company.id, old_month))
+
+    # Re-running is a no-op and never duplicates archived rows
+    assert archive_old_rows(session, archive_store)["worker_shifts"] == {}
+
+
+def test_archive_merges_with_existing_file(
+    session: Session,
+    archive_store: LocalArchiveStore,
+    company: CompanyModel,
+    worker_user: UserModel,
+    shift_template: ShiftTemplateModel,
+    old_month: date,
+    old_and_recent_shifts: list,
+):
+    archive_old_rows(session, archive_store)
+    late_shift = shift_on(old_month, 10, worker_user, shift_template)
+    late_shift_id = late_shift.id
+    session.add(late_shift)
+    session.commit()
+
+    archive_old_rows(session, archive_store)
+
+    archived = shift_archive.read_archived_worker_shifts(
+        company.id,
+        datetime(old_month.year, old_month.month, 1, tzinfo=timezone.utc),
+        datetime(old_month.year, old_month.month, 28, tzinfo=timezone.utc),
+    )
+    assert sorted(s.id for s in archived) == sorted(
+        [old_and_recent_shifts[0], old_and_recent_shifts[1], late_shift_id]
+    )
+
+
+def test_company_shifts_include_archived_months(
+    client: TestClient,
+    session: Session,
+    archive_store: LocalArchiveStore,
+    admin_token: str,
+    old_month: date,
+    old_and_recent_shifts: list,
+):
+    archive_old_rows(session, archive_store)
+
+    response = client.get(
+        "/worker-shifts/company",
+        params=month_range(old_month),
+        cookies={"access_token": admin_token},
+    )
+
+    assert response.status_code == 200
+    ids = {item["id"] for item in response.json()["items"]}
+    assert ids == {str(old_and_recent_shifts[0]), str(old_and_recent_shifts[1])}
+
+
+def test_my_shifts_include_archived_months_with_template(
+    client: TestClient,
+    session: Session,
+    archive_store: LocalArchiveStore,
+    worker_token: str,
+    shift_template: ShiftTemplateModel,
+    old_month: date,
+    old_and_recent_shifts: list,
+):
+    archive_old_rows(session, archive_store)
+
+    response = client.get(
+        "/worker-shifts/my-shifts",
+        params=month_range(old_month),
+        cookies={"access_token": worker_token},
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert len(body["items"]) == 2
+    assert {item["template_id"] for item in body["items"]} == {str(shift_template.id)}
+    assert body["templates"][str(shift_template.id)]["name"] == shift_template.name
+    # Archived shifts are read-only copies, nothing leaks back into the table
+    session.commit()
+    assert len(session.exec(select(WorkerShiftModel)).all()) == 1
+
+
+def test_clear_removes_archived_shifts(
+    client: TestClient,
+    session: Session,
+    archive_store: LocalArchiveStore,
+    admin_token: str,
+    company: CompanyModel,
+    old_month: date,
+    old_and_recent_shifts: list,
+):
+    archive_old_rows(session, archive_store)
+    week = datetime(old_month.year, old_month.month, 3).isocalendar()
+    iso_week = f"{week[0]}-W{week[1]:02d}"
+    # Snapshot the archived week so the clear has to refresh it
+    client.get(f"/worker-shifts/week/{iso_week}", cookies={"access_token": admin_token})
+
+    response = client.delete(
+        "/worker-shifts/clear",
+        params=month_range(old_month),
+        cookies={"access_token": admin_token},
+    )
+
+    assert response.json()["count"] == 2
+    listing = client.get(
+        "/worker-shifts/company",
+        params=month_range(old_month),
+        cookies={"access_token": admin_token},
+    )
+    assert listing.json()["items"] == []
+    days = client.get(
+        f"/worker-shifts/week/{iso_week}", cookies={"access_token": admin_token}
+    ).json()["days"]
+    assert all(day["templates"] == [] for day in days)
+    # The live shift outside the range is left alone
+    assert [s.id for s in session.exec(select(WorkerShiftModel)).all()] == [
+        old_and_recent_shifts[2]
+    ]
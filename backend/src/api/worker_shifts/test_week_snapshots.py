@@ -0,0 +1,152 @@
+from fastapi.testclient import TestClient
+from sqlmodel import Session, select
+
+from api.shift_template.schemas import EditShiftTemplateSchema
+from api.shift_template.shift_template_service import edit_shift_template
+from api.worker_shifts.week_snapshots import (
+    build_week_snapshot,
+    current_snapshot_version,
+    refresh_week_snapshots,
+    upsert_week_snapshot,
+)
+from db.models import (
+    AssignmentSuggestionModel,
+    CompanyModel,
+    CompanyWeekSnapshotModel,
+    ShiftTemplateModel,
+    UserModel,
+    WorkerShiftModel,
+)
+
+WEEK = "2025-W02"  # Monday 2025-01-06
+
+
+def get_week(client: TestClient, token: str, iso_week: str = WEEK):
+    return client.get(
+        f"/worker-shifts/week/{iso_week}", cookies={"access_token": token}
+    )
+
+
+def test_week_grid_groups_shifts_by_day_and_template(
+    client: TestClient,
+    admin_token: str,
+    worker_user: UserModel,
+    shift_template: ShiftTemplateModel,
+    existing_worker_shift: WorkerShiftModel,
+):
+    response = get_week(client, admin_token)
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["week"] == WEEK
+    assert [day["date"] for day in body["days"]][0] == "2025-01-06"
+    assert len(body["days"]) == 7
+    [group] = body["days"][0]["templates"]
+    assert group["template_id"] == str(shift_template.id)
+    assert group["name"] == shift_template.name
+    [shift] = group["shifts"]
+    assert shift["id"] == str(existing_worker_shift.id)
+    assert shift["worker_name"] == f"{worker_user.first_name} {worker_user.last_name}"
+    assert all(day["templates"] == [] for day in body["days"][1:])
+
+
+def test_week_grid_is_refreshed_on_writes(
+    client: TestClient,
+    session: Session,
+    admin_token: str,
+    assignment_suggestions: list[AssignmentSuggestionModel],
+):
+    assert all(day["templates"] == [] for day in get_week(client, admin_token).json()["days"])
+
+    client.post(
+        "/worker-shifts/suggestions/accept", cookies={"access_token": admin_token}
+    )
+    days = get_week(client, admin_token).json()["days"]
+    assert [len(day["templates"]) for day in days[:3]] == [1, 1, 0]
+
+    client.delete(
+        "/worker-shifts/clear",
+        params={
+            "range_start": "2025-01-06T00:00:00Z",
+            "range_end": "2025-01-06T23:59:59Z",
+        },
+        cookies={"access_token": admin_token},
+    )
+    days = get_week(client, admin_token).json()["days"]
+    assert [len(day["templates"]) for day in days[:3]] == [0, 1, 0]
+
+
+def test_template_edit_drops_snapshots(
+    client: TestClient,
+    session: Session,
+    admin_token: str,
+    shift_template: ShiftTemplateModel,
+    existing_worker_shift: WorkerShiftModel,
+):
+    get_week(client, admin_token)
+    assert session.exec(select(CompanyWeekSnapshotModel)).all()
+
+    edit_shift_template(shift_template, EditShiftTemplateSchema(name="Late"), session)
+
+    assert session.exec(select(CompanyWeekSnapshotModel)).all() == []
+    group = get_week(client, admin_token).json()["days"][0]["templates"][0]
+    assert group["name"] == "Late"
+
+
+def test_week_grid_rejects_malformed_week(client: TestClient, admin_token: str):
+    assert get_week(client, admin_token, "2025-02").status_code == 400
+    assert get_week(client, admin_token, "2025-W60").status_code == 400
+
+
+def test_week_grid_requires_admin(client: TestClient, worker_token: str):
+    assert get_week(client, worker_token).status_code == 403
+
+
+def test_write_stores_snapshot_of_unviewed_week(
+    session: Session,
+    company: CompanyModel,
+    worker_user: UserModel,
+    shift_template: ShiftTemplateModel,
+    existing_worker_shift: WorkerShiftModel,
+):
+    """A first read that built before the write can't keep its stale build."""
+    stale = build_week_snapshot(company.id, WEEK, session)
+    session.delete(existing_worker_shift)
+    session.commit()
+
+    refresh_week_snapshots(company.id, [WEEK], session)
+    [snapshot] = session.exec(select(CompanyWeekSnapshotModel)).all()
+    assert snapshot.payload["days"][0]["templates"] == []
+
+    # The first read's store, based on a lookup from before the write, keeps it
+    upsert_week_snapshot(
+        company.id, WEEK, stale, 0, session, replace_same_version=False
+    )
+    session.commit()
+    session.expire_all()
+    snapshot = session.get(CompanyWeekSnapshotModel, (company.id, WEEK))
+    assert snapshot.payload["days"][0]["templates"] == []
+
+
+def test_snapshot_built_before_template_edit_is_rebuilt(
+    client: TestClient,
+    session: Session,
+    admin_token: str,
+    company: CompanyModel,
+    shift_template: ShiftTemplateModel,
+    existing_worker_shift: WorkerShiftModel,
+):
+    """A first read racing a template edit stores its build after the drop."""
+    version = current_snapshot_version(company.id, session)
+    stale = build_week_snapshot(company.id, WEEK, session)
+
+    edit_shift_template(
+        shift_template, EditShiftTemplateSchema(name="Renamed Shift"), session
+    )
+    upsert_week_snapshot(
+        company.id, WEEK, stale, version, session, replace_same_version=False
+    )
+    session.commit()
+
+    [group] = get_week(client, admin_token).json()["days"][0]["templates"]
+    assert group["name"] == "Renamed Shift"
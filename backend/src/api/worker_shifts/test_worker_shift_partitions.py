@@ -0,0 +1,164 @@
+from contextlib import contextmanager
+from datetime import date, datetime, timezone
+from uuid import uuid4
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlmodel import Session
+
+from db.models import CompanyModel, ShiftTemplateModel, UserModel, WorkerShiftModel
+from db.partitions import add_months, create_month_partition, partition_name
+
+
+@pytest.fixture
+def postgres_session(session: Session) -> Session:
+    if session.get_bind().dialect.name != "postgresql":
+        pytest.skip("partitioning is Postgres only")
+    return session
+
+
+@pytest.fixture
+def shifts_in_three_months(
+    postgres_session: Session,
+    company: CompanyModel,
+    worker_user: UserModel,
+    shift_template: ShiftTemplateModel,
+) -> list[WorkerShiftModel]:
+    """One shift in each of Dec 2024, Jan 2025 and Feb 2025."""
+    shifts = [
+        WorkerShiftModel(
+            id=uuid4(),
+            worker_id=worker_user.id,
+            company_id=company.id,
+            template_id=shift_template.id,
+            start_date=datetime(year, month, 6, 9, 0, tzinfo=timezone.utc),
+            end_date=datetime(year, month, 6, 17, 0, tzinfo=timezone.utc),
+        )
+        for year, month in [(2024, 12), (2025, 1), (2025, 2)]
+    ]
+    postgres_session.add_all(shifts)
+    postgres_session.commit()
+    return shifts
+
+
+@contextmanager
+def explain_worker_shift_queries(session: Session):
+    """Collects EXPLAIN output for every worker_shifts statement executed."""
+    engine = session.get_bind().engine
+    statements = []
+
+    def before_cursor_execute(
+        conn, cursor, statement, parameters, context, executemany
+    ):
+        if "worker_shifts" in statement and not executemany:
+            statements.append((statement, parameters))
+
+    plans = []
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield plans
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+    connection = session.connection()
+    for statement, parameters in statements:
+        rows = connection.exec_driver_sql("EXPLAIN " + statement, parameters)
+        plans.append("\n".join(row[0] for row in rows))
+
+
+JANUARY_RANGE = {
+    "range_start": "2025-01-01T00:00:00Z",
+    "range_end": "2025-01-31T23:59:59Z",
+}
+
+
+def assert_only_january_scanned(plans: list[str]):
+    assert plans
+    for plan in plans:
+        assert partition_name(date(2025, 1, 1)) in plan
+        assert partition_name(date(2024, 12, 1)) not in plan
+        assert partition_name(date(2025, 2, 1)) not in plan
+
+
+def test_company_shifts_prune_partitions(
+    client: TestClient,
+    postgres_session: Session,
+    admin_token: str,
+    shifts_in_three_months: list[WorkerShiftModel],
+):
+    """GET /worker-shifts/company only scans the requested month."""
+    with explain_worker_shift_queries(postgres_session) as plans:
+        response = client.get(
+            "/worker-shifts/company",
+            params=JANUARY_RANGE,
+            cookies={"access_token": admin_token},
+        )
+
+    assert response.status_code == 200
+    assert len(response.json()["items"]) == 1
+    assert_only_january_scanned(plans)
+
+
+def test_my_shifts_prune_partitions(
+    client: TestClient,
+    postgres_session: Session,
+    worker_token: str,
+    shifts_in_three_months: list[WorkerShiftModel],
+):
+    """GET /worker-shifts/my-shifts only scans the requested month."""
+    with explain_worker_shift_queries(postgres_session) as plans:
+        response = client.get(
+            "/worker-shifts/my-shifts",
+            params=JANUARY_RANGE,
+            cookies={"access_token": worker_token},
+        )
+
+    assert response.status_code == 200
+    assert len(response.json()["items"]) == 1
+    assert_only_january_scanned(plans)
+
+
+def test_clear_prunes_partitions(
+    client: TestClient,
+    postgres_session: Session,
+    admin_token: str,
+    shifts_in_three_months: list[WorkerShiftModel],
+):
+    """DELETE /worker-shifts/clear only touches the requested month."""
+    with explain_worker_shift_queries(postgres_session) as plans:
+        response = client.delete(
+            "/worker-shifts/clear",
+            params=JANUARY_RANGE,
+            cookies={"access_token": admin_token},
+        )
+
+    assert response.status_code == 200
+    assert response.json()["count"] == 1
+    assert_only_january_scanned(plans)
+
+
+def test_new_partition_moves_rows_out_of_default(
+    postgres_session: Session,
+    company: CompanyModel,
+    worker_user: UserModel,
+):
+    """A month created later picks up rows that landed in the default partition."""
+    far_month = add_months(date(2025, 1, 1), 120)
+    postgres_session.add(
+        WorkerShiftModel(
+            worker_id=worker_user.id,
+            company_id=company.id,
+            start_date=datetime(far_month.year, far_month.month, 2, tzinfo=timezone.utc),
+            end_date=datetime(far_month.year, far_month.month, 3, tzinfo=timezone.utc),
+        )
+    )
+    postgres_session.commit()
+
+    connection = postgres_session.connection()
+    create_month_partition(connection, far_month)
+
+    count = connection.exec_driver_sql(
+        f"SELECT count(*) FROM {partition_name(far_month)}"
+    ).scalar()
+    assert count == 1
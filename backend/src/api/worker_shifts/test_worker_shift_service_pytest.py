@@ -1,4 +1,4 @@
-from datetime import datetime, timezone
+from datetime import date, datetime, timezone
 from uuid import UUID, uuid4
 from dataclasses import dataclass
 from typing import Optional
@@ -7,7 +7,10 @@ import pytest
 
 from api.worker_shifts.schemas import Range
 from api.worker_shifts.worker_shift_service import (
+    AutoAssignStats,
+    expand_template_slots,
     prepare_auto_assign_shifts,
+    solve_auto_assign_slots,
 )
 
 
@@ -39,6 +42,8 @@ class MockShiftTemplate:
     startTime: str
     endTime: str
     days: Optional[list[int]] = None
+    startDate: Optional[date] = None
+    endDate: Optional[date] = None
 
 
 @dataclass
@@ -534,3 +539,183 @@ def test_templates_without_days_are_skipped():
 
     # Should return empty - template has no days
     assert len(shifts) == 0
+
+
+def test_solver_stats_are_collected():
+    """Test that solver counters reflect days, candidates and filled slots"""
+    company_id = uuid4()
+    # Jan 1-3, 2025 (Wed-Fri)
+    range_obj = Range(
+        range_start="2025-01-01T00:00:00Z", range_end="2025-01-03T23:59:59Z"
+    )
+
+    shift_templates = [
+        MockShiftTemplate(
+            id="template-1",
+            company_id=company_id,
+            name="Morning Shift",
+            position="Cashier",
+            startTime="09:00",
+            endTime="13:00",
+            days=[3, 4],
+        ),
+        MockShiftTemplate(
+            id="template-2",
+            company_id=company_id,
+            name="Evening Shift",
+            position="Cashier",
+            startTime="14:00",
+            endTime="18:00",
+            days=[3, 4],
+        ),
+    ]
+
+    users = [
+        MockUser(id="user-1", company_id=company_id, name="John Doe"),
+        MockUser(id="user-2", company_id=company_id, name="Jane Smith"),
+    ]
+
+    stats = AutoAssignStats()
+    shifts = prepare_auto_assign_shifts(
+        range=range_obj,
+        worker_shifts=[],
+        shift_templates=shift_templates,
+        users=users,
+        stats=stats,
+    )
+
+    assert len(shifts) == 4
+    assert stats.days_processed == 3
+    assert stats.slots_filled == 4
+    assert stats.candidates_examined >= stats.slots_filled
+
+
+def test_expand_template_slots_honors_weekdays_and_range_bounds():
+    """Slots come out ordered by day then template, clipped on the edge days"""
+    company_id = uuid4()
+    shift_templates = [
+        MockShiftTemplate(
+            id="early",
+            company_id=company_id,
+            name="Early",
+            position="Cashier",
+            startTime="06:00",
+            endTime="10:00",
+            days=[1, 2, 3],
+        ),
+        MockShiftTemplate(
+            id="late",
+            company_id=company_id,
+            name="Late",
+            position="Cashier",
+            startTime="18:00",
+            endTime="22:00",
+            days=[1, 3],
+        ),
+        MockShiftTemplate(
+            id="never",
+            company_id=company_id,
+            name="Never",
+            position="Cashier",
+            startTime="12:00",
+            endTime="13:00",
+            days=None,
+        ),
+    ]
+
+    # Monday 08:00 to Wednesday 12:00
+    expanded = expand_template_slots(
+        datetime(2025, 1, 6, 8, 0, tzinfo=timezone.utc),
+        datetime(2025, 1, 8, 12, 0, tzinfo=timezone.utc),
+        shift_templates,
+    )
+
+    assert expanded.day_count == 3
+    assert list(zip(expanded.days.tolist(), expanded.templates.tolist())) == [
+        (0, 1),  # Monday late, early already started
+        (1, 0),  # Tuesday early
+        (2, 0),  # Wednesday early, late is past the range end
+    ]
+    assert expanded.start_minutes.tolist() == [18 * 60, 6 * 60, 6 * 60]
+    assert expanded.end_minutes.tolist() == [22 * 60, 10 * 60, 10 * 60]
+
+
+def test_templates_only_fill_days_inside_their_validity_window():
+    """startDate and endDate are inclusive, unset ends are open"""
+    company_id = uuid4()
+    range_obj = Range(
+        range_start="2025-01-06T00:00:00Z", range_end="2025-01-12T23:59:59Z"
+    )
+    shift_templates = [
+        MockShiftTemplate(
+            id="winter",
+            company_id=company_id,
+            name="Winter",
+            position="Cashier",
+            startTime="09:00",
+            endTime="17:00",
+            days=[1, 2, 3, 4, 5, 6, 7],
+            startDate=date(2025, 1, 8),
+            endDate=date(2025, 1, 9),
+        ),
+        MockShiftTemplate(
+            id="expired",
+            company_id=company_id,
+            name="Expired",
+            position="Cashier",
+            startTime="09:00",
+            endTime="17:00",
+            days=[1, 2, 3, 4, 5, 6, 7],
+            endDate=date(2024, 12, 31),
+        ),
+    ]
+    users = [MockUser(id="user-1", company_id=company_id, name="John Doe")]
+
+    shifts = prepare_auto_assign_shifts(
+        range=range_obj,
+        worker_shifts=[],
+        shift_templates=shift_templates,
+        users=users,
+    )
+
+    assert [shift["start_date"].day for shift in shifts] == [8, 9]
+    assert {shift["template_id"] for shift in shifts} == {"winter"}
+
+
+def test_solver_skips_shifts_that_cannot_affect_slots():
+    """Non-candidates only enter the solver when their shift covers a slot."""
+    template = MockShiftTemplate(
+        id="shift-template-1",
+        company_id=uuid4(),
+        name="Morning Shift",
+        position="Cashier",
+        startTime="09:00",
+        endTime="17:00",
+        days=[1, 2, 3, 4, 5, 6, 7],
+    )
+
+    def shift_of(worker_id, template_id, day):
+        return MockWorkerShift(
+            id=uuid4(),
+            worker_id=worker_id,
+            company_id=uuid4(),
+            template_id=template_id,
+            start_date=datetime(2025, 1, day, 9, 0, tzinfo=timezone.utc),
+            end_date=datetime(2025, 1, day, 17, 0, tzinfo=timezone.utc),
+        )
+
+    worker_ids = ["user-1", "user-2"]
+    slots = solve_auto_assign_slots(
+        datetime(2025, 1, 1, tzinfo=timezone.utc),
+        datetime(2025, 1, 2, 23, 59, 59, tzinfo=timezone.utc),
+        [
+            # Another tenant's shift, irrelevant to this company's slots
+            shift_of("other-tenant-user", "other-template", 1),
+            shift_of("former-user", "shift-template-1", 2),
+        ],
+        [template],
+        worker_ids,
+    )
+
+    assert worker_ids == ["user-1", "user-2", "former-user"]
+    assert [worker_ids[worker] for worker in slots.workers] == ["user-1", "former-user"]
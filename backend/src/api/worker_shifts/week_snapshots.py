@@ -0,0 +1,245 @@
+"""Materialized per-company week grids.
+
+A snapshot holds every shift starting in one ISO week, grouped by UTC day
+and template with worker names resolved, so the admin calendar is one row
+fetch. Writes to shifts rebuild (or create) the snapshots of the weeks they
+touch; template and worker changes bump the company's snapshot version and
+drop its snapshots, which are rebuilt on the next read. Snapshots record the
+version they were built at, so one built from pre-edit data that lands after
+the drop is rebuilt too.
+"""
+
+import re
+from datetime import date, datetime, timedelta, timezone
+from typing import Iterable
+from uuid import UUID
+
+from sqlalchemy import delete, update
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlmodel import Session, select
+
+from db.models import (
+    CompanyModel,
+    CompanyWeekSnapshotModel,
+    ShiftTemplateModel,
+    UserModel,
+    WorkerShiftModel,
+)
+from .shift_archive import read_archived_worker_shifts
+
+ISO_WEEK_PATTERN = re.compile(r"^(\d{4})-W(\d{2})$")
+
+
+def parse_iso_week(iso_week: str) -> date:
+    """Monday of an ISO week like `2025-W02`, ValueError when malformed."""
+    match = ISO_WEEK_PATTERN.match(iso_week)
+    if not match:
+        raise ValueError(f"Invalid ISO week: {iso_week}")
+    return date.fromisocalendar(int(match.group(1)), int(match.group(2)), 1)
+
+
+def to_utc(value: datetime) -> datetime:
+    # SQLite hands back naive datetimes, everything is stored as UTC
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def iso_week_of(value: datetime) -> str:
+    year, week, _ = to_utc(value).isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+def weeks_of(shifts: Iterable[WorkerShiftModel]) -> set[str]:
+    return {iso_week_of(shift.start_date) for shift in shifts}
+
+
+def week_bounds(monday: date) -> tuple[datetime, datetime]:
+    lower = datetime(monday.year, monday.month, monday.day, tzinfo=timezone.utc)
+    return lower, lower + timedelta(days=7)
+
+
+def load_week_shifts(
+    company_id: UUID, lower: datetime, upper: datetime, session: Session
+) -> list[WorkerShiftModel]:
+    shifts = session.exec(
+        select(WorkerShiftModel)
+        .where(WorkerShiftModel.company_id == company_id)
+        .where(WorkerShiftModel.start_date >= lower)
+        .where(WorkerShiftModel.start_date < upper)
+    ).all()
+    live_ids = {shift.id for shift in shifts}
+    # Archived shifts are matched on end_date too, leave room for overnight ones
+    archived = read_archived_worker_shifts(company_id, lower, upper + timedelta(days=1))
+    return list(shifts) + [
+        shift
+        for shift in archived
+        if shift.id not in live_ids and to_utc(shift.start_date) < upper
+    ]
+
+
+def build_week_snapshot(company_id: UUID, iso_week: str, session: Session) -> dict:
+    monday = parse_iso_week(iso_week)
+    lower, upper = week_bounds(monday)
+    shifts = load_week_shifts(company_id, lower, upper, session)
+
+    templates = {
+        template.id: template
+        for template in session.exec(
+            select(ShiftTemplateModel).where(
+                ShiftTemplateModel.company_id == company_id
+            )
+        ).all()
+    }
+    worker_names = {}
+    worker_ids = {shift.worker_id for shift in shifts}
+    if worker_ids:
+        rows = session.exec(
+            select(UserModel.id, UserModel.first_name, UserModel.last_name).where(
+                UserModel.id.in_(worker_ids)
+            )
+        ).all()
+        worker_names = {
+            user_id: f"{first_name} {last_name}"
+            for user_id, first_name, last_name in rows
+        }
+
+    days = {monday + timedelta(days=i): {} for i in range(7)}
+    for shift in shifts:
+        start_date = to_utc(shift.start_date)
+        day = days[start_date.date()]
+        group = day.get(shift.template_id)
+        if group is None:
+            template = templates.get(shift.template_id)
+            group = day[shift.template_id] = {
+                "template_id": str(shift.template_id) if shift.template_id else None,
+                "name": template.name if template else None,
+                "position": template.position if template else None,
+                "startTime": template.startTime if template else None,
+                "endTime": template.endTime if template else None,
+                "shifts": [],
+            }
+        group["shifts"].append(
+            {
+                "id": str(shift.id),
+                "worker_id": str(shift.worker_id),
+                "worker_name": worker_names.get(shift.worker_id),
+                "start_date": start_date.isoformat(),
+                "end_date": to_utc(shift.end_date).isoformat(),
+            }
+        )
+
+    for day in days.values():
+        for group in day.values():
+            group["shifts"].sort(key=lambda s: (s["start_date"], s["worker_name"] or ""))
+
+    return {
+        "week": iso_week,
+        "days": [
+            {
+                "date": day.isoformat(),
+                "templates": sorted(
+                    groups.values(),
+                    key=lambda g: (g["startTime"] or "", g["name"] or ""),
+                ),
+            }
+            for day, groups in days.items()
+        ],
+    }
+
+
+def current_snapshot_version(company_id: UUID, session: Session) -> int:
+    """Read before building, a later bump then marks the build as stale."""
+    version = session.exec(
+        select(CompanyModel.week_snapshots_version).where(CompanyModel.id == company_id)
+    ).one_or_none()
+    return version or 0
+
+
+def get_week_snapshot(company_id: UUID, iso_week: str, session: Session) -> dict:
+    version = current_snapshot_version(company_id, session)
+    snapshot = session.exec(
+        select(CompanyWeekSnapshotModel)
+        .where(CompanyWeekSnapshotModel.company_id == company_id)
+        .where(CompanyWeekSnapshotModel.iso_week == iso_week)
+    ).one_or_none()
+    if snapshot is not None and snapshot.version >= version:
+        return snapshot.payload
+
+    payload = build_week_snapshot(company_id, iso_week, session)
+    # A write's rebuild of the same version may have landed since, keep it
+    upsert_week_snapshot(
+        company_id, iso_week, payload, version, session, replace_same_version=False
+    )
+    session.commit()
+    return payload
+
+
+def upsert_week_snapshot(
+    company_id: UUID,
+    iso_week: str,
+    payload: dict,
+    version: int,
+    session: Session,
+    replace_same_version: bool = True,
+):
+    """Stores the snapshot over one built at an older version (or the same,
+    unless `replace_same_version` is False)."""
+    dialect = session.get_bind().dialect.name
+    insert = postgresql_insert if dialect == "postgresql" else sqlite_insert
+    values = {
+        "company_id": company_id,
+        "iso_week": iso_week,
+        "payload": payload,
+        "version": version,
+        "updated_at": datetime.now(timezone.utc),
+    }
+    statement = insert(CompanyWeekSnapshotModel).values(**values)
+    session.exec(
+        statement.on_conflict_do_update(
+            index_elements=["company_id", "iso_week"],
+            set_={
+                "payload": payload,
+                "version": version,
+                "updated_at": values["updated_at"],
+            },
+            where=(
+                CompanyWeekSnapshotModel.version <= version
+                if replace_same_version
+                else CompanyWeekSnapshotModel.version < version
+            ),
+        )
+    )
+
+
+def refresh_week_snapshots(company_id: UUID, weeks: Iterable[str], session: Session):
+    """Rebuilds and upserts the snapshots of `weeks`, viewed or not.
+
+    Writing weeks nobody has viewed yet closes the race with a first read
+    that built its snapshot before this write committed: its insert then
+    conflicts with this row instead of storing the stale build, and an
+    insert that got in first waits for it and is overwritten.
+    """
+    weeks = set(weeks)
+    if not weeks:
+        return
+    version = current_snapshot_version(company_id, session)
+    for iso_week in sorted(weeks):
+        payload = build_week_snapshot(company_id, iso_week, session)
+        upsert_week_snapshot(company_id, iso_week, payload, version, session)
+    session.commit()
+
+
+def invalidate_company_snapshots(company_id: UUID, session: Session):
+    session.exec(
+        update(CompanyModel)
+        .where(CompanyModel.id == company_id)
+        .values(week_snapshots_version=CompanyModel.week_snapshots_version + 1)
+    )
+    session.exec(
+        delete(CompanyWeekSnapshotModel).where(
+            CompanyWeekSnapshotModel.company_id == company_id
+        )
+    )
+    session.commit()
@@ -1,9 +1,15 @@
+from array import array
+from bisect import bisect_left, insort
 from uuid import UUID
-from typing import TypedDict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, NamedTuple, Optional, TypedDict
 from sqlmodel import Session, select
-from sqlalchemy.orm import selectinload
-from datetime import datetime, timedelta
+from sqlalchemy import insert
+from datetime import date, datetime, timedelta
 from .schemas import AddWorkerShiftPayloadSchema, Range
+from .shift_archive import delete_archived_worker_shifts, read_archived_worker_shifts
+from .week_snapshots import refresh_week_snapshots, to_utc, weeks_of
+from realtime import publish_company_event
 from db.models import (
     AssignmentSuggestionModel,
     ShiftTemplateModel,
@@ -11,6 +17,9 @@ from db.models import (
     WorkerShiftModel,
 )
 
+if TYPE_CHECKING:
+    import numpy as np
+
 
 class ShiftPlaceholder(TypedDict):
     worker_id: UUID
@@ -19,6 +28,49 @@ class ShiftPlaceholder(TypedDict):
     end_date: datetime
 
 
+@dataclass
+class AutoAssignStats:
+    days_processed: int = 0
+    candidates_examined: int = 0
+    slots_filled: int = 0
+
+
+def parse_datetime(value) -> datetime:
+    """ISO strings from query params become aware datetimes.
+
+    Binding real datetimes keeps range filters correct on every backend,
+    SQLite compares string binds lexically.
+    """
+    if isinstance(value, datetime):
+        return value
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+def shifts_within(range_start, range_end) -> tuple:
+    """Filters for shifts fully inside the range.
+
+    `start_date <= range_end` is implied by the end_date filter but gives
+    Postgres an upper bound on the partition key to prune monthly partitions.
+    """
+    range_start = parse_datetime(range_start)
+    range_end = parse_datetime(range_end)
+    return (
+        WorkerShiftModel.start_date >= range_start,
+        WorkerShiftModel.start_date <= range_end,
+        WorkerShiftModel.end_date <= range_end,
+    )
+
+
+def shifts_span(shifts) -> Optional[list]:
+    """[earliest start, latest end] so clients only refetch visible ranges."""
+    if not shifts:
+        return None
+    return [
+        min(shift.start_date for shift in shifts).isoformat(),
+        max(shift.end_date for shift in shifts).isoformat(),
+    ]
+
+
 def create_shift_template(
     data: AddWorkerShiftPayloadSchema, company_id: UUID, session: Session
 ):
@@ -28,91 +80,98 @@ def create_shift_template(
     session.add(new_worker_shift)
     session.commit()
     session.refresh(new_worker_shift)
+    refresh_week_snapshots(company_id, weeks_of([new_worker_shift]), session)
+    publish_company_event(
+        company_id, "shifts.created", count=1, range=shifts_span([new_worker_shift])
+    )
     return new_worker_shift
 
 
+WORKER_SHIFT_FIELDS = (
+    "id",
+    "worker_id",
+    "company_id",
+    "start_date",
+    "end_date",
+    "template_id",
+)
+ASSIGNMENT_SUGGESTION_FIELDS = (
+    "id",
+    "worker_id",
+    "company_id",
+    "template_id",
+    "start_date",
+    "end_date",
+    "created_at",
+)
+
+
 def get_worker_shifts_by_company_id(company_id: UUID, range: Range, session: Session):
+    """Plain result rows (plus archived models), no ORM identity tracking."""
     data = range.model_dump()
     query = (
-        select(WorkerShiftModel)
+        select(*(getattr(WorkerShiftModel, f) for f in WORKER_SHIFT_FIELDS))
         .where(WorkerShiftModel.company_id == company_id)
-        .where(WorkerShiftModel.start_date >= data["range_start"])
-        .where(WorkerShiftModel.end_date <= data["range_end"])
+        .where(*shifts_within(data["range_start"], data["range_end"]))
     )
     results = session.exec(query).all()
-    return results
+    archived = read_archived_worker_shifts(
+        company_id,
+        parse_datetime(data["range_start"]),
+        parse_datetime(data["range_end"]),
+    )
+    return merge_archived_shifts(results, archived)
 
 
-def get_worker_shifts_in_time_range(start_date, end_date, session: Session):
-    query = select(WorkerShiftModel).where(
-        WorkerShiftModel.start_date >= start_date,
-        WorkerShiftModel.end_date <= end_date,
+def get_worker_shifts_in_time_range(
+    company_id: UUID, start_date, end_date, session: Session
+):
+    # Ordered so auto-assign keeps the same worker of a doubly covered slot
+    query = (
+        select(WorkerShiftModel)
+        .where(WorkerShiftModel.company_id == company_id)
+        .where(*shifts_within(start_date, end_date))
+        .order_by(WorkerShiftModel.start_date, WorkerShiftModel.id)
     )
     results = session.exec(query).all()
     return results
 
 
-def get_user_shifts(user_id: UUID, payload: Range, session: Session):
+def get_user_shifts(
+    user_id: UUID,
+    payload: Range,
+    session: Session,
+    company_id: Optional[UUID] = None,
+):
+    """Plain result rows (plus archived models), templates are left to the
+    caller to fetch once by `template_id`."""
     data = payload.model_dump()
     query = (
-        select(WorkerShiftModel)
-        .options(selectinload(WorkerShiftModel.template))
+        select(*(getattr(WorkerShiftModel, f) for f in WORKER_SHIFT_FIELDS))
         .where(WorkerShiftModel.worker_id == user_id)
-        .where(WorkerShiftModel.start_date >= data["range_start"])
-        .where(WorkerShiftModel.end_date <= data["range_end"])
+        .where(*shifts_within(data["range_start"], data["range_end"]))
     )
     results = session.exec(query).all()
-    return results
-
-
-def get_worker_for_shift(
-    shift_placeholders: list,
-    shift_template: ShiftTemplateModel,
-    day_worker_shifts: list[WorkerShiftModel],
-    users: list[UserModel],
-    user_shift_counts: dict[UUID, int],
-    shift_start_date: datetime,
-    shift_end_date: datetime,
-):
-    existing_shift = next(
-        (ws for ws in day_worker_shifts if ws.template_id == shift_template.id),
-        None,
+    if company_id is None:
+        return results
+
+    archived = read_archived_worker_shifts(
+        company_id,
+        parse_datetime(data["range_start"]),
+        parse_datetime(data["range_end"]),
+        worker_id=user_id,
     )
+    return merge_archived_shifts(results, archived)
 
-    if existing_shift:
-        return existing_shift.worker_id
-
-    # Sort users by shift count (ascending) to assign to user with fewest shifts
-    sorted_users = sorted(users, key=lambda u: user_shift_counts[u.id])
-    for user in sorted_users:
-
-        has_worker_shift = any(
-            ws
-            for ws in day_worker_shifts
-            if ws.worker_id == user.id
-            # TODO prepare test then uncomment
-            # and (
-            #     ws["start_date"].date() >= shift_start_date
-            #     and ws["end_date"].date() <= shift_end_date
-            # )
-        )
-
-        if has_worker_shift:
-            continue
-
-        has_placeholder_shift = any(
-            sp
-            for sp in shift_placeholders
-            if sp["worker_id"] == user.id
-            and (
-                sp["start_date"] >= shift_start_date
-                and sp["end_date"] <= shift_end_date
-            )
-        )
-        if has_placeholder_shift:
-            continue
 
-        return user.id
+def merge_archived_shifts(
+    live: list[WorkerShiftModel], archived: list[WorkerShiftModel]
+) -> list[WorkerShiftModel]:
+    """Live rows win, a month caught mid-archival can exist in both."""
+    if not archived:
+        return live
+    live_ids = {shift.id for shift in live}
+    return [shift for shift in archived if shift.id not in live_ids] + list(live)
 
 
 def timeToMinutes(timeParts: list[int]) -> int:
@@ -128,94 +187,295 @@ def timeStringToMinutes(time: str) -> int:
     return timeToMinutes(time_parts)
 
 
+class SlotAssignments:
+    """Filled slots in the solver's integer encoding, one int array per field.
+
+    `workers` and `templates` index the run's worker and template lists,
+    `days` counts days from the range start and the minutes are wall clock
+    minutes of that day. Datetimes and UUIDs only appear once the slots are
+    turned into placeholders by `slots_to_placeholders`.
+    """
+
+    __slots__ = ("workers", "templates", "days", "start_minutes", "end_minutes")
+
+    def __init__(self):
+        self.workers = array("i")
+        self.templates = array("i")
+        self.days = array("i")
+        self.start_minutes = array("i")
+        self.end_minutes = array("i")
+
+    def append(
+        self, worker: int, template: int, day: int, start_minute: int, end_minute: int
+    ):
+        self.workers.append(worker)
+        self.templates.append(template)
+        self.days.append(day)
+        self.start_minutes.append(start_minute)
+        self.end_minutes.append(end_minute)
+
+    def __len__(self) -> int:
+        return len(self.workers)
+
+
+class ExpandedSlots(NamedTuple):
+    """Open (day, template) slots of a range, ordered by day then template."""
+
+    days: "np.ndarray"
+    templates: "np.ndarray"
+    start_minutes: "np.ndarray"
+    end_minutes: "np.ndarray"
+    day_count: int
+
+
+def range_days(start_date: datetime, end_date: datetime) -> tuple[date, int]:
+    """First slot day and number of days auto-assign walks over the range."""
+    day_count = max((end_date - start_date) // timedelta(days=1) + 1, 0)
+    return start_date.date(), day_count
+
+
+def active_template_filters(start_date: datetime, end_date: datetime) -> dict:
+    """`find_active_shift_templates` arguments narrowing templates to the range.
+
+    Weekdays are only restricted for ranges under a week and start times
+    only for single day ranges, where the range bounds clip them.
+    """
+    first_day, day_count = range_days(start_date, end_date)
+    filters = {
+        "first_day": first_day,
+        "last_day": first_day + timedelta(days=max(day_count - 1, 0)),
+        "weekdays": None,
+        "start_time_window": None,
+    }
+    if day_count < 7:
+        filters["weekdays"] = {
+            (first_day + timedelta(days=day)).isoweekday() for day in range(day_count)
+        }
+    if day_count == 1:
+        last_day_is_end = end_date.date() == first_day
+        filters["start_time_window"] = (
+            f"{start_date.hour:02d}:{start_date.minute:02d}",
+            f"{end_date.hour:02d}:{end_date.minute:02d}" if last_day_is_end else "23:59",
+        )
+    return filters
+
+
+def expand_template_slots(
+    start_date: datetime,
+    end_date: datetime,
+    shift_templates: list[ShiftTemplateModel],
+) -> ExpandedSlots:
+    """Expands template recurrences over the range with array operations.
+
+    A template yields a slot on every day of its validity window whose
+    weekday is in its `days`, provided it starts after the range start on
+    the first day and no later than the range end on the last one.
+    """
+    # numpy takes a noticeable share of cold start, so import it on first use
+    import numpy as np
+
+    first_day, day_count = range_days(start_date, end_date)
+    day_range = np.arange(day_count)
+    weekdays = (start_date.isoweekday() - 1 + day_range) % 7 + 1
+
+    template_count = len(shift_templates)
+    # Row per template, column per ISO weekday (column 0 unused)
+    weekday_mask = np.zeros((template_count, 8), dtype=bool)
+    start_minutes = np.empty(template_count, dtype=np.int32)
+    end_minutes = np.empty(template_count, dtype=np.int32)
+    # Validity windows as inclusive day offsets into the range
+    active_from = np.zeros(template_count, dtype=np.int64)
+    active_until = np.full(template_count, day_count - 1, dtype=np.int64)
+    for i, template in enumerate(shift_templates):
+        weekday_mask[i, [day for day in template.days or () if 1 <= day <= 7]] = True
+        start_minutes[i] = timeStringToMinutes(template.startTime)
+        end_minutes[i] = timeStringToMinutes(template.endTime)
+        if template.startDate is not None:
+            active_from[i] = (template.startDate - first_day).days
+        if template.endDate is not None:
+            active_until[i] = (template.endDate - first_day).days
+
+    min_minutes = np.zeros(day_count, dtype=np.int32)
+    max_minutes = np.full(day_count, 23 * 60 + 59, dtype=np.int32)
+    if day_count:
+        min_minutes[0] = start_date.hour * 60 + start_date.minute
+        last_day = (end_date.date() - first_day).days
+        if 0 <= last_day < day_count:
+            max_minutes[last_day] = end_date.hour * 60 + end_date.minute
+
+    open_slots = (
+        weekday_mask[:, weekdays].T
+        & (start_minutes > min_minutes[:, None])
+        & (start_minutes <= max_minutes[:, None])
+        & (day_range[:, None] >= active_from)
+        & (day_range[:, None] <= active_until)
+    )
+    days, templates = np.nonzero(open_slots)
+    return ExpandedSlots(
+        days, templates, start_minutes[templates], end_minutes[templates], day_count
+    )
+
+
+def solve_auto_assign_slots(
+    start_date: datetime,
+    end_date: datetime,
+    worker_shifts: list[WorkerShiftModel],
+    shift_templates: list[ShiftTemplateModel],
+    worker_ids: list,
+    stats: Optional[AutoAssignStats] = None,
+) -> SlotAssignments:
+    """Fills every template slot of the range with the least loaded free worker.
+
+    A slot already covered by an existing shift of the same template keeps
+    that shift's worker (the earliest shift's when several cover it).
+    Otherwise candidates are tried by ascending count of slots filled so
+    far (ties in `worker_ids` order), skipping workers with a shift that UTC
+    day or a suggested slot nested in this one. `worker_ids` is extended
+    with workers only known from shifts covering a slot, they are never
+    candidates; other shifts of non-candidates are skipped.
+    """
+    candidate_count = len(worker_ids)
+    worker_index = {worker_id: i for i, worker_id in enumerate(worker_ids)}
+    template_index = {template.id: i for i, template in enumerate(shift_templates)}
+
+    expanded = expand_template_slots(start_date, end_date, shift_templates)
+
+    # Existing shifts by day offset: the first worker per template, busy workers
+    first_day = start_date.date()
+    covered_by_day: dict[int, dict[int, int]] = {}
+    busy_by_day: dict[int, set[int]] = {}
+    for ws in worker_shifts:
+        worker = worker_index.get(ws.worker_id)
+        template = template_index.get(ws.template_id)
+        if worker is None:
+            # Neither a candidate nor covering a slot, e.g. another tenant's
+            if template is None:
+                continue
+            worker = worker_index[ws.worker_id] = len(worker_ids)
+            worker_ids.append(ws.worker_id)
+        day = (to_utc(ws.start_date).date() - first_day).days
+        busy_by_day.setdefault(day, set()).add(worker)
+        if template is not None:
+            covered_by_day.setdefault(day, {}).setdefault(template, worker)
+
+    return assign_slot_workers(
+        expanded, worker_ids, candidate_count, covered_by_day, busy_by_day, stats
+    )
+
+
+def assign_slot_workers(
+    expanded: ExpandedSlots,
+    worker_ids: list,
+    candidate_count: int,
+    covered_by_day: dict[int, dict[int, int]],
+    busy_by_day: dict[int, set[int]],
+    stats: Optional[AutoAssignStats] = None,
+) -> SlotAssignments:
+    """Worker selection over expanded slots, see `solve_auto_assign_slots`.
+
+    The first `candidate_count` entries of `worker_ids` are candidates.
+    Shared by the in-process and the database candidate sources, so both
+    fill the same slots the same way.
+    """
+    counts = [0] * len(worker_ids)
+    # Candidates ordered by (slots filled, position), re-ranked on assignment
+    ranking = [(0, worker) for worker in range(candidate_count)]
+
+    slots = SlotAssignments()
+    current_day = None
+    for day, template, start_minute, end_minute in zip(
+        expanded.days.tolist(),
+        expanded.templates.tolist(),
+        expanded.start_minutes.tolist(),
+        expanded.end_minutes.tolist(),
+    ):
+        if day != current_day:
+            current_day = day
+            covered = covered_by_day.get(day, {})
+            busy = busy_by_day.get(day, ())
+            # Slots suggested today per worker, earlier days can never nest
+            day_slots: dict[int, list[tuple[int, int]]] = {}
+
+        worker = covered.get(template)
+        if worker is None:
+            for _, candidate in ranking:
+                if stats is not None:
+                    stats.candidates_examined += 1
+                if candidate in busy:
+                    continue
+                if any(
+                    start >= start_minute and end <= end_minute
+                    for start, end in day_slots.get(candidate, ())
+                ):
+                    continue
+                worker = candidate
+                break
+
+        if worker is None:
+            if stats is not None:
+                stats.days_processed += day
+            # If no user could be assigned (all users already have this shift)
+            raise ValueError("Cannot auto-assign shifts: not enough users provided")
+
+        slots.append(worker, template, day, start_minute, end_minute)
+        day_slots.setdefault(worker, []).append((start_minute, end_minute))
+        if worker < candidate_count:
+            position = bisect_left(ranking, (counts[worker], worker))
+            del ranking[position]
+            insort(ranking, (counts[worker] + 1, worker))
+        counts[worker] += 1
+        if stats is not None:
+            stats.slots_filled += 1
+
+    if stats is not None:
+        stats.days_processed += expanded.day_count
+    return slots
+
+
+def slots_to_placeholders(
+    slots: SlotAssignments,
+    start_date: datetime,
+    template_ids: list,
+    worker_ids: list,
+) -> list[ShiftPlaceholder]:
+    first_midnight = start_date.replace(hour=0, minute=0, second=0, microsecond=0)
+    return [
+        {
+            "worker_id": worker_ids[worker],
+            "template_id": template_ids[template],
+            "start_date": first_midnight + timedelta(days=day, minutes=start_minute),
+            "end_date": first_midnight + timedelta(days=day, minutes=end_minute),
+        }
+        for worker, template, day, start_minute, end_minute in zip(
+            slots.workers,
+            slots.templates,
+            slots.days,
+            slots.start_minutes,
+            slots.end_minutes,
+        )
+    ]
+
+
 def prepare_auto_assign_shifts(
     range: Range,
     worker_shifts: list[WorkerShiftModel],
     shift_templates: list[ShiftTemplateModel],
     users: list[UserModel],
+    stats: Optional[AutoAssignStats] = None,
 ) -> list[ShiftPlaceholder]:
     if not users:
         raise ValueError("Cannot auto-assign shifts: no users provided")
 
     range_dict = range.model_dump()
-    start_date = datetime.fromisoformat(
-        range_dict["range_start"].replace("Z", "+00:00")
+    start_date = parse_datetime(range_dict["range_start"])
+    end_date = parse_datetime(range_dict["range_end"])
+    worker_ids = [user.id for user in users]
+    slots = solve_auto_assign_slots(
+        start_date, end_date, worker_shifts, shift_templates, worker_ids, stats
+    )
+    return slots_to_placeholders(
+        slots, start_date, [template.id for template in shift_templates], worker_ids
     )
-    end_date = datetime.fromisoformat(range_dict["range_end"].replace("Z", "+00:00"))
-    shift_placeholders = []
-    current_date = start_date
-    user_shift_counts = {user.id: 0 for user in users}
-
-    while current_date <= end_date:
-        min_minutes = timeToMinutes(
-            [start_date.hour, start_date.minute]
-            if current_date.date() == start_date.date()
-            else [0, 0]
-        )
-        max_minutes = timeToMinutes(
-            [end_date.hour, end_date.minute]
-            if current_date.date() == end_date.date()
-            else [23, 59]
-        )
-
-        weekday = current_date.isoweekday()
-        day_shift_templates = list(
-            filter(
-                lambda st: st.days
-                and weekday in st.days
-                and timeStringToMinutes(st.startTime) > min_minutes
-                and timeStringToMinutes(st.startTime) <= max_minutes,
-                shift_templates,
-            )
-        )
-
-        day_worker_shifts = [
-            ws for ws in worker_shifts if ws.start_date.date() == current_date.date()
-        ]
-
-        for shift_template in day_shift_templates:
-            start_time_parts = timeStringToPartList(shift_template.startTime)
-            end_time_parts = timeStringToPartList(shift_template.endTime)
-            shift_start_date = current_date.replace(
-                hour=int(start_time_parts[0]),
-                minute=int(start_time_parts[1]),
-                second=0,
-                microsecond=0,
-            )
-            shift_end_date = current_date.replace(
-                hour=int(end_time_parts[0]),
-                minute=int(end_time_parts[1]),
-                second=0,
-                microsecond=0,
-            )
-
-            worker_id = get_worker_for_shift(
-                shift_placeholders=shift_placeholders,
-                shift_template=shift_template,
-                day_worker_shifts=day_worker_shifts,
-                users=users,
-                user_shift_counts=user_shift_counts,
-                shift_start_date=shift_start_date,
-                shift_end_date=shift_end_date,
-            )
-
-            if not worker_id:
-                # If no user could be assigned (all users already have this shift)
-                raise ValueError("Cannot auto-assign shifts: not enough users provided")
-
-            shift_placeholders.append(
-                {
-                    "worker_id": worker_id,
-                    "template_id": shift_template.id,
-                    "start_date": shift_start_date,
-                    "end_date": shift_end_date,
-                }
-            )
-            user_shift_counts[worker_id] += 1
-
-        current_date += timedelta(days=1)
-
-    return shift_placeholders
 
 
 def save_assignment_suggestions(
@@ -223,20 +483,33 @@ def save_assignment_suggestions(
     company_id: UUID,
     session: Session,
 ) -> list[AssignmentSuggestionModel]:
-    suggestions = []
-    for placeholder in shift_placeholders:
-        suggestion = AssignmentSuggestionModel(
+    """Bulk inserts the suggestions and returns them as transient models.
+
+    Every column is generated client side, so there is nothing to refresh
+    and reading the returned objects never goes back to the database.
+    """
+    suggestions = [
+        AssignmentSuggestionModel(
             worker_id=placeholder["worker_id"],
             company_id=company_id,
             template_id=placeholder["template_id"],
             start_date=placeholder["start_date"],
             end_date=placeholder["end_date"],
         )
-        session.add(suggestion)
-        suggestions.append(suggestion)
+        for placeholder in shift_placeholders
+    ]
+    if suggestions:
+        session.exec(
+            insert(AssignmentSuggestionModel),
+            params=[suggestion.model_dump() for suggestion in suggestions],
+        )
     session.commit()
-    for suggestion in suggestions:
-        session.refresh(suggestion)
+    publish_company_event(
+        company_id,
+        "suggestions.replaced",
+        count=len(suggestions),
+        range=shifts_span(suggestions),
+    )
     return suggestions
 
 
@@ -249,6 +522,14 @@ def get_assignment_suggestions_by_company(
     return list(session.exec(query).all())
 
 
+def get_assignment_suggestion_rows_by_company(company_id: UUID, session: Session):
+    """Listing variant returning plain result rows."""
+    query = select(
+        *(getattr(AssignmentSuggestionModel, f) for f in ASSIGNMENT_SUGGESTION_FIELDS)
+    ).where(AssignmentSuggestionModel.company_id == company_id)
+    return session.exec(query).all()
+
+
 def delete_assignment_suggestion(suggestion_id: UUID, session: Session) -> bool:
     suggestion = session.get(AssignmentSuggestionModel, suggestion_id)
     if not suggestion:
@@ -258,7 +539,11 @@ def delete_assignment_suggestion(suggestion_id: UUID, session: Session) -> bool:
     return True
 
 
-def delete_all_company_suggestions(company_id: UUID, session: Session) -> int:
+def delete_all_company_suggestions(
+    company_id: UUID, session: Session, commit: bool = True
+) -> int:
+    """`commit=False` leaves the deletes in the open transaction, e.g. to
+    replace the suggestions atomically."""
     query = select(AssignmentSuggestionModel).where(
         AssignmentSuggestionModel.company_id == company_id
     )
@@ -266,7 +551,10 @@ def delete_all_company_suggestions(company_id: UUID, session: Session) -> int:
     count = len(suggestions)
     for suggestion in suggestions:
         session.delete(suggestion)
-    session.commit()
+    if commit:
+        session.commit()
+    else:
+        session.flush()
     return count
 
 
@@ -289,6 +577,13 @@ def accept_assignment_suggestions(
     session.commit()
     for ws in worker_shifts:
         session.refresh(ws)
+    refresh_week_snapshots(company_id, weeks_of(worker_shifts), session)
+    publish_company_event(
+        company_id,
+        "suggestions.accepted",
+        count=len(worker_shifts),
+        range=shifts_span(worker_shifts),
+    )
     return worker_shifts
 
 
@@ -299,12 +594,27 @@ def delete_worker_shifts_in_range(
     query = (
         select(WorkerShiftModel)
         .where(WorkerShiftModel.company_id == company_id)
-        .where(WorkerShiftModel.start_date >= data["range_start"])
-        .where(WorkerShiftModel.end_date <= data["range_end"])
+        .where(*shifts_within(data["range_start"], data["range_end"]))
     )
     shifts = session.exec(query).all()
-    count = len(shifts)
     for shift in shifts:
         session.delete(shift)
+    # Archived months are merged back into reads, so they are cleared too.
+    # Rewritten before the commit so a failure leaves the live rows in place
+    archived = delete_archived_worker_shifts(
+        company_id,
+        parse_datetime(data["range_start"]),
+        parse_datetime(data["range_end"]),
+    )
     session.commit()
+    count = len(shifts) + len(archived)
+    weeks = weeks_of([*shifts, *archived])
+    refresh_week_snapshots(company_id, weeks, session)
+    if count:
+        publish_company_event(
+            company_id,
+            "shifts.deleted",
+            count=count,
+            range=[data["range_start"], data["range_end"]],
+        )
     return count
@@ -0,0 +1,4 @@
+from .backends import CacheBackend, InMemoryLRUBackend, RedisBackend
+from .cache import Cache, cache
+
+__all__ = ["Cache", "CacheBackend", "InMemoryLRUBackend", "RedisBackend", "cache"]
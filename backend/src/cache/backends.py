@@ -0,0 +1,115 @@
+import pickle
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Iterable, Optional
+
+
+class CacheBackend(ABC):
+    """Storage interface behind `Cache`.
+
+    Backends only store opaque values with an optional TTL; tags, loaders and
+    serialization of models live in `Cache`, so a network backend just needs
+    these three bulk operations (one round trip each).
+    """
+
+    @abstractmethod
+    def get_many(self, keys: Iterable[str]) -> dict[str, Any]:
+        """Values for the keys that exist and have not expired."""
+
+    @abstractmethod
+    def set_many(self, items: dict[str, Any], ttl: Optional[float] = None):
+        ...
+
+    @abstractmethod
+    def delete_many(self, keys: Iterable[str]):
+        ...
+
+    @abstractmethod
+    def clear(self):
+        ...
+
+
+class InMemoryLRUBackend(CacheBackend):
+    """Per-process LRU with per-entry expiry. Each gunicorn worker has its own."""
+
+    def __init__(self, max_entries: int = 10_000):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[Optional[float], Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_many(self, keys: Iterable[str]) -> dict[str, Any]:
+        now = time.monotonic()
+        found = {}
+        with self._lock:
+            for key in keys:
+                entry = self._entries.get(key)
+                if entry is None:
+                    continue
+                expires_at, value = entry
+                if expires_at is not None and expires_at <= now:
+                    del self._entries[key]
+                    continue
+                self._entries.move_to_end(key)
+                found[key] = value
+        return found
+
+    def set_many(self, items: dict[str, Any], ttl: Optional[float] = None):
+        expires_at = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            for key, value in items.items():
+                self._entries[key] = (expires_at, value)
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete_many(self, keys: Iterable[str]):
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class RedisBackend(CacheBackend):
+    """Shared cache for all workers, needs the optional `redis` package."""
+
+    def __init__(self, url: str, prefix: str = "workchart:"):
+        import redis
+
+        self.client = redis.Redis.from_url(url)
+        self.prefix = prefix
+
+    def get_many(self, keys: Iterable[str]) -> dict[str, Any]:
+        keys = list(keys)
+        if not keys:
+            return {}
+        values = self.client.mget([self.prefix + key for key in keys])
+        return {
+            key: pickle.loads(value)
+            for key, value in zip(keys, values)
+            if value is not None
+        }
+
+    def set_many(self, items: dict[str, Any], ttl: Optional[float] = None):
+        pipeline = self.client.pipeline(transaction=False)
+        for key, value in items.items():
+            pipeline.set(
+                self.prefix + key,
+                pickle.dumps(value),
+                px=int(ttl * 1000) if ttl else None,
+            )
+        pipeline.execute()
+
+    def delete_many(self, keys: Iterable[str]):
+        keys = [self.prefix + key for key in keys]
+        if keys:
+            self.client.delete(*keys)
+
+    def clear(self):
+        keys = list(self.client.scan_iter(match=self.prefix + "*"))
+        if keys:
+            self.client.delete(*keys)
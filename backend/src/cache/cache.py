@@ -0,0 +1,127 @@
+import uuid
+from typing import Any, Callable, Iterable, Optional
+
+from decouple import config
+
+from .backends import CacheBackend, InMemoryLRUBackend, RedisBackend
+
+# memory:// (per process, default), redis://host:6379/0 or none:// to disable
+CACHE_URL = config("CACHE_URL", default="memory://")
+CACHE_MAX_ENTRIES = config("CACHE_MAX_ENTRIES", default=10_000, cast=int)
+# Upper bound on staleness between workers when using the in-memory backend
+CACHE_DEFAULT_TTL = config("CACHE_DEFAULT_TTL", default=60.0, cast=float)
+
+TAG_PREFIX = "tag:"
+
+
+class Cache:
+    """Key/value cache with TTLs and tag invalidation over a `CacheBackend`.
+
+    Every tag has a version token stored in the backend; entries remember the
+    versions they were computed under and count as misses once any of their
+    tags was invalidated (or its token evicted). Invalidating a tag is a
+    single write no matter how many keys carry it.
+    """
+
+    def __init__(self, backend: Optional[CacheBackend], default_ttl: float):
+        self.backend = backend
+        self.default_ttl = default_ttl
+
+    def _tag_versions(self, tags: Iterable[str], create: bool) -> dict[str, str]:
+        keys = {TAG_PREFIX + tag: tag for tag in tags}
+        stored = self.backend.get_many(keys)
+        versions = {keys[key]: version for key, version in stored.items()}
+        missing = {key: uuid.uuid4().hex for key in keys if key not in stored}
+        if create and missing:
+            self.backend.set_many(missing)
+            versions.update({keys[key]: version for key, version in missing.items()})
+        return versions
+
+    def get_many(self, keys: Iterable[str]) -> dict[str, Any]:
+        if self.backend is None:
+            return {}
+        entries = self.backend.get_many(keys)
+        tags = {tag for _, entry_tags in entries.values() for tag in entry_tags}
+        versions = self._tag_versions(tags, create=False) if tags else {}
+        return {
+            key: value
+            for key, (value, entry_tags) in entries.items()
+            if all(versions.get(tag) == version for tag, version in entry_tags.items())
+        }
+
+    def get(self, key: str, default=None):
+        return self.get_many([key]).get(key, default)
+
+    def set_many(
+        self,
+        items: dict[str, Any],
+        ttl: Optional[float] = None,
+        tags: Iterable[str] = (),
+        tag_versions: Optional[dict[str, str]] = None,
+    ):
+        if self.backend is None:
+            return
+        if tag_versions is None:
+            tag_versions = self._tag_versions(tags, create=True)
+        self.backend.set_many(
+            {key: (value, tag_versions) for key, value in items.items()},
+            ttl=self.default_ttl if ttl is None else ttl,
+        )
+
+    def set(self, key: str, value, ttl: Optional[float] = None, tags: Iterable[str] = ()):
+        self.set_many({key: value}, ttl=ttl, tags=tags)
+
+    def delete_many(self, keys: Iterable[str]):
+        if self.backend is not None:
+            self.backend.delete_many(keys)
+
+    def delete(self, key: str):
+        self.delete_many([key])
+
+    def invalidate_tags(self, *tags: str):
+        if self.backend is not None and tags:
+            self.backend.set_many({TAG_PREFIX + tag: uuid.uuid4().hex for tag in tags})
+
+    def get_or_set(
+        self,
+        key: str,
+        loader: Callable[[], Any],
+        ttl: Optional[float] = None,
+        tags: Iterable[str] = (),
+        store: bool = True,
+    ):
+        """Cached value for `key`, computed with `loader` on a miss.
+
+        Tag versions are read before loading, so an invalidation racing with
+        the load leaves the stored value already stale instead of hiding it.
+        With `store=False` a miss is loaded but not written back, for loaders
+        that may read stale data (e.g. from a lagging replica).
+        """
+        if self.backend is None:
+            return loader()
+        found = self.get_many([key])
+        if key in found:
+            return found[key]
+        if not store:
+            return loader()
+        tag_versions = self._tag_versions(tags, create=True)
+        value = loader()
+        self.set_many({key: value}, ttl=ttl, tag_versions=tag_versions)
+        return value
+
+    def clear(self):
+        if self.backend is not None:
+            self.backend.clear()
+
+
+def create_backend(url: str) -> Optional[CacheBackend]:
+    if url.startswith("memory://"):
+        return InMemoryLRUBackend(max_entries=CACHE_MAX_ENTRIES)
+    if url.startswith(("redis://", "rediss://")):
+        return RedisBackend(url)
+    if url.startswith("none://"):
+        return None
+    raise ValueError(f"Unsupported CACHE_URL: {url}")
+
+
+cache = Cache(create_backend(CACHE_URL), default_ttl=CACHE_DEFAULT_TTL)
@@ -0,0 +1,164 @@
+import time
+
+import pytest
+
+from cache import Cache, CacheBackend, InMemoryLRUBackend
+
+
+def make_cache(max_entries: int = 100) -> Cache:
+    return Cache(InMemoryLRUBackend(max_entries=max_entries), default_ttl=60)
+
+
+def test_get_set_delete():
+    cache = make_cache()
+
+    cache.set_many({"a": 1, "b": 2})
+    cache.delete("b")
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get_many(["a", "b", "c"]) == {"a": 1}
+
+
+def test_entries_expire():
+    cache = make_cache()
+
+    cache.set("a", 1, ttl=0.01)
+    time.sleep(0.02)
+
+    assert cache.get("a") is None
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = make_cache(max_entries=2)
+
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get_many(["a", "b", "c"]) == {"a": 1, "c": 3}
+
+
+def test_invalidating_a_tag_drops_every_entry_carrying_it():
+    cache = make_cache()
+
+    cache.set("templates", [1], tags=["company:1"])
+    cache.set("workers", [2], tags=["company:1", "workers"])
+    cache.set("other", [3], tags=["company:2"])
+    cache.invalidate_tags("company:1")
+
+    assert cache.get_many(["templates", "workers", "other"]) == {"other": [3]}
+
+
+def test_get_or_set_loads_once():
+    cache = make_cache()
+    calls = []
+
+    def load():
+        calls.append(1)
+        return "value"
+
+    assert cache.get_or_set("key", load, tags=["t"]) == "value"
+    assert cache.get_or_set("key", load, tags=["t"]) == "value"
+    assert len(calls) == 1
+
+
+def test_invalidation_during_load_is_not_lost():
+    """A value loaded before a concurrent invalidation is stored as stale."""
+    cache = make_cache()
+
+    def load_then_invalidate():
+        cache.invalidate_tags("t")
+        return "old"
+
+    cache.get_or_set("key", load_then_invalidate, tags=["t"])
+
+    assert cache.get_or_set("key", lambda: "new", tags=["t"]) == "new"
+
+
+def test_disabled_cache_always_loads():
+    cache = Cache(None, default_ttl=60)
+
+    cache.set("a", 1)
+
+    assert cache.get("a") is None
+    assert cache.get_or_set("a", lambda: 2) == 2
+
+
+def test_company_templates_are_invalidated_on_write(session, company, shift_template):
+    from api.shift_template.schemas import EditShiftTemplateSchema
+    from api.shift_template.shift_template_service import (
+        edit_shift_template,
+        find_shift_templates_by_company_id,
+    )
+
+    assert [t.name for t in find_shift_templates_by_company_id(company.id, session)] == [
+        shift_template.name
+    ]
+
+    edit_shift_template(
+        shift_template, EditShiftTemplateSchema(name="Renamed"), session
+    )
+
+    assert [t.name for t in find_shift_templates_by_company_id(company.id, session)] == [
+        "Renamed"
+    ]
+
+
+def test_get_or_set_without_store_does_not_write_back():
+    cache = make_cache()
+
+    assert cache.get_or_set("a", lambda: 1, store=False) == 1
+    assert cache.get("a") is None
+
+    cache.set("a", 2)
+    assert cache.get_or_set("a", lambda: 3, store=False) == 2
+
+
+def test_replica_sessions_do_not_fill_company_caches(session, company, worker_user):
+    from api.users.user_service import find_workers_by_company_id
+    from cache import cache
+
+    session.info["replica"] = True
+    workers = find_workers_by_company_id(company.id, session)
+    assert [w.id for w in workers] == [worker_user.id]
+    assert cache.get(f"workers:company:{company.id}") is None
+
+    session.info["replica"] = False
+    find_workers_by_company_id(company.id, session)
+    assert cache.get(f"workers:company:{company.id}") is not None
+
+
+def test_cached_workers_leave_out_password_hashes(session, company, worker_user):
+    from api.users.user_service import find_workers_by_company_id
+    from cache import cache
+
+    workers = find_workers_by_company_id(company.id, session)
+
+    assert workers[0].password is None
+    assert all(
+        "password" not in row for row in cache.get(f"workers:company:{company.id}")
+    )
+
+
+def test_uncached_reads_see_rows_deleted_after_caching(session, company, worker_user):
+    from api.users.user_service import find_workers_by_company_id
+
+    assert len(find_workers_by_company_id(company.id, session)) == 1
+
+    # Deleted behind the cache's back, e.g. before another process invalidated it
+    session.delete(worker_user)
+    session.commit()
+
+    assert len(find_workers_by_company_id(company.id, session)) == 1
+    assert find_workers_by_company_id(company.id, session, cached=False) == []
+
+
+def test_incomplete_backend_fails_on_instantiation():
+    class ReadOnlyBackend(CacheBackend):
+        def get_many(self, keys):
+            return {}
+
+    with pytest.raises(TypeError):
+        ReadOnlyBackend()
@@ -3,19 +3,28 @@ import subprocess
 import time
 import socket
 import pytest
-from datetime import datetime, timezone
+from datetime import date, datetime, timezone
 from uuid import uuid4
 
 # Test database configuration - must be set BEFORE importing app
+# TEST_DB_BACKEND=sqlite runs against an in-memory SQLite database instead of
+# the dockerized Postgres, which turns the suite into a seconds-long loop.
+TEST_DB_BACKEND = os.getenv("TEST_DB_BACKEND", "postgres")
+USE_SQLITE = TEST_DB_BACKEND == "sqlite"
+
 TEST_DB_HOST = os.getenv("TEST_DB_HOST", "localhost")
 TEST_DB_PORT = os.getenv("TEST_DB_PORT", "5433")
 TEST_DB_USER = os.getenv("TEST_DB_USER", "postgres")
 TEST_DB_PASSWORD = os.getenv("TEST_DB_PASSWORD", "postgres")
 TEST_DB_NAME = os.getenv("TEST_DB_NAME", "postgres_db_test")
 
-TEST_DATABASE_URL = os.getenv(
-    "TEST_DATABASE_URL",
-    f"postgresql://{TEST_DB_USER}:{TEST_DB_PASSWORD}@{TEST_DB_HOST}:{TEST_DB_PORT}/{TEST_DB_NAME}",
+TEST_DATABASE_URL = (
+    "sqlite://"
+    if USE_SQLITE
+    else os.getenv(
+        "TEST_DATABASE_URL",
+        f"postgresql://{TEST_DB_USER}:{TEST_DB_PASSWORD}@{TEST_DB_HOST}:{TEST_DB_PORT}/{TEST_DB_NAME}",
+    )
 )
 
 # Set DATABASE_URL for the app before importing it
@@ -23,10 +32,15 @@ os.environ["DATABASE_URL"] = TEST_DATABASE_URL
 os.environ["JWT_SECRET_KEY"] = os.getenv("JWT_SECRET_KEY", "test-secret-key")
 
 from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.pool import StaticPool
 from sqlmodel import Session, SQLModel, create_engine
 
 from main import app
-from db.session import get_session
+from db.session import get_read_session, get_session
+from cache import cache
+from db.query_stats import install_query_hooks
+from db.partitions import ensure_worker_shift_partitions
 from db.models import (
     AssignmentSuggestionModel,
     CompanyModel,
@@ -36,6 +50,7 @@ from db.models import (
     WorkerShiftModel,
 )
 from api.auth.auth_service import create_access_token
+from api.worker_shifts.auto_assign import auto_assign_memo
 
 # Path to docker-compose.test.yml (relative to backend/)
 DOCKER_COMPOSE_FILE = os.path.join(
@@ -67,6 +82,10 @@ def wait_for_postgres(host: str, port: int, timeout: int = 30) -> bool:
 @pytest.fixture(scope="session", autouse=True)
 def postgres_container():
     """Start PostgreSQL container for tests, stop it after."""
+    if USE_SQLITE:
+        yield
+        return
+
     host = TEST_DB_HOST
     port = int(TEST_DB_PORT)
 
@@ -111,26 +130,57 @@ test_engine = None
 def get_test_engine():
     global test_engine
     if test_engine is None:
-        test_engine = create_engine(TEST_DATABASE_URL)
+        if USE_SQLITE:
+            test_engine = create_sqlite_test_engine()
+        else:
+            test_engine = create_engine(TEST_DATABASE_URL)
+        install_query_hooks(test_engine)
     return test_engine
 
 
+def create_sqlite_test_engine():
+    # One shared in-memory connection, visible to the TestClient's threadpool
+    engine = create_engine(
+        TEST_DATABASE_URL,
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+
+    # pysqlite's own transaction handling breaks SAVEPOINT, let SQLAlchemy
+    # emit BEGIN itself
+    @event.listens_for(engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def on_begin(connection):
+        connection.exec_driver_sql("BEGIN")
+
+    return engine
+
+
 @pytest.fixture(scope="session")
 def setup_test_database(postgres_container):
     """Create all tables before running tests, drop them after."""
     engine = get_test_engine()
     SQLModel.metadata.create_all(engine)
+    with engine.begin() as connection:
+        ensure_worker_shift_partitions(connection, start=date(2024, 1, 1))
     yield engine
     SQLModel.metadata.drop_all(engine)
 
 
 @pytest.fixture(name="session")
 def session_fixture(setup_test_database):
-    """Create a new database session for each test with transaction rollback."""
+    """Create a new database session for each test with transaction rollback.
+
+    Commits made by the code under test only release a savepoint, so the
+    outer transaction can be rolled back instead of truncating tables.
+    """
     engine = setup_test_database
     connection = engine.connect()
     transaction = connection.begin()
-    session = Session(bind=connection)
+    session = Session(bind=connection, join_transaction_mode="create_savepoint")
 
     yield session
 
@@ -139,6 +189,16 @@ def session_fixture(setup_test_database):
     connection.close()
 
 
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Cached rows would otherwise outlive the rolled back test transaction."""
+    cache.clear()
+    auto_assign_memo.clear()
+    yield
+    cache.clear()
+    auto_assign_memo.clear()
+
+
 @pytest.fixture(name="client")
 def client_fixture(session: Session):
     """Create a test client with the test database session."""
@@ -147,6 +207,7 @@ def client_fixture(session: Session):
         return session
 
     app.dependency_overrides[get_session] = get_session_override
+    app.dependency_overrides[get_read_session] = get_session_override
     client = TestClient(app)
     yield client
     app.dependency_overrides.clear()
@@ -1,3 +1,21 @@
-from decouple import config as decouple_config
+import os
+from decouple import Csv, config as decouple_config
 
 DATABASE_URL = decouple_config("DATABASE_URL")
+
+# Alembic scripts live next to src/ in the repo; containers that only ship src/
+# can point this elsewhere or leave it missing to skip the startup check.
+ALEMBIC_SCRIPT_LOCATION = decouple_config(
+    "ALEMBIC_SCRIPT_LOCATION",
+    default=os.path.join(
+        os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "alembic"
+    ),
+)
+
+# Comma-separated read replicas for read-only endpoints, empty reads the primary
+DATABASE_REPLICA_URLS = decouple_config("DATABASE_REPLICA_URLS", default="", cast=Csv())
+# Reads stay on the primary for this long after a client's last write, so
+# users see their own changes despite replication lag
+READ_YOUR_WRITES_SECONDS = decouple_config(
+    "READ_YOUR_WRITES_SECONDS", default=5.0, cast=float
+)
@@ -0,0 +1,59 @@
+from contextlib import contextmanager
+from uuid import UUID
+
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from sqlmodel import Session
+
+# Namespaces for two-key advisory locks, a separate keyspace from the
+# single bigint key used for partition DDL
+AUTO_ASSIGN_LOCK_NAMESPACE = 43
+
+# SQLSTATE raised when lock_timeout expires
+LOCK_NOT_AVAILABLE = "55P03"
+
+
+class LockTimeout(Exception):
+    """The advisory lock was not granted within the timeout."""
+
+
+def uuid_lock_key(value: UUID) -> int:
+    """Signed 32-bit key from a UUID, collisions only cost extra waiting."""
+    return int.from_bytes(UUID(str(value)).bytes[:4], "big", signed=True)
+
+
+@contextmanager
+def advisory_xact_lock(session: Session, namespace: int, key: int, timeout: float):
+    """Holds a Postgres transaction-level advisory lock for the block.
+
+    The lock is taken on the session's own connection, so waiting for it
+    never needs a second pooled connection. It is released with the
+    transaction, so the block commits at most once, as its last write; the
+    session is committed on exit anyway (rolled back on error). Raises
+    `LockTimeout` after waiting `timeout` seconds. Elsewhere only the commit
+    on exit remains.
+    """
+    if session.get_bind().dialect.name == "postgresql":
+        params = {"namespace": namespace, "key": key}
+        session.exec(
+            text(f"SET LOCAL lock_timeout = '{max(int(timeout * 1000), 1)}ms'")
+        )
+        try:
+            session.exec(
+                text("SELECT pg_advisory_xact_lock(:namespace, :key)"), params=params
+            )
+        except OperationalError as e:
+            session.rollback()
+            # psycopg 3 names it sqlstate, psycopg2 pgcode
+            code = getattr(e.orig, "sqlstate", None) or getattr(e.orig, "pgcode", None)
+            if code == LOCK_NOT_AVAILABLE:
+                raise LockTimeout(f"advisory lock ({namespace}, {key})") from e
+            raise
+        session.exec(text("SET LOCAL lock_timeout = DEFAULT"))
+
+    try:
+        yield
+    except BaseException:
+        session.rollback()
+        raise
+    session.commit()
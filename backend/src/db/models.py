@@ -1,9 +1,10 @@
-from datetime import datetime, timezone
+from datetime import date, datetime, timezone
 from typing import List, Optional
 from uuid import UUID, uuid4
 from sqlmodel import Field, Relationship, SQLModel
 from enum import Enum
-from sqlalchemy import Column, ARRAY, Integer, DateTime
+from sqlalchemy import Column, ARRAY, Index, Integer, DateTime, JSON
+from sqlalchemy.dialects.postgresql import JSONB
 
 
 class UserRole(str, Enum):
@@ -35,6 +36,8 @@ class CompanyModel(SQLModel, table=True):
 
     id: UUID = Field(default_factory=uuid4, primary_key=True)
     name: str
+    # Bumped by template and worker edits, older week snapshots are stale
+    week_snapshots_version: int = Field(default=0)
 
     # Relationship to users
     users: List[UserModel] = Relationship(back_populates="company")
@@ -51,13 +54,20 @@ class CompanyModel(SQLModel, table=True):
 
 class WorkerShiftModel(SQLModel, table=True):
     __tablename__ = "worker_shifts"
+    # Range partitioned by month on Postgres (see db/partitions.py), which
+    # requires the partition key to be part of the primary key
+    __table_args__ = (
+        Index("ix_worker_shifts_company_id_start_date", "company_id", "start_date"),
+        Index("ix_worker_shifts_worker_id_start_date", "worker_id", "start_date"),
+        {"postgresql_partition_by": "RANGE (start_date)"},
+    )
 
     id: UUID = Field(default_factory=uuid4, primary_key=True)
     worker_id: UUID = Field(foreign_key="users.id", ondelete="CASCADE")
     company_id: UUID = Field(foreign_key="companies.id")
     start_date: datetime = Field(
         default_factory=lambda: datetime.now(timezone.utc),
-        sa_column=Column(DateTime(timezone=True)),
+        sa_column=Column(DateTime(timezone=True), primary_key=True),
     )
     end_date: datetime = Field(
         default_factory=lambda: datetime.now(timezone.utc),
@@ -70,16 +80,25 @@ class WorkerShiftModel(SQLModel, table=True):
 
 class ShiftTemplateModel(SQLModel, table=True):
     __tablename__ = "shift_templates"
+    __table_args__ = (
+        # Serves the weekday overlap (`days && ARRAY[...]`) filter of auto-assign
+        Index("ix_shift_templates_days", "days", postgresql_using="gin"),
+    )
 
     id: UUID = Field(default_factory=uuid4, primary_key=True)
     company_id: UUID = Field(foreign_key="companies.id")
     name: str
     position: str
+    # "HH:MM", zero padded so times compare as strings
     startTime: str
     endTime: str
-    days: Optional[list[int]] = Field(sa_column=Column(ARRAY(Integer)), default=None)
-    startDate: Optional[str] = Field(default=None)
-    endDate: Optional[str] = Field(default=None)
+    # JSON on SQLite so the schema can be created for smoke runs and tests
+    days: Optional[list[int]] = Field(
+        sa_column=Column(ARRAY(Integer).with_variant(JSON(), "sqlite")), default=None
+    )
+    # Inclusive validity window, open ended when unset
+    startDate: Optional[date] = Field(default=None)
+    endDate: Optional[date] = Field(default=None)
     created_at: datetime = Field(
         default_factory=lambda: datetime.now(timezone.utc),
         sa_column=Column(DateTime(timezone=True)),
@@ -134,3 +153,81 @@ class AssignmentSuggestionModel(SQLModel, table=True):
         default_factory=lambda: datetime.now(timezone.utc),
         sa_column=Column(DateTime(timezone=True)),
     )
+
+
+class CompanyWeekSnapshotModel(SQLModel, table=True):
+    """Materialized week grid served by `/worker-shifts/week/{iso_week}`."""
+
+    __tablename__ = "company_week_snapshots"
+
+    company_id: UUID = Field(
+        foreign_key="companies.id", ondelete="CASCADE", primary_key=True
+    )
+    # ISO week, e.g. "2025-W02"
+    iso_week: str = Field(primary_key=True)
+    payload: dict = Field(
+        sa_column=Column(JSON().with_variant(JSONB(), "postgresql"), nullable=False)
+    )
+    # `CompanyModel.week_snapshots_version` the payload was built at
+    version: int = Field(default=0)
+    updated_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc),
+        sa_column=Column(DateTime(timezone=True)),
+    )
+
+
+class JobStatus(str, Enum):
+    QUEUED = "QUEUED"
+    RUNNING = "RUNNING"
+    SUCCEEDED = "SUCCEEDED"
+    FAILED = "FAILED"
+
+
+class JobModel(SQLModel, table=True):
+    """Background job, claimed by `jobs.worker` with FOR UPDATE SKIP LOCKED."""
+
+    __tablename__ = "jobs"
+    __table_args__ = (
+        Index("ix_jobs_status_priority_run_after", "status", "priority", "run_after"),
+    )
+
+    id: UUID = Field(default_factory=uuid4, primary_key=True)
+    kind: str
+    company_id: Optional[UUID] = Field(
+        default=None, foreign_key="companies.id", ondelete="CASCADE"
+    )
+    created_by: Optional[UUID] = Field(
+        default=None, foreign_key="users.id", ondelete="SET NULL"
+    )
+    status: JobStatus = Field(default=JobStatus.QUEUED)
+    # Higher runs first
+    priority: int = Field(default=0)
+    payload: dict = Field(
+        default_factory=dict,
+        sa_column=Column(JSON().with_variant(JSONB(), "postgresql"), nullable=False),
+    )
+    result: Optional[dict] = Field(
+        default=None, sa_column=Column(JSON().with_variant(JSONB(), "postgresql"))
+    )
+    error: Optional[str] = Field(default=None)
+    progress: float = Field(default=0.0)
+    attempts: int = Field(default=0)
+    max_attempts: int = Field(default=3)
+    run_after: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc),
+        sa_column=Column(DateTime(timezone=True), nullable=False),
+    )
+    created_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc),
+        sa_column=Column(DateTime(timezone=True)),
+    )
+    started_at: Optional[datetime] = Field(
+        default=None, sa_column=Column(DateTime(timezone=True))
+    )
+    # Extended by the running worker's heartbeat, claimable again once past
+    lease_expires_at: Optional[datetime] = Field(
+        default=None, sa_column=Column(DateTime(timezone=True))
+    )
+    finished_at: Optional[datetime] = Field(
+        default=None, sa_column=Column(DateTime(timezone=True))
+    )
@@ -0,0 +1,148 @@
+"""Monthly range partitions for `worker_shifts`.
+
+Every hot shift query filters by `start_date`, so Postgres only scans the
+partitions overlapping the requested range. Partitions are created ahead of
+time on startup (and by `python -m db.partitions` from cron); rows outside
+any monthly partition land in `worker_shifts_default` and are moved into
+their partition once it is created.
+"""
+
+from datetime import date, datetime, timezone
+from typing import Optional
+
+from decouple import config
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+WORKER_SHIFTS_TABLE = "worker_shifts"
+DEFAULT_PARTITION = f"{WORKER_SHIFTS_TABLE}_default"
+PARTITION_MONTHS_AHEAD = config(
+    "WORKER_SHIFT_PARTITION_MONTHS_AHEAD", default=12, cast=int
+)
+# Serializes partition DDL between workers booting at the same time
+PARTITION_LOCK_KEY = 7_340_034
+
+
+def month_start(value: date) -> date:
+    return date(value.year, value.month, 1)
+
+
+def add_months(value: date, months: int) -> date:
+    month_index = value.year * 12 + value.month - 1 + months
+    return date(month_index // 12, month_index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"{WORKER_SHIFTS_TABLE}_y{month.year}m{month.month:02d}"
+
+
+def bound(month: date) -> str:
+    return f"{month.isoformat()} 00:00:00+00"
+
+
+def get_existing_partitions(connection: Connection) -> set[str]:
+    rows = connection.execute(
+        text(
+            "SELECT child.relname FROM pg_inherits "
+            "JOIN pg_class parent ON pg_inherits.inhparent = parent.oid "
+            "JOIN pg_class child ON pg_inherits.inhrelid = child.oid "
+            "WHERE parent.relname = :table"
+        ),
+        {"table": WORKER_SHIFTS_TABLE},
+    )
+    return {row[0] for row in rows}
+
+
+def create_month_partition(connection: Connection, month: date):
+    name = partition_name(month)
+    lower, upper = bound(month), bound(add_months(month, 1))
+
+    has_default_rows = connection.execute(
+        text(
+            f"SELECT EXISTS (SELECT 1 FROM {DEFAULT_PARTITION} "
+            "WHERE start_date >= CAST(:lower AS timestamptz) "
+            "AND start_date < CAST(:upper AS timestamptz))"
+        ),
+        {"lower": lower, "upper": upper},
+    ).scalar()
+
+    if not has_default_rows:
+        connection.execute(
+            text(
+                f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF "
+                f"{WORKER_SHIFTS_TABLE} FOR VALUES FROM ('{lower}') TO ('{upper}')"
+            )
+        )
+        return
+
+    # Postgres refuses to add a partition whose range has rows in the default
+    # partition, so detach it, move the rows over and attach it back
+    connection.execute(
+        text(f"ALTER TABLE {WORKER_SHIFTS_TABLE} DETACH PARTITION {DEFAULT_PARTITION}")
+    )
+    connection.execute(
+        text(
+            f"CREATE TABLE {name} PARTITION OF {WORKER_SHIFTS_TABLE} "
+            f"FOR VALUES FROM ('{lower}') TO ('{upper}')"
+        )
+    )
+    connection.execute(
+        text(
+            f"WITH moved AS (DELETE FROM {DEFAULT_PARTITION} "
+            "WHERE start_date >= CAST(:lower AS timestamptz) "
+            "AND start_date < CAST(:upper AS timestamptz) RETURNING *) "
+            f"INSERT INTO {WORKER_SHIFTS_TABLE} SELECT * FROM moved"
+        ),
+        {"lower": lower, "upper": upper},
+    )
+    connection.execute(
+        text(
+            f"ALTER TABLE {WORKER_SHIFTS_TABLE} "
+            f"ATTACH PARTITION {DEFAULT_PARTITION} DEFAULT"
+        )
+    )
+
+
+def ensure_worker_shift_partitions(
+    connection: Connection,
+    start: Optional[date] = None,
+    months_ahead: int = PARTITION_MONTHS_AHEAD,
+) -> list[str]:
+    """Create the default partition and monthly partitions from `start`
+    (current month by default) to `months_ahead` months from now.
+
+    Returns the names of the partitions created. No-op on other databases.
+    """
+    if connection.dialect.name != "postgresql":
+        return []
+
+    connection.execute(
+        text("SELECT pg_advisory_xact_lock(:key)"), {"key": PARTITION_LOCK_KEY}
+    )
+    connection.execute(
+        text(
+            f"CREATE TABLE IF NOT EXISTS {DEFAULT_PARTITION} "
+            f"PARTITION OF {WORKER_SHIFTS_TABLE} DEFAULT"
+        )
+    )
+
+    current_month = month_start(datetime.now(timezone.utc).date())
+    month = month_start(start) if start else current_month
+    last_month = add_months(current_month, months_ahead)
+    existing = get_existing_partitions(connection)
+
+    created = []
+    while month <= last_month:
+        if partition_name(month) not in existing:
+            create_month_partition(connection, month)
+            created.append(partition_name(month))
+        month = add_months(month, 1)
+    return created
+
+
+if __name__ == "__main__":
+    from db.session import engine
+
+    with engine.begin() as connection:
+        created = ensure_worker_shift_partitions(connection)
+    print(f"created partitions: {', '.join(created) or 'none'}")
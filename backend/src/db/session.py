@@ -1,16 +1,108 @@
-from sqlmodel import SQLModel, create_engine, Session
-from .config import DATABASE_URL
+import itertools
+import os
+import time
+from fastapi import Request
+from sqlmodel import create_engine, Session
+from .config import (
+    ALEMBIC_SCRIPT_LOCATION,
+    DATABASE_REPLICA_URLS,
+    DATABASE_URL,
+    READ_YOUR_WRITES_SECONDS,
+)
+from .query_stats import install_query_hooks
+from metrics import install_pool_metrics
 
 if not DATABASE_URL:
     raise Exception("DATABASE_URL is not set")
 
-engine = create_engine(DATABASE_URL)
+# Set on responses to writes, holds the epoch second of the client's last write
+LAST_WRITE_COOKIE = "last_write_at"
 
 
-def init_db():
-    SQLModel.metadata.create_all(engine)
+def create_app_engine(url: str, name: str):
+    # SQLite (smoke runs only) needs cross-thread access for the threadpool
+    connect_args = {"check_same_thread": False} if url.startswith("sqlite") else {}
+    new_engine = create_engine(url, connect_args=connect_args)
+    install_query_hooks(new_engine)
+    install_pool_metrics(new_engine, name)
+    return new_engine
+
+
+engine = create_app_engine(DATABASE_URL, "primary")
+replica_engines = [
+    create_app_engine(url, f"replica-{i}")
+    for i, url in enumerate(DATABASE_REPLICA_URLS)
+]
+_next_replica = itertools.cycle(replica_engines)
+
+
+def check_db_revision():
+    """Fail fast when the database is not migrated to the latest Alembic head.
+
+    Replaces running `create_all` on every boot: reading the single
+    `alembic_version` row is much cheaper than reflecting every table.
+    """
+    if not os.path.isdir(ALEMBIC_SCRIPT_LOCATION):
+        print(
+            f"[check_db_revision] {ALEMBIC_SCRIPT_LOCATION} not found, skipping check"
+        )
+        return
+
+    from alembic.runtime.migration import MigrationContext
+    from alembic.script import ScriptDirectory
+
+    heads = set(ScriptDirectory(ALEMBIC_SCRIPT_LOCATION).get_heads())
+
+    with engine.connect() as connection:
+        current = set(MigrationContext.configure(connection).get_current_heads())
+
+    if current != heads:
+        raise Exception(
+            f"Database revision {sorted(current)} does not match migration head "
+            f"{sorted(heads)}, run `alembic upgrade head`"
+        )
+
+
+def ensure_partitions():
+    from .partitions import ensure_worker_shift_partitions
+
+    with engine.begin() as connection:
+        created = ensure_worker_shift_partitions(connection)
+    if created:
+        print(f"[ensure_partitions] created {', '.join(created)}")
 
 
 def get_session():
     with Session(engine) as session:
         yield session
+
+
+def wrote_recently(request: Request) -> bool:
+    try:
+        last_write = float(request.cookies.get(LAST_WRITE_COOKIE, 0))
+    except ValueError:
+        return False
+    return time.time() - last_write < READ_YOUR_WRITES_SECONDS
+
+
+def pick_read_engine(request: Request):
+    if not replica_engines or wrote_recently(request):
+        return engine
+    return next(_next_replica)
+
+
+def get_read_session(request: Request):
+    """Session for read-only endpoints, served by a replica when configured.
+
+    Clients that wrote within READ_YOUR_WRITES_SECONDS (see
+    `ReadYourWritesMiddleware`) keep reading from the primary.
+    """
+    read_engine = pick_read_engine(request)
+    with Session(read_engine) as session:
+        session.info["replica"] = read_engine is not engine
+        yield session
+
+
+def is_replica_session(session: Session) -> bool:
+    """True for `get_read_session` sessions served by a replica, which may lag."""
+    return session.info.get("replica", False)
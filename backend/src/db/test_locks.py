@@ -0,0 +1,27 @@
+import pytest
+from sqlmodel import Session
+
+from db.locks import LockTimeout, advisory_xact_lock, uuid_lock_key
+
+
+def test_uuid_lock_key_fits_in_int4():
+    key = uuid_lock_key("ffffffff-0000-0000-0000-000000000000")
+    assert key == -1
+    assert -(2**31) <= uuid_lock_key("7fffffff-0000-0000-0000-000000000000") < 2**31
+
+
+def test_waiting_for_a_held_lock_times_out(session: Session):
+    if session.get_bind().dialect.name != "postgresql":
+        pytest.skip("advisory locks are Postgres only")
+    # Separate connections, the test session's connection would re-enter the lock
+    engine = session.get_bind().engine
+
+    with Session(engine) as holder, advisory_xact_lock(holder, 1, 2, timeout=5):
+        with Session(engine) as other:
+            with pytest.raises(LockTimeout):
+                with advisory_xact_lock(other, 1, 2, timeout=0.05):
+                    pass
+
+    # Released with the holder's transaction
+    with Session(engine) as other, advisory_xact_lock(other, 1, 2, timeout=0.05):
+        pass
@@ -0,0 +1,20 @@
+from prometheus_client import multiprocess
+
+from realtime.pubsub import EVENTS_URL
+
+
+def child_exit(server, worker):
+    # Drop the exited worker's live gauges from the shared metrics directory
+    multiprocess.mark_process_dead(worker.pid)
+
+
+def when_ready(server):
+    # The in-memory broker only reaches subscribers of the publishing worker
+    if server.cfg.workers > 1 and EVENTS_URL.startswith("memory://"):
+        server.log.warning(
+            "EVENTS_URL=%s with %d workers: realtime events only reach clients "
+            "connected to the worker that published them, set EVENTS_URL to a "
+            "shared broker (redis://...)",
+            EVENTS_URL,
+            server.cfg.workers,
+        )
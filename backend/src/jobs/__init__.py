@@ -0,0 +1,25 @@
+from .queue import (
+    HANDLERS,
+    PermanentJobError,
+    claim_next_job,
+    complete_job,
+    enqueue_job,
+    fail_job,
+    get_job,
+    job_handler,
+    renew_job_lease,
+    set_job_progress,
+)
+
+__all__ = [
+    "HANDLERS",
+    "PermanentJobError",
+    "claim_next_job",
+    "complete_job",
+    "enqueue_job",
+    "fail_job",
+    "get_job",
+    "job_handler",
+    "renew_job_lease",
+    "set_job_progress",
+]
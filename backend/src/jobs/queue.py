@@ -0,0 +1,206 @@
+"""Postgres backed job queue.
+
+Jobs are rows in `jobs`. Workers claim the most urgent runnable row with
+`FOR UPDATE SKIP LOCKED`, so any number of them can poll the table without
+blocking on each other, then run the handler registered for the job's kind
+outside of the claiming transaction. A claim is a lease the worker keeps
+extending while the handler runs (`renew_job_lease`, also on progress); a
+job whose lease ran out lost its worker and is claimed again, as long as
+it has attempts left.
+"""
+
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Optional
+from uuid import UUID
+
+from decouple import config
+from sqlalchemy import or_, update
+from sqlmodel import Session, select
+
+from db.models import JobModel, JobStatus
+
+logger = logging.getLogger(__name__)
+
+JOB_MAX_ATTEMPTS = config("JOB_MAX_ATTEMPTS", default=3, cast=int)
+# Retry n waits JOB_RETRY_BACKOFF_SECONDS * 2 ** (n - 1)
+JOB_RETRY_BACKOFF_SECONDS = config("JOB_RETRY_BACKOFF_SECONDS", default=10.0, cast=float)
+# A RUNNING job whose lease was not renewed for this long is assumed to have
+# lost its worker and becomes claimable again
+JOB_LEASE_SECONDS = config("JOB_LEASE_SECONDS", default=600.0, cast=float)
+
+# handler(payload, session, progress) -> JSON-serializable result
+JobHandler = Callable[[dict, Session, Callable[[float], None]], Optional[dict]]
+HANDLERS: dict[str, JobHandler] = {}
+
+
+class PermanentJobError(Exception):
+    """Raised by handlers for failures a retry can't fix, fails the job at once."""
+
+
+def job_handler(kind: str):
+    """Registers the decorated function as the handler for `kind` jobs."""
+
+    def register(handler: JobHandler) -> JobHandler:
+        HANDLERS[kind] = handler
+        return handler
+
+    return register
+
+
+def enqueue_job(
+    kind: str,
+    payload: dict,
+    session: Session,
+    company_id: Optional[UUID] = None,
+    created_by: Optional[UUID] = None,
+    priority: int = 0,
+    max_attempts: int = JOB_MAX_ATTEMPTS,
+) -> JobModel:
+    if kind not in HANDLERS:
+        raise ValueError(f"No handler registered for job kind {kind!r}")
+    job = JobModel(
+        kind=kind,
+        payload=payload,
+        company_id=company_id,
+        created_by=created_by,
+        priority=priority,
+        max_attempts=max_attempts,
+    )
+    session.add(job)
+    session.commit()
+    session.refresh(job)
+    return job
+
+
+def get_job(job_id: UUID, session: Session) -> Optional[JobModel]:
+    return session.get(JobModel, job_id)
+
+
+def claim_next_job(session: Session) -> Optional[JobModel]:
+    """Marks the most urgent runnable job RUNNING and returns it, or None.
+
+    Jobs whose lease ran out on their last attempt are marked FAILED on the
+    way instead of being run once more.
+    """
+    while True:
+        now = datetime.now(timezone.utc)
+        job = session.exec(
+            select(JobModel)
+            .where(
+                or_(
+                    (JobModel.status == JobStatus.QUEUED)
+                    & (JobModel.run_after <= now),
+                    (JobModel.status == JobStatus.RUNNING)
+                    & (JobModel.lease_expires_at < now),
+                )
+            )
+            .order_by(JobModel.priority.desc(), JobModel.run_after, JobModel.created_at)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+        ).first()
+        if job is None:
+            session.rollback()
+            return None
+
+        if job.status == JobStatus.RUNNING and job.attempts >= job.max_attempts:
+            job.status = JobStatus.FAILED
+            job.error = f"Lease expired on attempt {job.attempts} of {job.max_attempts}"
+            job.finished_at = now
+            session.commit()
+            continue
+
+        job.status = JobStatus.RUNNING
+        job.attempts += 1
+        job.started_at = now
+        job.lease_expires_at = now + timedelta(seconds=JOB_LEASE_SECONDS)
+        job.progress = 0.0
+        session.commit()
+        session.refresh(job)
+        return job
+
+
+def claimed_attempt(job_id: UUID, attempt: int) -> tuple:
+    """Filters matching the job only while the claim of `attempt` still holds.
+
+    A worker whose lease ran out may still be running after the job was
+    claimed again; its writes must not touch the new attempt's row.
+    """
+    return (
+        JobModel.id == job_id,
+        JobModel.status == JobStatus.RUNNING,
+        JobModel.attempts == attempt,
+    )
+
+
+def renew_job_lease(job_id: UUID, attempt: int, session: Session, **values) -> bool:
+    """Extends the lease of the claimed attempt by JOB_LEASE_SECONDS from now."""
+    lease_expires_at = datetime.now(timezone.utc) + timedelta(seconds=JOB_LEASE_SECONDS)
+    result = session.exec(
+        update(JobModel)
+        .where(*claimed_attempt(job_id, attempt))
+        .values(lease_expires_at=lease_expires_at, **values)
+    )
+    session.commit()
+    return result.rowcount > 0
+
+
+def set_job_progress(job_id: UUID, attempt: int, progress: float, session: Session):
+    """Records progress, which also renews the lease."""
+    renew_job_lease(job_id, attempt, session, progress=min(max(progress, 0.0), 1.0))
+
+
+def complete_job(
+    job_id: UUID, attempt: int, result: Optional[dict], session: Session
+) -> bool:
+    """Marks the claimed attempt SUCCEEDED, False when the claim was lost."""
+    updated = session.exec(
+        update(JobModel)
+        .where(*claimed_attempt(job_id, attempt))
+        .values(
+            status=JobStatus.SUCCEEDED,
+            result=result,
+            error=None,
+            progress=1.0,
+            finished_at=datetime.now(timezone.utc),
+            lease_expires_at=None,
+        )
+    )
+    session.commit()
+    if not updated.rowcount:
+        logger.warning(
+            "Job %s lost its claim of attempt %s, result dropped", job_id, attempt
+        )
+    return updated.rowcount > 0
+
+
+def fail_job(
+    job_id: UUID, attempt: int, error: str, session: Session, retry: bool = True
+) -> bool:
+    """Requeues the claimed attempt with exponential backoff, FAILED once out
+    of attempts or right away when `retry` is False. False when the claim
+    was lost."""
+    job = session.exec(
+        select(JobModel).where(*claimed_attempt(job_id, attempt)).with_for_update()
+    ).first()
+    if job is None:
+        session.rollback()
+        logger.warning(
+            "Job %s lost its claim of attempt %s, error dropped", job_id, attempt
+        )
+        return False
+
+    job.error = error
+    job.lease_expires_at = None
+    now = datetime.now(timezone.utc)
+    if retry and job.attempts < job.max_attempts:
+        job.status = JobStatus.QUEUED
+        job.run_after = now + timedelta(
+            seconds=JOB_RETRY_BACKOFF_SECONDS * 2 ** (job.attempts - 1)
+        )
+    else:
+        job.status = JobStatus.FAILED
+        job.finished_at = now
+    session.add(job)
+    session.commit()
+    return True
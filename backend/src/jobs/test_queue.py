@@ -0,0 +1,238 @@
+from contextlib import nullcontext
+from datetime import datetime, timedelta, timezone
+
+from fastapi.testclient import TestClient
+from sqlmodel import Session, select
+
+from db.models import (
+    AssignmentSuggestionModel,
+    JobModel,
+    JobStatus,
+    ShiftTemplateModel,
+    UserModel,
+)
+from api.worker_shifts.week_snapshots import to_utc
+from jobs import (
+    HANDLERS,
+    PermanentJobError,
+    claim_next_job,
+    complete_job,
+    enqueue_job,
+    fail_job,
+    job_handler,
+    renew_job_lease,
+    set_job_progress,
+)
+from jobs.worker import run_next_job
+
+
+def session_factory(session: Session):
+    return lambda: nullcontext(session)
+
+
+def test_background_auto_assign_runs_in_worker(
+    client: TestClient,
+    session: Session,
+    admin_token: str,
+    shift_template: ShiftTemplateModel,
+    worker_users: list[UserModel],
+):
+    response = client.post(
+        "/worker-shifts/auto-assign",
+        json={
+            "range_start": "2025-01-06T00:00:00Z",
+            "range_end": "2025-01-10T23:59:59Z",
+            "overwrite_shifts": False,
+            "background": True,
+        },
+        cookies={"access_token": admin_token},
+    )
+
+    assert response.status_code == 202
+    job_id = response.json()["job_id"]
+    assert session.exec(select(AssignmentSuggestionModel)).all() == []
+
+    status = client.get(f"/jobs/{job_id}", cookies={"access_token": admin_token})
+    assert status.json()["status"] == "QUEUED"
+
+    assert str(run_next_job(session_factory(session))) == job_id
+    assert run_next_job(session_factory(session)) is None
+
+    status = client.get(f"/jobs/{job_id}", cookies={"access_token": admin_token})
+    body = status.json()
+    assert body["status"] == "SUCCEEDED"
+    assert body["progress"] == 1.0
+    assert body["result"]["count"] == 5
+    assert len(session.exec(select(AssignmentSuggestionModel)).all()) == 5
+
+
+def test_job_status_is_scoped_to_company(
+    client: TestClient, session: Session, worker_token: str, admin_user: UserModel
+):
+    job = enqueue_job(
+        "auto_assign",
+        {},
+        session,
+        company_id=admin_user.company_id,
+        created_by=admin_user.id,
+    )
+
+    response = client.get(f"/jobs/{job.id}", cookies={"access_token": worker_token})
+
+    assert response.status_code == 404
+
+
+def test_failed_jobs_retry_then_fail(session: Session, company):
+    attempts = []
+
+    @job_handler("test_flaky")
+    def flaky(payload, session, progress):
+        attempts.append(payload)
+        raise RuntimeError("boom")
+
+    try:
+        job = enqueue_job("test_flaky", {"n": 1}, session, max_attempts=2)
+        run_next_job(session_factory(session))
+        session.refresh(job)
+        assert job.status == JobStatus.QUEUED
+        assert job.error == "RuntimeError: boom"
+        # Backing off, not claimable yet
+        assert claim_next_job(session) is None
+
+        job.run_after = job.created_at
+        session.add(job)
+        session.commit()
+        run_next_job(session_factory(session))
+        session.refresh(job)
+        assert job.status == JobStatus.FAILED
+        assert job.attempts == 2
+        assert len(attempts) == 2
+    finally:
+        HANDLERS.pop("test_flaky")
+
+
+def test_claim_prefers_higher_priority(session: Session):
+    @job_handler("test_noop")
+    def noop(payload, session, progress):
+        return None
+
+    try:
+        low = enqueue_job("test_noop", {}, session)
+        high = enqueue_job("test_noop", {}, session, priority=10)
+
+        assert claim_next_job(session).id == high.id
+        assert claim_next_job(session).id == low.id
+        assert claim_next_job(session) is None
+        assert session.get(JobModel, low.id).attempts == 1
+    finally:
+        HANDLERS.pop("test_noop")
+
+
+def test_progress_renews_the_lease(session: Session):
+    @job_handler("test_noop")
+    def noop(payload, session, progress):
+        return None
+
+    try:
+        job = enqueue_job("test_noop", {}, session)
+        claimed = claim_next_job(session)
+        claimed.lease_expires_at = claimed.started_at
+        session.add(claimed)
+        session.commit()
+
+        set_job_progress(job.id, claimed.attempts, 0.5, session)
+        session.refresh(claimed)
+        assert to_utc(claimed.lease_expires_at) > datetime.now(timezone.utc)
+        assert claimed.progress == 0.5
+        assert claim_next_job(session) is None
+    finally:
+        HANDLERS.pop("test_noop")
+
+
+def test_expired_lease_is_reclaimed_only_with_attempts_left(session: Session):
+    @job_handler("test_noop")
+    def noop(payload, session, progress):
+        return None
+
+    try:
+        job = enqueue_job("test_noop", {}, session, max_attempts=2)
+        for attempt in (1, 2):
+            claimed = claim_next_job(session)
+            assert (claimed.id, claimed.attempts) == (job.id, attempt)
+            # The worker died without renewing
+            claimed.lease_expires_at = claimed.started_at - timedelta(seconds=1)
+            session.add(claimed)
+            session.commit()
+
+        assert claim_next_job(session) is None
+        session.refresh(job)
+        assert job.status == JobStatus.FAILED
+        assert job.error == "Lease expired on attempt 2 of 2"
+    finally:
+        HANDLERS.pop("test_noop")
+
+
+def test_writes_of_a_lost_claim_are_dropped(session: Session):
+    @job_handler("test_noop")
+    def noop(payload, session, progress):
+        return None
+
+    try:
+        job = enqueue_job("test_noop", {}, session)
+        stale = claim_next_job(session)
+        # The first worker stalls past its lease, a second one claims the job
+        stale.lease_expires_at = stale.started_at - timedelta(seconds=1)
+        session.add(stale)
+        session.commit()
+        current = claim_next_job(session)
+        assert current.attempts == 2
+
+        assert not complete_job(job.id, 1, {"stale": True}, session)
+        assert not fail_job(job.id, 1, "RuntimeError: stale", session)
+        assert not renew_job_lease(job.id, 1, session)
+        session.refresh(job)
+        assert (job.status, job.result, job.error) == (JobStatus.RUNNING, None, None)
+
+        assert complete_job(job.id, 2, {"ok": True}, session)
+        session.refresh(job)
+        assert (job.status, job.result) == (JobStatus.SUCCEEDED, {"ok": True})
+    finally:
+        HANDLERS.pop("test_noop")
+
+
+def test_permanent_errors_are_not_retried(session: Session):
+    @job_handler("test_invalid")
+    def invalid(payload, session, progress):
+        raise PermanentJobError("not enough users")
+
+    try:
+        job = enqueue_job("test_invalid", {}, session, max_attempts=3)
+        run_next_job(session_factory(session))
+        session.refresh(job)
+        assert job.status == JobStatus.FAILED
+        assert job.attempts == 1
+        assert job.error == "PermanentJobError: not enough users"
+    finally:
+        HANDLERS.pop("test_invalid")
+
+
+def test_auto_assign_without_workers_fails_at_once(
+    session: Session, admin_user: UserModel, shift_template: ShiftTemplateModel
+):
+    job = enqueue_job(
+        "auto_assign",
+        {
+            "company_id": str(admin_user.company_id),
+            "range_start": "2025-01-06T00:00:00Z",
+            "range_end": "2025-01-10T23:59:59Z",
+            "overwrite_shifts": False,
+        },
+        session,
+        company_id=admin_user.company_id,
+    )
+
+    run_next_job(session_factory(session))
+
+    session.refresh(job)
+    assert job.status == JobStatus.FAILED
+    assert job.attempts == 1
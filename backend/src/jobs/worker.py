@@ -0,0 +1,115 @@
+"""Job worker process: `python -m jobs.worker` from `src/`.
+
+Run as many as needed, they coordinate through row locks only.
+"""
+
+import logging
+import threading
+import time
+from contextlib import AbstractContextManager
+from typing import Callable, Optional
+from uuid import UUID
+
+from decouple import config
+from sqlmodel import Session
+
+from .queue import (
+    HANDLERS,
+    JOB_LEASE_SECONDS,
+    PermanentJobError,
+    claim_next_job,
+    complete_job,
+    fail_job,
+    renew_job_lease,
+    set_job_progress,
+)
+
+logger = logging.getLogger(__name__)
+
+JOB_POLL_INTERVAL_SECONDS = config("JOB_POLL_INTERVAL_SECONDS", default=1.0, cast=float)
+
+SessionFactory = Callable[[], AbstractContextManager[Session]]
+
+
+def default_session_factory() -> Session:
+    from db.session import engine
+
+    return Session(engine)
+
+
+def load_handlers():
+    # Handlers register themselves on import
+    import api.worker_shifts.auto_assign  # noqa: F401
+
+
+def heartbeat(
+    job_id: UUID, attempt: int, session_factory: SessionFactory, stop: threading.Event
+):
+    """Renews the job's lease a few times per lease period until `stop` is set."""
+    while not stop.wait(JOB_LEASE_SECONDS / 3):
+        try:
+            with session_factory() as session:
+                renew_job_lease(job_id, attempt, session)
+        except Exception:
+            logger.exception("Could not renew the lease of job %s", job_id)
+
+
+def run_next_job(session_factory: SessionFactory = default_session_factory) -> Optional[UUID]:
+    """Claims and runs one job, returns its id or None when the queue is idle.
+
+    Progress and lease renewals are written through their own sessions so
+    they are visible while the handler's transaction is still open.
+    `PermanentJobError`s and unknown kinds fail the job without retrying.
+    Every write is tied to the claimed attempt, so a worker whose lease ran
+    out never overwrites the run that claimed the job after it.
+    """
+    with session_factory() as session:
+        job = claim_next_job(session)
+        if job is None:
+            return None
+        job_id, attempt, kind, payload = job.id, job.attempts, job.kind, job.payload
+
+    def progress(value: float):
+        with session_factory() as progress_session:
+            set_job_progress(job_id, attempt, value, progress_session)
+
+    stop = threading.Event()
+    threading.Thread(
+        target=heartbeat, args=(job_id, attempt, session_factory, stop), daemon=True
+    ).start()
+
+    with session_factory() as session:
+        try:
+            handler = HANDLERS.get(kind)
+            if handler is None:
+                raise PermanentJobError(f"No handler registered for job kind {kind!r}")
+            result = handler(payload, session, progress)
+        except Exception as e:
+            logger.exception("Job %s (%s) failed", job_id, kind)
+            session.rollback()
+            fail_job(
+                job_id,
+                attempt,
+                f"{type(e).__name__}: {e}",
+                session,
+                retry=not isinstance(e, PermanentJobError),
+            )
+        else:
+            complete_job(job_id, attempt, result, session)
+        finally:
+            # Renewals only touch RUNNING jobs, a late one is harmless
+            stop.set()
+    return job_id
+
+
+def run_worker(session_factory: SessionFactory = default_session_factory):
+    load_handlers()
+    logger.info("Job worker started, handlers: %s", ", ".join(sorted(HANDLERS)))
+    while True:
+        if run_next_job(session_factory) is None:
+            time.sleep(JOB_POLL_INTERVAL_SECONDS)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    run_worker()
@@ -1,19 +1,28 @@
 from contextlib import asynccontextmanager
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 import uvicorn
 from fastapi.middleware.cors import CORSMiddleware
 
-from db.session import init_db
+from db.session import check_db_revision, ensure_partitions
 from api.auth import router as auth_router
 from api.users import router as user_router
 from api.shift_template import router as shift_template_router
 from api.worker_shifts.router import router as worker_shift_router
 from api.leave import router as leave_router
+from api.events import router as events_router
+from api.jobs import router as jobs_router
+from api.middleware import (
+    MetricsMiddleware,
+    QueryStatsMiddleware,
+    ReadYourWritesMiddleware,
+)
+from metrics import render_metrics
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    init_db()
+    check_db_revision()
+    ensure_partitions()
     yield
 
 
@@ -31,12 +40,17 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(ReadYourWritesMiddleware)
+app.add_middleware(QueryStatsMiddleware)
+app.add_middleware(MetricsMiddleware)
 
 app.include_router(auth_router, prefix="/auth")
 app.include_router(user_router, prefix="/users")
 app.include_router(shift_template_router, prefix="/shift-templates")
 app.include_router(worker_shift_router, prefix="/worker-shifts")
 app.include_router(leave_router, prefix="/leaves")
+app.include_router(events_router, prefix="/events")
+app.include_router(jobs_router, prefix="/jobs")
 
 
 @app.get("/health")
@@ -44,5 +58,11 @@ def health():
     return {"status": "ok"}
 
 
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    content, content_type = render_metrics()
+    return Response(content=content, media_type=content_type)
+
+
 if __name__ == "__main__":
     uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -0,0 +1,109 @@
+import os
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+)
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import QueuePool
+
+# With PROMETHEUS_MULTIPROC_DIR set (gunicorn), every worker writes its samples
+# to mmapped files in that directory and /metrics aggregates them on scrape.
+# Gauges therefore declare how worker values are combined.
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route",
+    ["method", "route", "status"],
+)
+REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "HTTP requests currently being handled",
+    ["method"],
+    multiprocess_mode="livesum",
+)
+
+DB_POOL_SIZE = Gauge(
+    "db_pool_size",
+    "Configured connection pool size",
+    ["engine"],
+    multiprocess_mode="livesum",
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out_connections",
+    "Connections currently checked out of the pool",
+    ["engine"],
+    multiprocess_mode="livesum",
+)
+DB_POOL_CONNECTIONS = Gauge(
+    "db_pool_open_connections",
+    "Connections currently opened by the pool",
+    ["engine"],
+    multiprocess_mode="livesum",
+)
+
+AUTO_ASSIGN_DURATION = Histogram(
+    "auto_assign_solver_duration_seconds",
+    "Time spent in prepare_auto_assign_shifts",
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60),
+)
+AUTO_ASSIGN_SLOTS = Histogram(
+    "auto_assign_slots",
+    "Shift slots filled per auto-assign run",
+    buckets=(0, 10, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 50000),
+)
+
+EMAIL_OUTBOX_DEPTH = Gauge(
+    "email_outbox_depth",
+    "Emails accepted for sending but not yet handed to SES",
+    multiprocess_mode="livesum",
+)
+EMAILS_SENT = Counter(
+    "emails_sent",
+    "Emails handed to SES by result",
+    ["result"],
+)
+
+
+def install_pool_metrics(engine: Engine, name: str):
+    """`name` labels the engine's samples, e.g. "primary" or "replica-0"."""
+    pool_size = DB_POOL_SIZE.labels(engine=name)
+    connections = DB_POOL_CONNECTIONS.labels(engine=name)
+    checked_out = DB_POOL_CHECKED_OUT.labels(engine=name)
+
+    pool = engine.pool
+    if isinstance(pool, QueuePool):
+        pool_size.set(pool.size())
+
+    @event.listens_for(engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        connections.inc()
+
+    @event.listens_for(engine, "close")
+    def on_close(dbapi_connection, connection_record):
+        connections.dec()
+
+    @event.listens_for(engine, "checkout")
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        checked_out.inc()
+
+    @event.listens_for(engine, "checkin")
+    def on_checkin(dbapi_connection, connection_record):
+        checked_out.dec()
+
+
+def render_metrics() -> tuple[bytes, str]:
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
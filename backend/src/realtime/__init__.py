@@ -0,0 +1,17 @@
+from .pubsub import (
+    InMemoryPubSub,
+    PubSub,
+    RedisPubSub,
+    company_channel,
+    publish_company_event,
+    pubsub,
+)
+
+__all__ = [
+    "InMemoryPubSub",
+    "PubSub",
+    "RedisPubSub",
+    "company_channel",
+    "publish_company_event",
+    "pubsub",
+]
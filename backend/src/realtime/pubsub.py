@@ -0,0 +1,116 @@
+import asyncio
+import json
+import logging
+import threading
+from abc import ABC, abstractmethod
+from typing import AsyncIterator
+
+from decouple import config
+
+logger = logging.getLogger(__name__)
+
+# memory:// delivers within one process (tests, single worker), redis://host:6379/0
+# fans events out to subscribers connected to any worker
+EVENTS_URL = config("EVENTS_URL", default="memory://")
+# Events buffered per subscriber before new ones are dropped for it
+SUBSCRIBER_QUEUE_SIZE = config("EVENTS_SUBSCRIBER_QUEUE_SIZE", default=100, cast=int)
+
+
+class PubSub(ABC):
+    """Channel based publish/subscribe carrying JSON-serializable dicts.
+
+    `publish` is synchronous so service functions running in the threadpool
+    can call it directly; `subscribe` yields messages on the event loop.
+    """
+
+    @abstractmethod
+    def publish(self, channel: str, message: dict):
+        ...
+
+    @abstractmethod
+    def subscribe(self, channel: str) -> AsyncIterator[dict]:
+        ...
+
+
+class InMemoryPubSub(PubSub):
+    def __init__(self, queue_size: int = SUBSCRIBER_QUEUE_SIZE):
+        self.queue_size = queue_size
+        self._subscribers: dict[str, set] = {}
+        self._lock = threading.Lock()
+
+    def publish(self, channel: str, message: dict):
+        # Round-trip through JSON so subscribers see exactly what Redis would send
+        message = json.loads(json.dumps(message, default=str))
+        with self._lock:
+            subscribers = list(self._subscribers.get(channel, ()))
+        for loop, queue in subscribers:
+            loop.call_soon_threadsafe(self._deliver, channel, queue, message)
+
+    @staticmethod
+    def _deliver(channel: str, queue: asyncio.Queue, message: dict):
+        try:
+            queue.put_nowait(message)
+        except asyncio.QueueFull:
+            logger.warning("Dropping event on %s for a slow subscriber", channel)
+
+    async def subscribe(self, channel: str) -> AsyncIterator[dict]:
+        subscriber = (asyncio.get_running_loop(), asyncio.Queue(self.queue_size))
+        with self._lock:
+            self._subscribers.setdefault(channel, set()).add(subscriber)
+        try:
+            while True:
+                yield await subscriber[1].get()
+        finally:
+            with self._lock:
+                self._subscribers[channel].discard(subscriber)
+                if not self._subscribers[channel]:
+                    del self._subscribers[channel]
+
+
+class RedisPubSub(PubSub):
+    """Needs the optional `redis` package."""
+
+    def __init__(self, url: str):
+        import redis
+        import redis.asyncio
+
+        self.url = url
+        self.client = redis.Redis.from_url(url)
+        self.async_client = redis.asyncio.Redis.from_url(url)
+
+    def publish(self, channel: str, message: dict):
+        self.client.publish(channel, json.dumps(message, default=str))
+
+    async def subscribe(self, channel: str) -> AsyncIterator[dict]:
+        pubsub = self.async_client.pubsub()
+        await pubsub.subscribe(channel)
+        try:
+            async for raw in pubsub.listen():
+                if raw["type"] == "message":
+                    yield json.loads(raw["data"])
+        finally:
+            await pubsub.unsubscribe(channel)
+            await pubsub.aclose()
+
+
+def create_pubsub(url: str) -> PubSub:
+    if url.startswith("memory://"):
+        return InMemoryPubSub()
+    if url.startswith(("redis://", "rediss://")):
+        return RedisPubSub(url)
+    raise ValueError(f"Unsupported EVENTS_URL: {url}")
+
+
+pubsub = create_pubsub(EVENTS_URL)
+
+
+def company_channel(company_id) -> str:
+    return f"company:{company_id}:events"
+
+
+def publish_company_event(company_id, event_type: str, **data):
+    """Publishes a compact change event, failures never break the write."""
+    try:
+        pubsub.publish(company_channel(company_id), {"type": event_type, **data})
+    except Exception as e:
+        logger.warning("Failed to publish %s for company %s: %s", event_type, company_id, e)
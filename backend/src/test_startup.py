@@ -0,0 +1,62 @@
+import json
+import os
+import subprocess
+import sys
+
+# Generous enough for a cold CI box, tight enough to catch boto3/alembic
+# creeping back into the import path
+IMPORT_TIME_BUDGET_SECONDS = float(os.getenv("IMPORT_TIME_BUDGET_SECONDS", "2.0"))
+
+SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def import_main_in_subprocess() -> dict:
+    """Import the app in a fresh interpreter, the same way a new worker does."""
+    code = (
+        "import json, sys, time\n"
+        "start = time.perf_counter()\n"
+        "import main\n"
+        "elapsed = time.perf_counter() - start\n"
+        "print(json.dumps({'elapsed': elapsed, 'modules': sorted(sys.modules)}))\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=SRC_DIR,
+        env={**os.environ},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def test_import_does_not_load_aws_sdk():
+    """boto3 is only needed when an email is actually sent."""
+    result = import_main_in_subprocess()
+
+    assert "boto3" not in result["modules"]
+    assert "botocore" not in result["modules"]
+
+
+def test_import_does_not_load_alembic():
+    """The schema check imports alembic lazily inside the lifespan."""
+    result = import_main_in_subprocess()
+
+    assert "alembic" not in result["modules"]
+
+
+def test_import_does_not_load_numpy():
+    """numpy is imported by auto-assign on first use."""
+    result = import_main_in_subprocess()
+
+    assert "numpy" not in result["modules"]
+
+
+def test_import_time_within_budget():
+    """Cold start of `import main` stays within the configured budget."""
+    result = import_main_in_subprocess()
+
+    assert result["elapsed"] < IMPORT_TIME_BUDGET_SECONDS, (
+        f"import main took {result['elapsed']:.2f}s, "
+        f"budget is {IMPORT_TIME_BUDGET_SECONDS:.2f}s"
+    )
@@ -3,6 +3,7 @@ import { MessageResponse } from "../../types/common";
 import {
   GetWorkersShiftsResponse,
   AddWorkerShiftPayload,
+  GetMyShiftsRawResponse,
   GetMyShiftsResponse,
   RangePayload,
   AutoAssignPayload,
@@ -34,6 +35,12 @@ export const workerShiftApi = baseApi.injectEndpoints({
         method: "GET",
         params,
       }),
+      transformResponse: (response: GetMyShiftsRawResponse) => ({
+        items: response.items.map((shift) => ({
+          ...shift,
+          template: response.templates[shift.template_id],
+        })),
+      }),
       providesTags: ["AdminWorkersShifts"],
     }),
 
@@ -24,6 +24,12 @@ export type RangePayload = {
   range_end: string
 }
 
+// Shifts reference templates by id, each template is sent once
+export type GetMyShiftsRawResponse = {
+  items: WorkerShift[]
+  templates: Record<string, ShiftTemplate>
+}
+
 export type GetMyShiftsResponse = {
   items: (WorkerShift & { template: ShiftTemplate })[]
 }